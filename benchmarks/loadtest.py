@@ -0,0 +1,299 @@
+"""Headless load test: many Color Memory sessions with scripted players in one process.
+
+Usage::
+
+    python benchmarks/loadtest.py --sessions 200 --duration 60
+    python benchmarks/loadtest.py --sessions 500 --input keys --timer --json data/loadtest.json
+
+Every session is a real ``ColorMemoryApp`` on an ``ft.Page`` whose connection
+only serializes the outgoing batches (``RecordingConnection``), so the numbers
+include Flet's diffing and JSON encoding but no network. Like the web server,
+all sessions share one event loop, one leaderboard and one engine pool. The
+bots live on the same loop; they only sleep and post events, so nearly all
+measured lag comes from the sessions themselves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import suppress
+from typing import Any, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import flet as ft  # noqa: E402
+
+import color_memory  # noqa: E402
+from diagnostics import LoopMonitor  # noqa: E402
+from flow import FlowSnapshot, Phase  # noqa: E402
+from leaderboard import Leaderboard  # noqa: E402
+from metrics import CLICK_FEEDBACK, EVENT_LOOP_LAG, EVENT_LOOP_STALLS, MetricsRegistry  # noqa: E402
+from run import RecordingConnection  # noqa: E402
+from server import SessionHub  # noqa: E402
+
+
+class Bot:
+    """Scripted player that drives one session through its real event handlers."""
+
+    def __init__(
+        self,
+        app: color_memory.ColorMemoryApp,
+        rng: random.Random,
+        *,
+        reaction_time: float,
+        error_rate: float,
+        use_keys: bool,
+    ) -> None:
+        self.app = app
+        self.rng = rng
+        self.reaction_time = reaction_time
+        self.error_rate = error_rate
+        self.use_keys = use_keys
+        self.inputs = 0
+        self.games = 0
+        self._keys = {word: key for key, word in app.key_map.items() if key.isdigit()}
+        self._seen_fail: Optional[FlowSnapshot] = None
+
+    async def play(self, until: float, *, ramp: float = 0.0) -> None:
+        app = self.app
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(self.rng.uniform(0.0, ramp))
+        app.session.post(app._handle_menu_start)
+        while loop.time() < until:
+            await asyncio.sleep(self.reaction_time * self.rng.uniform(0.5, 1.5))
+            state = app.flow.snapshot
+            if state.accepts_input:
+                await self._answer(state)
+            elif state.phase is Phase.FAIL and state is not self._seen_fail:
+                # Game over: "Nochmal spielen" in the summary dialog.
+                self._seen_fail = state
+                self.games += 1
+                app.session.post(app._summary_play_again)
+
+    async def _answer(self, state: FlowSnapshot) -> None:
+        engine = self.app.engine
+        if engine.cursor >= len(engine.sequence):
+            return
+        word = engine.sequence[engine.cursor]
+        if self.rng.random() < self.error_rate:
+            word = self.rng.choice([other for other in state.colors if other != word] or [word])
+        self.inputs += 1
+        if self.use_keys:
+            await self.app.page.on_keyboard_event(ft.KeyboardEvent(self._keys[word], False, False, False, False))
+        else:
+            await self.app.color_tiles[word].on_click(None)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, if the platform exposes it."""
+    with suppress(OSError, ValueError, IndexError):
+        with open("/proc/self/statm", "r", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    with suppress(ImportError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+async def run_load(
+    *,
+    sessions: int,
+    duration: float,
+    ramp: float = 2.0,
+    reaction_time: float = 0.4,
+    error_rate: float = 0.03,
+    use_keys: bool = False,
+    timer: bool = False,
+    event_log: bool = True,
+    trace_memory: bool = False,
+    lag_interval: float = 0.01,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run ``sessions`` bot-driven sessions for ``duration`` seconds and return the report."""
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    metrics = MetricsRegistry()
+
+    with tempfile.TemporaryDirectory(prefix="colormemory-load-") as directory:
+        # Session logs are written as on a real server, but into the scratch directory.
+        color_memory.SESSION_LOG_DIR = os.path.join(directory, "sessions")
+        color_memory.EVENT_LOG_ENABLED = event_log
+        hub = SessionHub(
+            max_sessions=sessions,
+            leaderboard=Leaderboard.open(os.path.join(directory, "leaderboard.sqlite3")),
+            allowed_words=color_memory.ACTIVE_COLORS,
+        )
+
+        gc.collect()
+        rss_before = _rss_bytes()
+        if trace_memory:
+            tracemalloc.start()
+        apps: list[color_memory.ColorMemoryApp] = []
+        connections: list[RecordingConnection] = []
+        bots: list[Bot] = []
+        setup_started = time.perf_counter()
+        for index in range(sessions):
+            connection = RecordingConnection()
+            page = ft.Page(connection, f"load-{index}", loop)
+            engine = hub.acquire()
+            assert engine is not None
+            app = color_memory.ColorMemoryApp(
+                page, engine=engine, release_engine=hub.release, audio=False, server=True, metrics=metrics
+            )
+            await app.setup()
+            app.player_field.value = f"Bot {index}"
+            if timer:
+                app.session.post(app._toggle_timer, True)
+            apps.append(app)
+            connections.append(connection)
+            bots.append(
+                Bot(
+                    app,
+                    random.Random(rng.getrandbits(64)),
+                    reaction_time=reaction_time,
+                    error_rate=error_rate,
+                    use_keys=use_keys,
+                )
+            )
+        setup_time = time.perf_counter() - setup_started
+        # The game views are built right after the first paint; that is not part of the steady state either.
+        while any(app.game_container is None for app in apps):
+            await asyncio.sleep(0.01)
+
+        # First paint is not part of the steady state.
+        start_bytes = sum(connection.bytes for connection in connections)
+        start_batches = sum(connection.batches for connection in connections)
+        start_flushes = sum(app.ui.flush_count for app in apps)
+        start_processed = sum(app.session.processed for app in apps)
+
+        monitor = LoopMonitor(interval=lag_interval, metrics=metrics)
+        monitor.start()
+        started = loop.time()
+        await asyncio.gather(*(bot.play(started + duration, ramp=ramp) for bot in bots))
+        elapsed = loop.time() - started
+        monitor.close()
+
+        rss_after = _rss_bytes()
+        traced = tracemalloc.get_traced_memory()[0] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+        total_bytes = sum(connection.bytes for connection in connections) - start_bytes
+        batches = sum(connection.batches for connection in connections) - start_batches
+        flushes = sum(app.ui.flush_count for app in apps) - start_flushes
+        processed = sum(app.session.processed for app in apps) - start_processed
+
+        for app in apps:
+            await app.close()
+        await asyncio.sleep(0.05)
+        hub.close()
+
+    per_session = sessions * elapsed
+    feedback = metrics.histogram(CLICK_FEEDBACK)
+    return {
+        "sessions": sessions,
+        "duration": elapsed,
+        "input": "keys" if use_keys else "click",
+        "timer": timer,
+        "setup_seconds_per_session": setup_time / sessions,
+        "inputs": sum(bot.inputs for bot in bots),
+        "games": sum(bot.games for bot in bots),
+        "updates_per_session_per_second": flushes / per_session,
+        "batches_per_session_per_second": batches / per_session,
+        "bytes_per_update": total_bytes / batches if batches else 0.0,
+        "bytes_per_session_per_second": total_bytes / per_session,
+        "messages_per_session_per_second": processed / per_session,
+        "event_loop_lag": metrics.histogram(EVENT_LOOP_LAG).snapshot(),
+        "event_loop_stalls": metrics.counter(EVENT_LOOP_STALLS).value,
+        "click_feedback": feedback.snapshot(),
+        "rss_per_session": (rss_after - rss_before) / sessions if rss_before and rss_after else None,
+        "traced_per_session": traced / sessions if traced is not None else None,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    def ms(value: float) -> str:
+        return f"{value * 1000:0.2f} ms"
+
+    def kib(value: Optional[float]) -> str:
+        return "–" if value is None else f"{value / 1024:0.1f} KiB"
+
+    lag = report["event_loop_lag"]
+    feedback = report["click_feedback"]
+    return "\n".join(
+        [
+            f"Sitzungen:             {report['sessions']} ({report['input']}, Timer {'an' if report['timer'] else 'aus'})",
+            f"Dauer:                 {report['duration']:0.1f} s",
+            f"Eingaben / Spiele:     {report['inputs']} / {report['games']}",
+            f"Aufbau pro Sitzung:    {ms(report['setup_seconds_per_session'])}",
+            "",
+            "Pro Sitzung:",
+            f"  Updates/s:           {report['updates_per_session_per_second']:0.2f}",
+            f"  gesendete Batches/s: {report['batches_per_session_per_second']:0.2f}",
+            f"  Bytes pro Update:    {report['bytes_per_update']:0.0f}",
+            f"  Bytes/s:             {report['bytes_per_session_per_second']:0.0f}",
+            f"  Nachrichten/s:       {report['messages_per_session_per_second']:0.2f}",
+            f"  Speicher (RSS):      {kib(report['rss_per_session'])}",
+            f"  Speicher (Heap):     {kib(report['traced_per_session'])}",
+            "",
+            f"Event-Loop-Verzögerung: p50 {ms(lag['p50'])}, p99 {ms(lag['p99'])}, max {ms(lag['max'])}",
+            f"Blockaden:              {report['event_loop_stalls']}",
+            f"Klick → Rückmeldung:    p50 {ms(feedback['p50'])}, p99 {ms(feedback['p99'])}, max {ms(feedback['max'])}",
+        ]
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Lasttest mit vielen simulierten Sitzungen in einem Prozess.")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30.0, help="Sekunden Spielzeit")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Sitzungen starten verteilt über so viele Sekunden")
+    parser.add_argument("--reaction-time", type=float, default=0.4, help="mittlere Sekunden pro Eingabe")
+    parser.add_argument("--error-rate", type=float, default=0.03, help="Fehlerwahrscheinlichkeit pro Eingabe")
+    parser.add_argument("--input", choices=("click", "keys"), default="click")
+    parser.add_argument("--timer", action="store_true", help="Timer in allen Sitzungen einschalten")
+    parser.add_argument("--no-event-log", action="store_true", help="keine Sitzungsprotokolle schreiben")
+    parser.add_argument("--trace-memory", action="store_true", help="Heap per tracemalloc messen (langsamer)")
+    parser.add_argument("--stall-stacks", action="store_true", help="Stack jeder Blockade der Event-Loop ausgeben")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="Bericht zusätzlich als JSON schreiben")
+    args = parser.parse_args(argv)
+    # Under full load every stall would be logged with its stack; by default only the count is shown.
+    logging.getLogger("diagnostics").setLevel(logging.WARNING if args.stall_stacks else logging.ERROR)
+
+    report = asyncio.run(
+        run_load(
+            sessions=args.sessions,
+            duration=args.duration,
+            ramp=args.ramp,
+            reaction_time=args.reaction_time,
+            error_rate=args.error_rate,
+            use_keys=args.input == "keys",
+            timer=args.timer,
+            event_log=not args.no_event_log,
+            trace_memory=args.trace_memory,
+            seed=args.seed,
+        )
+    )
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+"""Micro-benchmarks for the engine, game flow, persistence, color utilities, audio mixing, UI hot paths and startup.
+
+Usage::
+
+    python benchmarks/run.py                 # compare against benchmarks/baseline.json
+    python benchmarks/run.py --save          # record a new baseline
+    python benchmarks/run.py -k engine --threshold 0.5
+
+Timings are the best per-operation time out of several repeats. They are
+only comparable on the machine that recorded them, so the baseline keeps
+them per machine (host, CPU and Python version); without an entry for this
+machine they are printed but not checked. ``count`` metrics (e.g.
+``page.update()`` calls, payload bytes) are deterministic and shared by all
+machines. The run fails with exit code 1 if any checked metric is
+slower/higher than the baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+import wave
+from contextlib import suppress
+from typing import Any, Callable, Iterator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import utils  # noqa: E402
+from config import ACTIVE_COLORS, COLOR_MAP  # noqa: E402
+from flow import GameFlow  # noqa: E402
+from game import ColorMemoryEngine  # noqa: E402
+from leaderboard import Leaderboard, read_legacy_highscore  # noqa: E402
+from mixer import AudioMixer, NullSink, WavStream, concatenate  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEQUENCE_LENGTHS = (10, 1_000, 100_000)
+
+Result = tuple[str, float, str]
+
+
+def measure(func: Callable[[], Any], *, repeat: int = 5) -> float:
+    """Return the best time per call of ``func`` in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _engine(length: int) -> ColorMemoryEngine:
+    engine = ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS)
+    for _ in range(length):
+        engine.prepare_next_round()
+    return engine
+
+
+# ----------------------------------------------------------------------#
+# Benchmarks
+# ----------------------------------------------------------------------#
+
+
+def bench_engine() -> Iterator[Result]:
+    for length in SEQUENCE_LENGTHS:
+        engine = _engine(length)
+        guess = list(engine.sequence)
+
+        def prepare() -> None:
+            engine.prepare_next_round()
+            engine._sequence_ids.pop()
+            engine.round -= 1
+
+        def submit_all() -> None:
+            engine.cursor = 0
+            for word in guess:
+                engine.submit(word)
+
+        yield f"engine.prepare_next_round[{length}]", measure(prepare), "s"
+        yield f"engine.evaluate_guess[{length}]", measure(lambda: engine.evaluate_guess(guess)), "s"
+        yield f"engine.submit_sequence[{length}]", measure(submit_all), "s"
+        yield f"engine.render_solution[{length}]", measure(engine.render_solution), "s"
+
+
+def _play_rounds(flow: GameFlow, rounds: int) -> int:
+    """Solve ``rounds`` rounds perfectly and return the number of transitions."""
+    fired = 0
+    for _ in range(rounds):
+        fired += flow.next_round() + flow.reveal() + flow.hide()
+        for word in list(flow.engine.sequence):
+            fired += flow.click(word) is not None
+    return fired
+
+
+def bench_flow() -> Iterator[Result]:
+    engine = ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS, seed=1)
+    flow = GameFlow(engine)
+
+    def game() -> int:
+        fired = flow.stop() + flow.start(reseed=False)
+        fired += _play_rounds(flow, 10)
+        fired += flow.next_round() + flow.reveal() + (flow.click("") is not None)
+        return fired
+
+    transitions = game()
+    elapsed = measure(game)
+    yield "flow.game[10]", elapsed, "s"
+    yield "flow.transition", elapsed / transitions, "s"
+
+
+def bench_persistence() -> Iterator[Result]:
+    directory = tempfile.mkdtemp(prefix="colormemory-bench-")
+    try:
+        legacy_path = os.path.join(directory, "highscore.txt")
+        with open(legacy_path, "w", encoding="utf-8") as file:
+            json.dump({"score": 12, "player": "Bench"}, file)
+        database = os.path.join(directory, "leaderboard.sqlite3")
+        board = Leaderboard.open(database, legacy_path=legacy_path)
+        for index in range(1_000):
+            board.record(f"seed-{index}", f"Spieler {index % 50}", index % 97)
+        board.flush()
+
+        counter = iter(range(10**9))
+
+        def save() -> None:
+            board.record(f"run-{next(counter)}", "Bench", 42)
+            board.flush()
+
+        def load() -> None:
+            Leaderboard.open(database).close()
+
+        yield "highscore.legacy_read", measure(lambda: read_legacy_highscore(legacy_path)), "s"
+        yield "highscore.load", measure(load, repeat=3), "s"
+        yield "highscore.save", measure(save, repeat=3), "s"
+        yield "highscore.top10", measure(lambda: board.top(10)), "s"
+        board.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_utils() -> Iterator[Result]:
+    colors = list(COLOR_MAP.values())
+    reversed_colors = colors[::-1]
+    yield "utils.hex_to_rgb", measure(lambda: [utils.hex_to_rgb(color) for color in colors]), "s"
+    yield "utils.darker_color", measure(lambda: [utils.darker_color(color) for color in colors]), "s"
+    yield "utils.blend_hex_colors", measure(
+        lambda: [utils.blend_hex_colors(a, b, 0.4) for a, b in zip(colors, reversed_colors)]
+    ), "s"
+    many = colors * 100
+    many_reversed = many[::-1]
+    yield "utils.darker_colors[1100]", measure(lambda: utils.darker_colors(many)), "s"
+    yield "utils.blend_hex_colors_batch[1100]", measure(
+        lambda: utils.blend_hex_colors_batch(many, many_reversed, 0.4)
+    ), "s"
+
+
+def bench_audio() -> Iterator[Result]:
+    from audio import feedback_sounds
+
+    sounds = feedback_sounds()
+    music = concatenate(*[sounds["success"], sounds["failure"]] * 10)
+    # Mixed by hand (no output thread) so only the mixing work is timed.
+    mixer = AudioMixer(NullSink(), start=False)
+    mixer.play(music, volume=0.3, loop=True, key="music")
+    success = sounds["success"]
+
+    yield "audio.play", measure(lambda: mixer.play(success, key="fx")), "s"
+
+    def mix_block() -> None:
+        mixer.play(success, key="fx")
+        mixer.mix()
+
+    yield "audio.mix_block[2 voices]", measure(mix_block), "s"
+    mixer.close()
+
+    # Music streamed from a memory-mapped file, crossfaded at every loop seam (~0.9 s loop).
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "music.wav")
+        with wave.open(path, "wb") as writer:
+            writer.setnchannels(music.channels)
+            writer.setsampwidth(2)
+            writer.setframerate(music.sample_rate)
+            writer.writeframes(music.samples.tobytes())
+        stream = WavStream(path)
+        mixer = AudioMixer(NullSink(), start=False)
+        mixer.play(stream, volume=0.3, loop=True, crossfade=0.05)
+        yield "audio.stream_mix_block", measure(mixer.mix), "s"
+        mixer.close()
+        del mixer
+        stream.close()
+
+    from audio import FeedbackSoundPool
+    from metrics import MetricsRegistry
+
+    pool = FeedbackSoundPool(lambda sound: None, metrics=MetricsRegistry())
+    yield "audio.feedback_submit", measure(lambda: pool.submit("success")), "s"
+    pool.close()
+
+
+class CountingPage:
+    """Minimal ``ft.Page`` stand-in that counts ``update()`` calls."""
+
+    def __init__(self) -> None:
+        self.updates = 0
+        self.controls: list[Any] = []
+        self.dialog = None
+        self.on_close = None
+
+    def update(self, *controls: Any) -> None:
+        self.updates += 1
+
+    def add(self, *controls: Any) -> None:
+        self.controls.extend(controls)
+
+    def run_task(self, handler: Callable[..., Any], *args: Any) -> Any:
+        return asyncio.get_running_loop().create_task(handler(*args))
+
+    def window_close(self) -> None:
+        pass
+
+
+class RecordingConnection:
+    """In-process Flet connection that serializes outgoing batches like the socket server.
+
+    Wraps ``LocalConnection`` (which tracks control ids) and counts the
+    batches and JSON bytes that would go over the wire to the client.
+    """
+
+    def __init__(self) -> None:
+        from flet_core.local_connection import LocalConnection
+
+        self._local = LocalConnection()
+        self.batches = 0
+        self.bytes = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._local, name)
+
+    def send_command(self, session_id: str, command: Any) -> Any:
+        from flet_core.protocol import PageCommandResponsePayload
+
+        result, message = self._local._process_command(command)
+        if message:
+            self._record(message)
+        return PageCommandResponsePayload(result=result, error="")
+
+    def send_commands(self, session_id: str, commands: list[Any]) -> Any:
+        from flet_core.protocol import ClientActions, ClientMessage, PageCommandsBatchResponsePayload
+
+        results, messages = [], []
+        for command in commands:
+            result, message = self._local._process_command(command)
+            if command.name in ("add", "get"):
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            self._record(ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def _record(self, message: Any) -> None:
+        from flet_core.protocol import CommandEncoder
+
+        self.batches += 1
+        self.bytes += len(json.dumps(message, cls=CommandEncoder, separators=(",", ":")))
+
+
+def bench_ui() -> Iterator[Result]:
+    try:
+        import color_memory
+        import flet as ft
+    except ImportError as exc:  # pragma: no cover - flet not installed
+        print(f"  ui benchmarks skipped: {exc}", file=sys.stderr)
+        return
+
+    async def scenario() -> list[Result]:
+        connection = RecordingConnection()
+        page = ft.Page(connection, "bench", asyncio.get_running_loop())
+        engine = ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS)
+        app = color_memory.ColorMemoryApp(page, engine=engine, audio=False)
+        await app.setup()
+        await app._show_game_view()
+        app.ui.request()
+        app.ui.flush_now()
+        flow = app.flow
+
+        def enter_input(length: int) -> list[str]:
+            """Put the flow into the input phase of round ``length`` without rendering."""
+            flow.stop()
+            flow.start(reseed=False)
+            _play_rounds(flow, length - 1)
+            flow.next_round()
+            flow.reveal()
+            return list(engine.sequence)[:-1]
+
+        results: list[Result] = []
+        try:
+            # Round steps are scheduler timers (0.18 s reveal, 1.2 s display), so rounds run in real time.
+            rounds = 3
+            updates = 0
+            flow.start(reseed=False)
+            app._render()
+            app.ui.flush_now()
+            sent = connection.bytes
+            for _ in range(rounds):
+                before = app.ui.flush_count
+                await app._advance_round()
+                await asyncio.sleep(1.45)
+                updates += app.ui.flush_count - before
+                for word in list(engine.sequence):
+                    await app._on_color_selected(word)
+            await asyncio.sleep(0.3)
+            results.append(("ui.advance_round.page_updates", updates / rounds, "count"))
+            results.append(("ui.round.payload_bytes", (connection.bytes - sent) / rounds, "count"))
+
+            words = enter_input(40)
+            app._render()
+            app.ui.flush_now()
+            before = app.ui.flush_count
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            for word in words:
+                await app._on_color_selected(word)
+            elapsed = loop.time() - started
+            await asyncio.sleep(0.05)
+            results.append(("ui.on_color_selected", elapsed / len(words), "s"))
+            results.append(("ui.on_color_selected.page_updates", (app.ui.flush_count - before) / len(words), "count"))
+
+            # Same clicks, posted through the session queue like real tile events.
+            words = enter_input(40)
+            processed = app.session.processed
+            done = asyncio.Event()
+            started = loop.time()
+            for word in words:
+                app.session.post(app._on_color_selected, word)
+            app.session.post(done.set)
+            await done.wait()
+            elapsed = loop.time() - started
+            results.append(("ui.session_click", elapsed / (app.session.processed - processed), "s"))
+
+            # Same input as key presses, handled inline while the session is idle.
+            await asyncio.sleep(0.05)
+            words = enter_input(40)
+            keys = {word: key for key, word in app.key_map.items() if key.isdigit()}
+            events = [ft.KeyboardEvent(keys[word], False, False, False, False) for word in words]
+            started = loop.time()
+            for event in events:
+                await page.on_keyboard_event(event)
+            elapsed = loop.time() - started
+            assert engine.cursor == len(events), "key presses were not handled inline"
+            results.append(("ui.key_press", elapsed / len(events), "s"))
+        finally:
+            await app.close()
+        return results
+
+    yield from asyncio.run(scenario())
+
+
+def _count_controls(controls: list[Any]) -> int:
+    total = 0
+    stack = list(controls)
+    while stack:
+        control = stack.pop()
+        total += 1
+        stack.extend(control._get_children())
+    return total
+
+
+def bench_startup() -> Iterator[Result]:
+    code = "import time; started = time.perf_counter(); import color_memory; print(time.perf_counter() - started)"
+    env = {**os.environ, "PYTHONPATH": os.path.join(ROOT, "src")}
+    timings = []
+    for _ in range(3):
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, cwd=os.path.join(ROOT, "src"), env=env
+        )
+        if completed.returncode != 0:  # pragma: no cover - flet not installed
+            print(f"  startup benchmarks skipped: {completed.stderr.strip().splitlines()[-1:]}", file=sys.stderr)
+            return
+        timings.append(float(completed.stdout.strip().splitlines()[-1]))
+    yield "startup.import_color_memory", min(timings), "s"
+
+    import color_memory
+
+    async def first_paint() -> tuple[float, int]:
+        page = CountingPage()
+        engine = ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS)
+        app = color_memory.ColorMemoryApp(page, engine=engine, audio=False)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await app.setup()
+        elapsed = loop.time() - started
+        controls = _count_controls(page.controls)
+        await app.close()
+        return elapsed, controls
+
+    elapsed, controls = min(asyncio.run(first_paint()) for _ in range(5))
+    yield "startup.setup", elapsed, "s"
+    yield "startup.first_paint_controls", controls, "count"
+
+
+# Every group lists the names it yields, so ``-k`` can skip whole groups before they run.
+BENCHMARKS: dict[str, tuple[Callable[[], Iterator[Result]], tuple[str, ...]]] = {
+    "engine": (
+        bench_engine,
+        tuple(
+            f"engine.{operation}[{length}]"
+            for length in SEQUENCE_LENGTHS
+            for operation in ("prepare_next_round", "evaluate_guess", "submit_sequence", "render_solution")
+        ),
+    ),
+    "flow": (bench_flow, ("flow.game[10]", "flow.transition")),
+    "highscore": (
+        bench_persistence,
+        ("highscore.legacy_read", "highscore.load", "highscore.save", "highscore.top10"),
+    ),
+    "utils": (
+        bench_utils,
+        (
+            "utils.hex_to_rgb",
+            "utils.darker_color",
+            "utils.blend_hex_colors",
+            "utils.darker_colors[1100]",
+            "utils.blend_hex_colors_batch[1100]",
+        ),
+    ),
+    "audio": (
+        bench_audio,
+        ("audio.play", "audio.mix_block[2 voices]", "audio.stream_mix_block", "audio.feedback_submit"),
+    ),
+    "ui": (
+        bench_ui,
+        (
+            "ui.advance_round.page_updates",
+            "ui.round.payload_bytes",
+            "ui.on_color_selected",
+            "ui.on_color_selected.page_updates",
+            "ui.session_click",
+            "ui.key_press",
+        ),
+    ),
+    "startup": (
+        bench_startup,
+        ("startup.import_color_memory", "startup.setup", "startup.first_paint_controls"),
+    ),
+}
+
+
+# ----------------------------------------------------------------------#
+# Runner
+# ----------------------------------------------------------------------#
+
+
+def _cpu_name() -> str:
+    with suppress(OSError):
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+
+def machine_key() -> str:
+    """Key of this machine's timings in the baseline file."""
+    python = ".".join(platform.python_version_tuple()[:2])
+    return f"{platform.node() or 'unknown'} / {_cpu_name()} / Python {python}"
+
+
+def _format(value: float, unit: str) -> str:
+    if unit == "count":
+        return f"{value:10.2f}  "
+    for scale, suffix in ((1, "s "), (1e-3, "ms"), (1e-6, "µs"), (1e-9, "ns")):
+        if value >= scale or suffix == "ns":
+            return f"{value / scale:10.2f} {suffix}"
+    return f"{value:10.2f} s "
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Color Memory Benchmarks")
+    parser.add_argument("-k", dest="keyword", default="", help="nur Benchmarks, deren Name dies enthält")
+    parser.add_argument("--save", action="store_true", help="Ergebnisse als neue Baseline speichern")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25, help="erlaubte Verschlechterung (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            stored: dict[str, Any] = json.load(file)
+    except (OSError, ValueError):
+        stored = {}
+    machine = machine_key()
+    machines: dict[str, Any] = stored.get("machines", {})
+    counts: dict[str, Any] = stored.get("counts", {})
+    timings: dict[str, Any] = machines.get(machine, {}).get("results", {})
+    if not timings:
+        print(f"Keine Zeit-Baseline für „{machine}“ – Zeiten werden nur angezeigt (mit --save aufzeichnen).\n")
+
+    results: dict[str, dict[str, Any]] = {}
+    regressions: list[str] = []
+    for bench, names in BENCHMARKS.values():
+        # UI rounds run in real time and startup spawns interpreters; only run groups that can match.
+        if not any(args.keyword in name for name in names):
+            continue
+        for name, value, unit in bench():
+            if args.keyword not in name:
+                continue
+            results[name] = {"value": value, "unit": unit}
+            reference = (counts if unit == "count" else timings).get(name, {}).get("value")
+            change = ""
+            if reference:
+                ratio = value / reference - 1
+                change = f"{ratio:+8.1%}"
+                if ratio > args.threshold:
+                    change += "  REGRESSION"
+                    regressions.append(name)
+            print(f"{name:<42}{_format(value, unit)}  {change}")
+
+    if args.save:
+        measured = {name: result for name, result in results.items() if result["unit"] != "count"}
+        machines[machine] = {
+            "python": platform.python_version(),
+            "results": {**timings, **measured},
+        }
+        counts.update((name, result) for name, result in results.items() if result["unit"] == "count")
+        payload = {"counts": counts, "machines": machines}
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(payload, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline gespeichert: {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} Regression(en) über {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
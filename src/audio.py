@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import importlib
 import os
 import platform
@@ -7,13 +8,117 @@ import shutil
 import subprocess
 import threading
 import time
+import wave
+from collections import deque
 from contextlib import suppress
+from functools import lru_cache
 from typing import Callable, Optional
 
-playsound_func: Optional[Callable[[str], None]] = None
-with suppress(Exception):  # pragma: no cover - optional dependency
-    module = importlib.import_module("playsound")
-    playsound_func = getattr(module, "playsound")
+from config import (
+    AUDIO_BLOCK_FRAMES,
+    AUDIO_CHANNELS,
+    AUDIO_SAMPLE_RATE,
+    FEEDBACK_QUEUE_LIMIT,
+    FEEDBACK_VOLUME,
+    FEEDBACK_WORKERS,
+    MUSIC_CROSSFADE,
+    MUSIC_FADE,
+    MUSIC_VOLUME,
+)
+from metrics import (
+    FEEDBACK_COALESCED,
+    FEEDBACK_DROPPED,
+    FEEDBACK_QUEUE_DEPTH,
+    FEEDBACK_SOUND_DELAY,
+    METRICS,
+    MetricsRegistry,
+)
+from mixer import AudioMixer, Sound, Source, WavStream, concatenate, load_wav, open_output_sink, tone
+
+_playsound_func: Optional[Callable[[str], None]] = None
+_playsound_probed = False
+_mixer: Optional[AudioMixer] = None
+_mixer_probed = False
+_mixer_lock = threading.Lock()
+_feedback_pool: Optional["FeedbackSoundPool"] = None
+
+
+def load_playsound() -> Optional[Callable[[str], None]]:
+    """Import the optional ``playsound`` package on first use instead of at startup."""
+    global _playsound_func, _playsound_probed
+    if not _playsound_probed:
+        _playsound_probed = True
+        with suppress(Exception):  # pragma: no cover - optional dependency
+            module = importlib.import_module("playsound")
+            _playsound_func = getattr(module, "playsound")
+    return _playsound_func
+
+
+def shared_mixer() -> Optional[AudioMixer]:
+    """Return the process-wide mixer on the default output device.
+
+    The device is opened on first use; ``None`` means no output backend is
+    available and callers fall back to ``afplay``/``playsound``/the bell.
+    """
+    global _mixer, _mixer_probed
+    if not _mixer_probed:
+        with _mixer_lock:
+            if not _mixer_probed:
+                sink = open_output_sink(
+                    sample_rate=AUDIO_SAMPLE_RATE, channels=AUDIO_CHANNELS, block_frames=AUDIO_BLOCK_FRAMES
+                )
+                if sink is not None:
+                    _mixer = AudioMixer(
+                        sink, sample_rate=AUDIO_SAMPLE_RATE, channels=AUDIO_CHANNELS, block_frames=AUDIO_BLOCK_FRAMES
+                    )
+                    atexit.register(_mixer.close)
+                _mixer_probed = True
+    return _mixer
+
+
+@lru_cache(maxsize=4)
+def load_sound(path: str) -> Sound:
+    """Decode a WAV file into the mixer format once and keep it in memory."""
+    return load_wav(path, sample_rate=AUDIO_SAMPLE_RATE, channels=AUDIO_CHANNELS)
+
+
+@lru_cache(maxsize=4)
+def load_music(path: str) -> Source:
+    """Memory-map ``path`` for streaming, or decode it if its format cannot be streamed as is."""
+    try:
+        return WavStream(path, sample_rate=AUDIO_SAMPLE_RATE, channels=AUDIO_CHANNELS)
+    except wave.Error:
+        return load_sound(path)
+
+
+@lru_cache(maxsize=1)
+def feedback_sounds() -> dict[str, Sound]:
+    """Short synthesized cues, generated once."""
+    rate, channels = AUDIO_SAMPLE_RATE, AUDIO_CHANNELS
+    return {
+        "success": concatenate(
+            tone(880.0, 0.07, sample_rate=rate, channels=channels),
+            tone(1318.5, 0.11, sample_rate=rate, channels=channels),
+        ),
+        "failure": concatenate(
+            tone(311.1, 0.12, sample_rate=rate, channels=channels),
+            tone(220.0, 0.22, sample_rate=rate, channels=channels),
+        ),
+    }
+
+
+def preload_audio(music_file: Optional[str] = None) -> None:
+    """Open the output device and decode all sounds on a background thread."""
+
+    def load() -> None:
+        if shared_mixer() is None:
+            return
+        feedback_sounds()
+        if music_file and os.path.exists(music_file):
+            with suppress(OSError, wave.Error, EOFError):
+                load_music(music_file)
+
+    threading.Thread(target=load, name="audio-preload", daemon=True).start()
 
 
 class MusicController:
@@ -33,6 +138,13 @@ class MusicController:
         self.music_stop_event = threading.Event()
         self.music_mode: Optional[str] = None
         self.music_process: Optional[subprocess.Popen] = None
+        self.volume = MUSIC_VOLUME
+
+    def set_volume(self, volume: float) -> None:
+        """Change the music volume; ramps smoothly while the mixer plays, else applies on the next start."""
+        self.volume = max(0.0, volume)
+        if self.music_mode == "mixer" and _mixer is not None:
+            _mixer.set_volume(self, self.volume)
 
     def start(self) -> None:
         if self.music_thread and self.music_thread.is_alive():
@@ -41,6 +153,27 @@ class MusicController:
             self.notify("Keine Musikdatei gefunden.", "#c67b1e")
             return
 
+        mixer = shared_mixer()
+        if mixer is not None:
+            if self.music_mode == "mixer" and mixer.is_playing(self):
+                return
+            try:
+                music = load_music(self.music_file)
+            except (OSError, wave.Error, EOFError):
+                music = None
+            if music is not None:
+                # Streamed from the mapped file and looped sample-accurately; nothing is re-opened per loop.
+                mixer.play(
+                    music,
+                    volume=self.volume,
+                    loop=True,
+                    key=self,
+                    fade_in=MUSIC_FADE,
+                    crossfade=MUSIC_CROSSFADE,
+                )
+                self.music_mode = "mixer"
+                return
+
         system = platform.system()
         can_use_afplay = system == "Darwin" and shutil.which("afplay") is not None
 
@@ -56,6 +189,7 @@ class MusicController:
             self.music_thread.start()
             return
 
+        playsound_func = load_playsound()
         if playsound_func is not None:
             self.music_mode = "playsound"
             self.music_thread = threading.Thread(
@@ -70,6 +204,8 @@ class MusicController:
 
     def stop(self, *, with_feedback: bool = True) -> None:
         self.music_stop_event.set()
+        if self.music_mode == "mixer" and _mixer is not None:
+            _mixer.stop(self, fade=MUSIC_FADE if with_feedback else 0.0)
         if self.music_mode == "afplay" and self.music_process is not None:
             try:
                 self.music_process.terminate()
@@ -92,9 +228,10 @@ class MusicController:
         error_message: Optional[str] = None
 
         if mode == "playsound":
+            playsound_func = load_playsound()
             while not self.music_stop_event.is_set():
                 try:
-                    playsound_func(self.music_file)  # type: ignore[arg-type]
+                    playsound_func(self.music_file)  # type: ignore[misc]
                 except FileNotFoundError:
                     error_message = "Keine Musikdatei gefunden."
                     break
@@ -106,7 +243,7 @@ class MusicController:
             while not self.music_stop_event.is_set():
                 try:
                     self.music_process = subprocess.Popen(
-                        ["afplay", "-v", "0.3", self.music_file],
+                        ["afplay", "-v", f"{self.volume:g}", self.music_file],
                         stdout=subprocess.DEVNULL,
                         stderr=subprocess.DEVNULL,
                     )
@@ -143,38 +280,126 @@ class MusicController:
             self.notify("Musik beendet.", "#4b58c2")
 
 
-def play_feedback_sound(sound: str, *, bell: Optional[Callable[[], None]] = None) -> None:
-    system = platform.system()
+class FeedbackSoundPool:
+    """Plays feedback sounds on a few fixed worker threads through a bounded queue.
 
-    if system == "Windows":
+    At most one sound of each kind waits at a time (further requests are
+    coalesced). ``max_pending`` is meant to be smaller than the number of
+    sound kinds: with the default of 1, a new kind replaces the waiting
+    sound, so only the latest feedback plays once a worker is free. Bursts
+    of clicks can thus neither pile up threads nor delay the UI. Queue
+    depth, drops and waiting times are reported to ``metrics``.
+    """
 
-        def _windows() -> None:
+    def __init__(
+        self,
+        play: Callable[[str], None],
+        *,
+        workers: int = 2,
+        max_pending: int = 1,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.play = play
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.metrics = metrics or METRICS
+        self._pending: deque[tuple[str, float]] = deque()
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, sound: str) -> bool:
+        """Queue ``sound``; return ``False`` if it was coalesced or the pool is closed."""
+        metrics = self.metrics
+        with self._condition:
+            if self._closed:
+                return False
+            if any(name == sound for name, _ in self._pending):
+                metrics.counter(FEEDBACK_COALESCED).inc()
+                return False
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                metrics.counter(FEEDBACK_DROPPED).inc()
+            self._pending.append((sound, time.perf_counter()))
+            metrics.gauge(FEEDBACK_QUEUE_DEPTH).set(len(self._pending))
+            if len(self._threads) < self.workers:
+                self._start_worker()
+            self._condition.notify()
+        return True
+
+    def close(self, timeout: float = 0.5) -> None:
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def _start_worker(self) -> None:
+        thread = threading.Thread(target=self._work, name=f"feedback-sound-{len(self._threads)}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _work(self) -> None:
+        metrics = self.metrics
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                sound, queued_at = self._pending.popleft()
+                metrics.gauge(FEEDBACK_QUEUE_DEPTH).set(len(self._pending))
+            metrics.observe(FEEDBACK_SOUND_DELAY, time.perf_counter() - queued_at)
+            with suppress(Exception):
+                self.play(sound)
+
+
+def _play_system_sound(sound: str) -> None:
+    """Play a platform feedback sound; blocks until it has finished."""
+    if platform.system() == "Windows":
+        try:
+            import winsound
+
+            alias = winsound.MB_ICONASTERISK if sound == "success" else winsound.MB_ICONHAND
+            winsound.MessageBeep(alias)
+        except Exception:
             try:
                 import winsound
 
-                alias = winsound.MB_ICONASTERISK if sound == "success" else winsound.MB_ICONHAND
-                winsound.MessageBeep(alias)
+                frequency = 880 if sound == "success" else 440
+                winsound.Beep(frequency, 150)
             except Exception:
-                try:
-                    import winsound
-
-                    frequency = 880 if sound == "success" else 440
-                    winsound.Beep(frequency, 150)
-                except Exception:
-                    pass
+                pass
+    else:
+        sound_name = "Glass.aiff" if sound == "success" else "Basso.aiff"
+        path = os.path.join("/System/Library/Sounds", sound_name)
+        try:
+            subprocess.run(["afplay", path], check=False)
+        except FileNotFoundError:
+            pass
+
+
+def feedback_pool() -> FeedbackSoundPool:
+    """Return the process-wide pool for system feedback sounds, created on first use."""
+    global _feedback_pool
+    if _feedback_pool is None:
+        with _mixer_lock:
+            if _feedback_pool is None:
+                pool = FeedbackSoundPool(_play_system_sound, workers=FEEDBACK_WORKERS, max_pending=FEEDBACK_QUEUE_LIMIT)
+                atexit.register(pool.close)
+                _feedback_pool = pool
+    return _feedback_pool
 
-        threading.Thread(target=_windows, daemon=True).start()
-    elif system == "Darwin":
 
-        def _macos() -> None:
-            sound_name = "Glass.aiff" if sound == "success" else "Basso.aiff"
-            path = os.path.join("/System/Library/Sounds", sound_name)
-            try:
-                subprocess.run(["afplay", path], check=False)
-            except FileNotFoundError:
-                pass
+def play_feedback_sound(sound: str, *, bell: Optional[Callable[[], None]] = None) -> None:
+    mixer = _mixer if _mixer_probed else None
+    if mixer is not None:
+        mixer.play(feedback_sounds()[sound], volume=FEEDBACK_VOLUME)
+        return
 
-        threading.Thread(target=_macos, daemon=True).start()
+    if platform.system() in ("Windows", "Darwin"):
+        feedback_pool().submit(sound)
     else:
         if bell is not None:
             try:
@@ -1,75 +1,144 @@
+import argparse
 import asyncio
+import logging
+import math
 import os
 import time
-import inspect
-from concurrent.futures import Future
-from typing import Any, Callable, Coroutine, Optional
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Optional, Sequence
 
 import flet as ft
 
-from audio import MusicController, play_feedback_sound
+from audio import MusicController, play_feedback_sound, preload_audio
 from config import (
     ACCENT_BLUE,
     ACTIVE_COLORS,
     CARD_BG,
+    DEFAULT_PLAYER_NAME,
+    EVENT_LOG_ENABLED,
     FEEDBACK_BASE,
+    KEY_BUFFER_LIMIT,
     LOGO_PATH,
+    MAX_SESSIONS,
+    METRICS_INTERVAL,
     MUSIC_PATH,
     NEUTRAL_BG,
     NEUTRAL_BG_ALT,
+    SESSION_LOG_DIR,
     START_DELAY_MS,
     TEXT_MUTED,
     TEXT_PRIMARY,
     TIME_COLOR,
+    WEB_PORT,
 )
-from game import ColorMemoryEngine
+from diagnostics import SessionProfiler, monitor_loop
+from eventlog import EventLogWriter
+from flow import FlowSnapshot, GameFlow, Phase, Trigger
+from game import ColorMemoryEngine, Progress
+from metrics import (
+    CLICK_FEEDBACK,
+    METRICS,
+    REACTION_TIME,
+    ROUND_PREPARE,
+    STARTUP,
+    MetricsExporter,
+    MetricsRegistry,
+)
+from scheduler import SessionScheduler
+from sequence import daily_seed
+from server import SessionHub
+from ui_updates import UpdateScheduler, ViewModel
 
 
-class ColorMemoryApp:
-    """Flet implementation of the Color Memory Game."""
+# Timer keys of the session scheduler
+_ROUND_STEP = "round"
+_TIMER_TICK = "timer-tick"
+_TIMEOUT = "timeout"
+_FLASH = "flash"
 
-    def __init__(self, page: ft.Page) -> None:
-        self.page = page
-        self.engine = ColorMemoryEngine(allowed_words=ACTIVE_COLORS)
-        call_from_thread = getattr(self.page, "call_from_thread", None)
 
-        def notify_callback(message: str, color: str) -> None:
-            if callable(call_from_thread):
-                call_from_thread(lambda: self._show_feedback(message, color))
-            else:
-                self._show_feedback(message, color)
+def key_bindings(words: Sequence[str]) -> dict[str, str]:
+    """Map Flet key names to color words.
 
-        def invoke_later(func: Callable[[], None]) -> None:
-            if callable(call_from_thread):
-                call_from_thread(func)
-            else:
-                func()
+    Digits (also on the numpad) follow the tile order; initials are bound
+    where no other color starts with the same letter.
+    """
+    bindings: dict[str, str] = {}
+    for index, word in enumerate(words[:9], start=1):
+        bindings[str(index)] = word
+        bindings[f"Numpad {index}"] = word
+    initials = Counter(word[:1].upper() for word in words)
+    for word in words:
+        initial = word[:1].upper()
+        if initial and initials[initial] == 1:
+            bindings.setdefault(initial, word)
+    return bindings
+
+
+@lru_cache(maxsize=1)
+def _logo_available() -> bool:
+    return os.path.exists(LOGO_PATH)
 
+
+class ColorMemoryApp:
+    """Flet implementation of the Color Memory Game."""
+
+    def __init__(
+        self,
+        page: ft.Page,
+        *,
+        engine: Optional[ColorMemoryEngine] = None,
+        release_engine: Optional[Callable[[ColorMemoryEngine], None]] = None,
+        audio: bool = True,
+        daily: bool = False,
+        server: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
+        profile_dir: Optional[str] = None,
+    ) -> None:
+        self.page = page
+        self.metrics = metrics or METRICS
+        self.ui = UpdateScheduler(page, metrics=self.metrics)
+        # All property writes go through the view-model, which skips unchanged values.
+        self.view = ViewModel(self.ui)
+        self.engine = engine or ColorMemoryEngine(allowed_words=ACTIVE_COLORS)
+        self.release_engine = release_engine
+        self.audio_enabled = audio
+        self.daily_challenge = daily
+        # Web sessions share one leaderboard, so no single visitor may reset it.
+        self.server_mode = server
+        # Every handler of this session runs on one coroutine, fed by posted messages.
+        self.session = SessionScheduler()
         self.music = MusicController(
             music_file=MUSIC_PATH,
-            notify=notify_callback,
-            invoke_later=invoke_later,
+            notify=lambda message, color: self.session.post(self._show_feedback, message, color),
+            invoke_later=self.session.post,
         )
+        # With --profile, the session's handlers and frame flushes run under its own profiler.
+        self.profiler: Optional[SessionProfiler] = None
+        if profile_dir:
+            self.profiler = SessionProfiler.for_session(profile_dir)
+            self.session.profiler = self.profiler
+            self.ui.profiler = self.profiler
 
         # Runtime state
-        self.player_name: str = "Spieler"
-        self.game_active: bool = False
-        self.tiles_enabled: bool = False
+        self.player_name: str = DEFAULT_PLAYER_NAME
+        self.flow = GameFlow(self.engine, player_name=self.player_name)
         self.timer_enabled: bool = False
         self.remaining_time: float = 0.0
         self.timer_deadline: Optional[float] = None
-        self.player_sequence: list[str] = []
         self.session_start_time: float = 0.0
         self.round_start_time: float = 0.0
-
-        # Async tasks
-        self.timer_task: Optional[Any] = None
-        self.round_delay_task: Optional[Any] = None
-        self.flash_tasks: dict[str, Any] = {}
-        self._tracked_tasks: set[asyncio.Task] = set()
-        self._tracked_futures: set[Future] = set()
-
-        # UI controls (initialised in setup)
+        self.input_ready_time: Optional[float] = None
+        self.event_log: Optional[EventLogWriter] = None
+        self._rendered: Optional[FlowSnapshot] = None
+        # Keyboard input: resolved through one dict lookup per key press.
+        self.key_map: dict[str, str] = key_bindings(self.engine.allowed_words)
+        self._key_buffer: deque[tuple[str, float]] = deque()
+        self._closed = False
+
+        # UI controls (menu in setup, game view on first start)
+        self.view_stack: Optional[ft.Stack] = None
         self.menu_container: Optional[ft.Control] = None
         self.game_container: Optional[ft.Control] = None
         self.player_field: Optional[ft.TextField] = None
@@ -82,6 +151,8 @@ class ColorMemoryApp:
         self.selection_status: Optional[ft.Text] = None
         self.feedback_text: Optional[ft.Text] = None
         self.color_tiles: dict[str, ft.Container] = {}
+        self.tile_rings: dict[str, ft.Container] = {}
+        self.tiles_grid: Optional[ft.Container] = None
         self.timer_switch: Optional[ft.Switch] = None
         self.summary_dialog: Optional[ft.AlertDialog] = None
 
@@ -95,23 +166,47 @@ class ColorMemoryApp:
         self.page.window_bgcolor = NEUTRAL_BG
         self.page.window_full_screen = True
         self.page.on_close = self._on_page_close
+        self.page.on_keyboard_event = self._on_keyboard
+        self.session.start()
 
-        menu = await self._build_menu_view()
-        game = await self._build_game_view()
-        self.menu_container = menu
-        self.game_container = game
-        self.game_container.visible = False
-
+        started = time.perf_counter()
+        self.menu_container = await self._build_menu_view()
+        # Only the menu is sent on first paint; the game view follows on demand.
+        self.view_stack = ft.Stack(controls=[self.menu_container], expand=True)
         root = ft.Container(
-            content=ft.Stack(
-                controls=[self.menu_container, self.game_container],
-                expand=True,
-            ),
+            content=self.view_stack,
             bgcolor=NEUTRAL_BG,
             expand=True,
         )
         self.page.add(root)
-        self.page.update()
+        self.metrics.observe(STARTUP, time.perf_counter() - started)
+        # Queued behind the first paint, so the game controls are built once the menu is on screen.
+        self.session.post(self._get_game_view)
+        if self.audio_enabled:
+            preload_audio(MUSIC_PATH)
+
+    async def _get_game_view(self) -> ft.Container:
+        """Return the game view, building it on first use and reusing it afterwards."""
+        if self.game_container is None:
+            game = await self._build_game_view()
+            game.visible = False
+            self.game_container = game
+            # Fresh controls: the next render writes every part of the view.
+            self._rendered = None
+        return self.game_container
+
+    async def _show_game_view(self) -> None:
+        game = await self._get_game_view()
+        self.view.set(self.menu_container, visible=False)
+        if self.view_stack is not None and game not in self.view_stack.controls:
+            # First show: the game view goes out as one add command of the stack. Flush it right
+            # away, since Flet assigns control ids only then and later writes target its controls.
+            game.visible = True
+            self.view_stack.controls.append(game)
+            self.ui.request(self.view_stack)
+            self.ui.flush_now()
+        else:
+            self.view.set(game, visible=True)
 
     async def _build_menu_view(self) -> ft.Container:
         subtitle = ft.Text(
@@ -121,9 +216,6 @@ class ColorMemoryApp:
             color=TEXT_MUTED,
         )
 
-        def _on_submit(e: ft.ControlEvent) -> None:
-            self._spawn(self._handle_menu_start)
-
         self.player_field = ft.TextField(
             label="Dein Name",
             hint_text="z. B. Alex",
@@ -131,14 +223,16 @@ class ColorMemoryApp:
             border_radius=14,
             text_align=ft.TextAlign.CENTER,
             autofocus=True,
-            on_submit=_on_submit,
+            on_submit=self._on_event(self._handle_menu_start),
         )
+        # The player types into the field, so its value is not what the view-model last wrote.
+        self.view.client_edited(self.player_field)
 
         start_button = ft.FilledButton(
             "Spiel starten",
             icon="play_arrow_rounded",
             style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=16)),
-            on_click=lambda e: self._spawn(self._handle_menu_start),
+            on_click=self._on_event(self._handle_menu_start),
             width=220,
             height=48,
         )
@@ -152,7 +246,7 @@ class ColorMemoryApp:
         )
 
         logo_control: Optional[ft.Control] = None
-        if os.path.exists(LOGO_PATH):
+        if _logo_available():
             logo_control = ft.Image(
                 src=LOGO_PATH,
                 height=180,
@@ -199,7 +293,7 @@ class ColorMemoryApp:
             color=ACCENT_BLUE,
         )
         self.timer_text = ft.Text("Zeit: ∞", size=20, weight=ft.FontWeight.W_600, color=TIME_COLOR)
-        self.player_badge = ft.Text("👤 Spieler", size=18, color=TEXT_MUTED)
+        self.player_badge = ft.Text(f"👤 {DEFAULT_PLAYER_NAME}", size=18, color=TEXT_MUTED)
 
         stats_row = ft.ResponsiveRow(
             controls=[
@@ -212,7 +306,7 @@ class ColorMemoryApp:
         )
 
         logo_controls: list[ft.Control] = []
-        if os.path.exists(LOGO_PATH):
+        if _logo_available():
             game_logo = ft.Image(
                 src=LOGO_PATH,
                 height=160,
@@ -276,30 +370,46 @@ class ColorMemoryApp:
 
         tiles_row = ft.ResponsiveRow(alignment=ft.MainAxisAlignment.CENTER, spacing=12, run_spacing=12)
         self.color_tiles = {}
-        for name in self.engine.active_words:
+        self.tile_rings = {}
+        shortcuts = {word: key for key, word in reversed(self.key_map.items()) if len(key) == 1}
+        # Every allowed color gets a tile; the difficulty decides which ones are shown.
+        for name in self.engine.allowed_words:
             base_color = self.engine.color_map.get(name, CARD_BG)
-            text_color = self._ideal_text_color(base_color)
-            tile = ft.Container(
+            text_color = self.engine.palette.text_color(name)
+            label = ft.Container(
                 content=ft.Column(
                     [
                         ft.Text(name, size=20, weight=ft.FontWeight.BOLD, color=text_color, text_align=ft.TextAlign.CENTER),
+                        ft.Text(shortcuts.get(name, ""), size=12, color=text_color, text_align=ft.TextAlign.CENTER),
                     ],
                     alignment=ft.MainAxisAlignment.CENTER,
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                     expand=True,
                 ),
-                bgcolor=base_color,
                 padding=20,
+                alignment=ft.alignment.center,
+            )
+            # The click highlight is sent once with the tile; flashing only toggles its visibility.
+            ring = ft.Container(border=ft.border.all(4, ACCENT_BLUE), border_radius=24, visible=False)
+            tile = ft.Container(
+                content=ft.Stack([label, ring], fit=ft.StackFit.EXPAND),
+                bgcolor=base_color,
                 border_radius=24,
                 height=120,
-                alignment=ft.alignment.center,
                 animate=ft.Animation(250, ft.AnimationCurve.EASE_IN_OUT),
-                animate_scale=ft.Animation(150, ft.AnimationCurve.EASE_IN_OUT),
                 col={"xs": 12, "sm": 6, "md": 4, "lg": 3, "xl": 2},
             )
             tile.on_click = self._create_color_handler(name)
             tiles_row.controls.append(tile)
             self.color_tiles[name] = tile
+            self.tile_rings[name] = ring
+
+        # Enabled/disabled look lives on the grid, one control instead of one per tile.
+        self.tiles_grid = ft.Container(
+            content=tiles_row,
+            animate_opacity=ft.Animation(250, ft.AnimationCurve.EASE_IN_OUT),
+            animate_scale=ft.Animation(150, ft.AnimationCurve.EASE_IN_OUT),
+        )
 
         self.feedback_text = ft.Text(
             "",
@@ -315,7 +425,7 @@ class ColorMemoryApp:
                     "Start",
                     icon="play_circle_filled_rounded",
                     style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=16)),
-                    on_click=lambda e: self._spawn(self._start_game),
+                    on_click=self._on_event(self._start_game),
                     height=44,
                     col={"xs": 12, "sm": 6, "md": 3},
                 ),
@@ -323,7 +433,7 @@ class ColorMemoryApp:
                     "Stop",
                     icon="pause_circle_filled_rounded",
                     style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=16)),
-                    on_click=lambda e: self._spawn(lambda: self._stop_game(manual=True)),
+                    on_click=self._on_event(self._stop_game),
                     height=44,
                     col={"xs": 12, "sm": 6, "md": 3},
                 ),
@@ -331,15 +441,16 @@ class ColorMemoryApp:
                     "Highscore zurücksetzen",
                     icon="restart_alt_rounded",
                     style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=16)),
-                    on_click=lambda e: self._spawn(self._reset_highscore),
+                    on_click=self._on_event(self._reset_highscore),
                     height=44,
                     col={"xs": 12, "sm": 6, "md": 3},
+                    visible=not self.server_mode,
                 ),
                 ft.OutlinedButton(
                     "Zum Menü",
                     icon="home_rounded",
                     style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=16)),
-                    on_click=lambda e: self._spawn(self._return_to_menu),
+                    on_click=self._on_event(self._return_to_menu),
                     height=44,
                     col={"xs": 12, "sm": 6, "md": 3},
                 ),
@@ -347,11 +458,15 @@ class ColorMemoryApp:
             run_spacing=12,
         )
 
+        async def on_timer_switch(e: ft.ControlEvent) -> None:
+            self.session.post(self._toggle_timer, bool(e.control.value))
+
         self.timer_switch = ft.Switch(
             label="Timer aktiv",
             value=self.timer_enabled,
-            on_change=lambda e: self._spawn(lambda: self._toggle_timer(e.control.value)),
+            on_change=on_timer_switch,
         )
+        self.view.client_edited(self.timer_switch)
         timer_row = ft.Row(
             controls=[self.timer_switch],
             alignment=ft.MainAxisAlignment.CENTER,
@@ -365,7 +480,7 @@ class ColorMemoryApp:
                         logo_section,
                         self.word_container,
                         self.selection_status,
-                        tiles_row,
+                        self.tiles_grid,
                         self.feedback_text,
                         controls_row,
                         timer_row,
@@ -386,14 +501,20 @@ class ColorMemoryApp:
             alignment=ft.alignment.center,
         )
 
-    def _create_color_handler(self, color_name: str) -> Callable[[ft.ControlEvent], None]:
-        async def handler(_: ft.ControlEvent) -> None:
-            await self._on_color_selected(color_name)
+    def _on_event(self, handler: Callable[..., Any], *args: Any) -> Callable[[ft.ControlEvent], Coroutine[Any, Any, None]]:
+        """Return a control event handler that posts ``handler(*args)`` to the session."""
+
+        # Coroutine handlers run on the page's loop instead of Flet's thread pool.
+        async def post(_: ft.ControlEvent) -> None:
+            self.session.post(handler, *args)
+
+        return post
 
-        def wrapper(event: ft.ControlEvent) -> None:
-            self._spawn(lambda: handler(event))
+    def _create_color_handler(self, color_name: str) -> Callable[[ft.ControlEvent], Coroutine[Any, Any, None]]:
+        async def post(_: ft.ControlEvent) -> None:
+            self.session.post(self._on_color_selected, color_name, time.perf_counter())
 
-        return wrapper
+        return post
 
     async def _handle_menu_start(self) -> None:
         if self.player_field:
@@ -401,239 +522,277 @@ class ColorMemoryApp:
             if value:
                 self.player_name = value
             else:
-                self.player_name = "Spieler"
-            self.player_field.value = self.player_name
-        self.player_badge.value = f"👤 {self.player_name}"
-        if self.menu_container and self.game_container:
-            self.menu_container.visible = False
-            self.game_container.visible = True
-        self.page.update()
+                self.player_name = DEFAULT_PLAYER_NAME
+            self.view.set(self.player_field, value=self.player_name)
+        self.flow.player_name = self.player_name
+        await self._show_game_view()
+        self.view.set(self.player_badge, value=f"👤 {self.player_name}")
         await self._start_game()
 
     async def _start_game(self) -> None:
-        if self.game_active:
+        if self.flow.snapshot.active:
             return
         self.session_start_time = time.perf_counter()
-        await self._prepare_new_session()
-        self.game_active = True
-        self._show_feedback("Merke dir das Wort!", "#5164d8")
-        self._schedule_next_round(START_DELAY_MS / 1000)
-
-    async def _prepare_new_session(self) -> None:
-        self._cancel_all_tasks()
+        self._cancel_scheduled()
         self.music.cleanup()
-        self.engine.reset()
-        self.player_sequence.clear()
-        self.tiles_enabled = False
         self.remaining_time = 0.0
-        self.timer_deadline = None
-        self._update_score_label(0)
         self._update_time_label()
-        if self.selection_status:
-            self.selection_status.value = "Auswahl: —"
-            self.selection_status.color = TEXT_MUTED
-        if self.word_text:
-            self.word_text.value = "Bereit?"
-            self.word_text.color = TEXT_PRIMARY
-        if self.word_container:
-            self.word_container.bgcolor = CARD_BG
-        self._set_tiles_enabled(False)
         self._clear_feedback()
-        self.page.update()
+        # In the daily challenge every player gets the same sequence for the day.
+        if self.daily_challenge:
+            self.flow.start(daily_seed(), adapt_palette=False)
+        else:
+            self.flow.start()
+        self._open_event_log()
+        self._show_feedback("Merke dir das Wort!", "#5164d8")
+        self._render()
+        self._schedule_next_round(START_DELAY_MS / 1000)
 
     def _schedule_next_round(self, delay: float) -> None:
-        self._cancel_task(self.round_delay_task)
-        self.round_delay_task = self._spawn(lambda: self._delayed_round_start(delay))
-
-    async def _delayed_round_start(self, delay: float) -> None:
-        try:
-            await asyncio.sleep(delay)
-            if self.game_active:
-                await self._advance_round()
-        except asyncio.CancelledError:
-            pass
+        # Shares its key with the reveal steps, so a pending step of the last round is dropped.
+        self.session.post_later(delay, _ROUND_STEP, self._advance_round)
 
     async def _advance_round(self) -> None:
-        if not self.game_active:
+        with self.metrics.time(ROUND_PREPARE):
+            advanced = self.flow.next_round()
+        if not advanced:
             return
+        state = self.flow.snapshot
+        if self.event_log:
+            self.event_log.log_round(state.round, state.word_id, state.color_id)
         self._clear_feedback()
-        round_data = self.engine.prepare_next_round()
-        word = str(round_data["word"])
-        text_color = str(round_data["text_color"])
-        background_color = str(round_data["background_color"])
-        self.remaining_time = float(round_data["time_budget"])
-        self.player_sequence = []
-        self.tiles_enabled = False
+        self.remaining_time = state.time_budget
         self.round_start_time = time.perf_counter()
-        self._update_score_label()
-        if self.selection_status:
-            self.selection_status.value = "Auswahl: —"
-            self.selection_status.color = TEXT_MUTED
-
-        if self.word_text:
-            self.word_text.value = word
-            self.word_text.color = text_color
-        if self.word_container:
-            self.word_container.bgcolor = CARD_BG
-
-        self._set_tiles_enabled(False)
+        self.input_ready_time = None
         self._start_timer()
-        self.music.start()
-        self.page.update()
-
-        await asyncio.sleep(0.18)
-        if self.word_container:
-            self.word_container.bgcolor = background_color
-        self.page.update()
-
-        self._set_tiles_enabled(True)
-        if self.selection_status and not self.player_sequence:
-            self.selection_status.value = "Auswahl: bereit"
-            self.selection_status.color = ACCENT_BLUE
-        self.page.update()
-
-        await asyncio.sleep(1.2)
-        if not self.game_active:
+        if self.audio_enabled:
+            self.music.start()
+        self._render()
+        self.session.post_later(0.18, _ROUND_STEP, self._reveal_round)
+
+    def _reveal_round(self) -> None:
+        if not self.flow.reveal():
             return
-        if self.word_text:
-            self.word_text.value = "?"
-            self.word_text.color = TEXT_PRIMARY
-        if self.word_container:
-            self.word_container.bgcolor = CARD_BG
-        self._set_tiles_enabled(True)
-        self.page.update()
-
-    async def _on_color_selected(self, color_name: str) -> None:
-        if not self.game_active or not self.tiles_enabled:
+        self.input_ready_time = time.perf_counter()
+        self._render()
+        self.session.post_later(self.flow.snapshot.display_time, _ROUND_STEP, self._hide_word)
+        self._replay_keys()
+
+    def _hide_word(self) -> None:
+        if self.flow.hide():
+            self._render()
+
+    async def _on_keyboard(self, e: ft.KeyboardEvent) -> None:
+        # Awaited inline by Flet and never suspends: no task or thread per key press.
+        if e.ctrl or e.alt or e.meta:
             return
-        self.player_sequence.append(color_name)
-        if self.selection_status:
-            self.selection_status.value = "Auswahl: " + " · ".join(self.player_sequence)
-            self.selection_status.color = ACCENT_BLUE
-        self._flash_tile(color_name)
-        self.page.update()
-
-        expected = self.engine.sequence
-        index = len(self.player_sequence) - 1
+        color_name = self.key_map.get(e.key)
+        if color_name is not None:
+            self.session.dispatch(self._on_key_color, color_name, time.perf_counter())
 
-        if index >= len(expected):
-            await self._trigger_failure()
+    def _on_key_color(self, color_name: str, received_at: float) -> None:
+        state = self.flow.snapshot
+        if color_name not in state.colors:
             return
-
-        if self.player_sequence[index].casefold() != expected[index].casefold():
-            await self._trigger_failure()
+        if state.phase is Phase.SHOWING:
+            # Typed ahead while the word is revealed: applied as soon as input opens.
+            if len(self._key_buffer) < KEY_BUFFER_LIMIT:
+                self._key_buffer.append((color_name, received_at))
             return
+        if self._select_color(color_name, received_at) is Progress.WRONG:
+            self.session.post(self._handle_failure, received_at)
 
-        if len(self.player_sequence) == len(expected):
+    def _replay_keys(self) -> None:
+        """Apply the keys typed during the reveal, in order."""
+        buffered = self._key_buffer
+        if not buffered:
+            return
+        # The first key beat the reveal and gets no reaction time; later ones count from their predecessor.
+        self.input_ready_time = None
+        while buffered:
+            color_name, received_at = buffered.popleft()
+            if self._select_color(color_name, received_at) is Progress.WRONG:
+                buffered.clear()
+                self.session.post(self._handle_failure, received_at)
+
+    async def _on_color_selected(self, color_name: str, received_at: Optional[float] = None) -> None:
+        if received_at is None:
+            received_at = time.perf_counter()
+        if self._select_color(color_name, received_at) is Progress.WRONG:
+            await self._handle_failure(received_at)
+
+    def _select_color(self, color_name: str, received_at: Optional[float] = None) -> Optional[Progress]:
+        """Submit one color and render its feedback; a wrong one is left to ``_handle_failure``."""
+        if not self.flow.snapshot.accepts_input:
+            return None
+        if received_at is None:
+            received_at = time.perf_counter()
+        # Reaction time counts from the tiles becoming clickable, then from the previous click.
+        reaction_time = None
+        if self.input_ready_time is not None:
+            reaction_time = received_at - self.input_ready_time
+            self.metrics.observe(REACTION_TIME, reaction_time)
+        self.input_ready_time = received_at
+
+        progress = self.flow.click(color_name, reaction_time)
+        if self.event_log and progress is not None:
+            self.event_log.log_click(self.flow.snapshot.round, self.engine.color_id(color_name), progress)
+        if progress is Progress.WRONG:
+            return progress
+        self._flash_tile(color_name)
+        if progress is Progress.COMPLETE:
             self._cancel_timer()
-            self.engine.register_success(self.player_name)
-            play_feedback_sound("success")
+            self._play_feedback("success")
             self._show_feedback("Richtig!", "#2f8c68")
-            self._update_score_label()
-            if self.selection_status:
-                self.selection_status.value = "Auswahl: ✓"
-                self.selection_status.color = "#2f8c68"
-            self._set_tiles_enabled(False)
-            self.page.update()
             self._schedule_next_round(0.6)
-
-    async def _trigger_failure(self) -> None:
-        self._cancel_timer()
-        await self._handle_failure()
-
-    async def _handle_failure(self) -> None:
-        if not self.game_active:
+        self._render()
+        self.ui.flush_now()
+        self.metrics.observe(CLICK_FEEDBACK, time.perf_counter() - received_at)
+        return progress
+
+    async def _handle_failure(self, received_at: Optional[float] = None) -> None:
+        """Show the game over; ``received_at`` is the time of the wrong input, if any."""
+        state = self.flow.snapshot
+        if state.phase is not Phase.FAIL:
             return
-        score, new_highscore, solution = self.engine.register_failure(self.player_name)
-        play_feedback_sound("failure")
-        message = f"Falsch! Runde {score} geschafft."
-        if new_highscore:
+        if self.event_log:
+            self.event_log.log_game_over(state.score)
+        self._close_event_log()
+        self._end_game(cleanup_music=False)
+        self._play_feedback("failure")
+        message = f"Falsch! Runde {state.score} geschafft."
+        if state.new_highscore:
             message += " Neuer Highscore!"
         self._show_feedback(message, "#c34d5e")
-        solution_text = "Lösung: " + solution
-        await self._handle_stop(
-            label_text="Game Over",
-            label_color="#c34d5e",
-            cleanup_music=False,
-            reset_progress=False,
-            solution_text=solution_text,
-        )
+        self._render()
         self.music.stop()
-        await self._show_summary(score, new_highscore, solution)
+        await self._show_summary(state.score, state.new_highscore, state.solution)
+        if received_at is not None:
+            self.metrics.observe(CLICK_FEEDBACK, time.perf_counter() - received_at)
 
-    async def _stop_game(self, manual: bool = False) -> None:
-        if not self.game_active:
+    async def _stop_game(self) -> None:
+        if not self.flow.snapshot.active:
             self._show_feedback("Kein Spiel läuft.", "#d48b1f")
             return
         self._show_feedback("Spiel gestoppt.", "#c34d5e")
-        await self._handle_stop(label_text="Gestoppt", label_color="#c34d5e")
-        if manual and self.selection_status:
-            self.selection_status.value = "Auswahl: —"
-            self.selection_status.color = TEXT_MUTED
-        self.page.update()
+        self._end_game()
+        self.flow.stop()
+        self._render()
 
-    async def _handle_stop(
-        self,
-        *,
-        label_text: str = "Gestoppt",
-        label_color: str = "#c34d5e",
-        cleanup_music: bool = True,
-        reset_progress: bool = True,
-        solution_text: Optional[str] = None,
-    ) -> None:
-        self._cancel_all_tasks()
+    def _end_game(self, *, cleanup_music: bool = True) -> None:
+        """Release everything a running game holds; the flow decides what is shown."""
+        self._cancel_scheduled()
         if cleanup_music:
             self.music.cleanup()
-        self.game_active = False
-        self.tiles_enabled = False
-        if reset_progress:
-            self.engine.reset()
-        if self.word_text:
-            self.word_text.value = label_text
-            self.word_text.color = label_color
-        if self.word_container:
-            self.word_container.bgcolor = CARD_BG
+        if self.event_log:
+            self.event_log.log_stop(self.flow.snapshot.round)
+        self._close_event_log()
         self.remaining_time = 0.0
         self._update_time_label()
-        self.player_sequence.clear()
-        self._set_tiles_enabled(False)
-        if reset_progress:
-            self._update_score_label(0)
-        if solution_text and self.word_text:
-            self.word_text.value = solution_text
-            self.word_text.color = TEXT_PRIMARY
-            self.word_text.size = 32
+
+    # ------------------------------------------------------------------#
+    # Rendering
+    # ------------------------------------------------------------------#
+
+    def _render(self) -> None:
+        """Bring the game view in line with the current flow snapshot.
+
+        Only the parts whose source fields changed since the last rendered
+        snapshot are rewritten and marked for the next update.
+        """
+        state = self.flow.snapshot
+        previous = self._rendered
+        if state is previous:
+            return
+        self._rendered = state
+
+        def changed(*fields: str) -> bool:
+            return previous is None or any(getattr(state, name) != getattr(previous, name) for name in fields)
+
+        view = self.view
+        if changed("phase", "trigger", "word", "word_visible", "solution"):
+            value, color, size, background = self._word_display(state)
+            view.set(self.word_text, value=value, color=color, size=size)
+            view.set(self.word_container, bgcolor=background)
+
+        if changed("phase"):
+            self._set_tiles_enabled(state.accepts_input)
+
+        if changed("colors"):
+            for name, tile in self.color_tiles.items():
+                view.set(tile, visible=name in state.colors)
+
+        if changed("phase", "selection"):
+            if state.phase is Phase.SUCCESS:
+                value, color = "Auswahl: ✓", "#2f8c68"
+            elif state.selection:
+                value, color = "Auswahl: " + " · ".join(state.selection), ACCENT_BLUE
+            elif state.accepts_input:
+                value, color = "Auswahl: bereit", ACCENT_BLUE
+            else:
+                value, color = "Auswahl: —", TEXT_MUTED
+            view.set(self.selection_status, value=value, color=color)
+
+        if changed("round"):
+            view.set(self.round_text, value=f"Runde: {state.round}")
+
+        if changed("highscore", "best_player"):
+            view.set(self.best_text, value=f"Best: {state.highscore} · {state.best_player}")
+
+    @staticmethod
+    def _word_display(state: FlowSnapshot) -> tuple[str, str, int, str]:
+        """Return text, text color, font size and background of the word card."""
+        phase = state.phase
+        if phase is Phase.FAIL:
+            return "Lösung: " + state.solution, TEXT_PRIMARY, 32, CARD_BG
+        if phase is Phase.IDLE:
+            if state.trigger is Trigger.STOP:
+                return "Gestoppt", "#c34d5e", 56, CARD_BG
+            return "Drücke Start", TEXT_PRIMARY, 56, CARD_BG
+        if phase is Phase.READY:
+            return "Bereit?", TEXT_PRIMARY, 56, CARD_BG
+        if not state.word_visible:
+            return "?", TEXT_PRIMARY, 56, CARD_BG
+        background = CARD_BG if phase is Phase.SHOWING else state.background_color
+        return state.word, state.text_color, 56, background
 
     def _set_tiles_enabled(self, enabled: bool) -> None:
-        self.tiles_enabled = enabled
-        opacity = 1.0 if enabled else 0.45
-        scale = 1.0 if enabled else 0.98
-        for tile in self.color_tiles.values():
-            tile.opacity = opacity
-            tile.scale = scale
-            if not enabled and tile.border is not None:
-                tile.border = None
+        self.view.set(self.tiles_grid, opacity=1.0 if enabled else 0.45, scale=1.0 if enabled else 0.98)
+        if not enabled:
+            for ring in self.tile_rings.values():
+                self.view.set(ring, visible=False)
 
     def _start_timer(self) -> None:
         self._cancel_timer()
-        if self.timer_enabled and self.game_active:
-            self.timer_deadline = time.perf_counter() + max(0.0, self.remaining_time)
-            self.timer_task = self._spawn(lambda: self._timer_loop(self.timer_deadline))
-
-    async def _timer_loop(self, deadline: float) -> None:
-        try:
-            while self.game_active and self.timer_enabled:
-                remaining = max(0.0, deadline - time.perf_counter())
-                self.remaining_time = round(remaining, 1)
-                self._update_time_label(self.remaining_time)
-                self.page.update()
-                if remaining <= 0:
-                    break
-                await asyncio.sleep(0.05)
-            if self.game_active and self.timer_enabled and self.remaining_time <= 0:
-                await self._handle_failure()
-        except asyncio.CancelledError:
-            pass
+        if self.timer_enabled and self.flow.snapshot.active:
+            # Deadlines use the loop clock so the timeout fires via call_at, independent of label updates.
+            deadline = self.session.time() + max(0.0, self.remaining_time)
+            self.timer_deadline = deadline
+            self.session.post_at(deadline, _TIMEOUT, self._on_timer_expired)
+            self._timer_tick(deadline)
+
+    def _timer_tick(self, deadline: float) -> None:
+        if not (self.flow.snapshot.active and self.timer_enabled) or deadline != self.timer_deadline:
+            return
+        remaining = deadline - self.session.time()
+        if remaining <= 0:
+            return
+        tenths = math.floor(remaining * 10 + 0.5)
+        self.remaining_time = tenths / 10
+        self._update_time_label(self.remaining_time)
+        # Tick again when the rounded label would show the next lower digit.
+        next_change = min(deadline, deadline - (tenths - 0.5) / 10)
+        self.session.post_at(next_change, _TIMER_TICK, self._timer_tick, deadline)
+
+    async def _on_timer_expired(self) -> None:
+        if not (self.timer_enabled and self.flow.can(Trigger.TIMEOUT)):
+            return
+        self.remaining_time = 0.0
+        self._update_time_label(0.0)
+        if self.event_log:
+            self.event_log.log_timeout(self.flow.snapshot.round)
+        self.flow.timeout()
+        await self._handle_failure()
 
     async def _toggle_timer(self, enabled: bool) -> None:
         self.timer_enabled = enabled
@@ -644,51 +803,59 @@ class ColorMemoryApp:
             self._show_feedback("Timer deaktiviert.", "#c67b1e")
             self._cancel_timer()
             self._update_time_label(None)
-        self.page.update()
 
     async def _reset_highscore(self) -> None:
-        self.engine.reset_highscore()
-        self._update_score_label()
+        if self.server_mode:
+            return
+        self.flow.reset_highscore()
+        self._render()
         self._show_feedback("Highscore zurückgesetzt.", "#c67b1e")
-        self.page.update()
 
     async def _return_to_menu(self) -> None:
-        await self._handle_stop()
+        self._end_game()
+        self.flow.stop()
+        self._render()
         if self.menu_container and self.game_container:
-            self.menu_container.visible = True
-            self.game_container.visible = False
-        self.page.update()
-
-    async def _show_highscore_dialog(self) -> None:
-        if self.engine.highscore > 0:
-            info = ft.Text(
-                f"Beste Runde: {self.engine.highscore} · Spieler: {self.engine.best_player}",
-                size=18,
-                weight=ft.FontWeight.W_600,
-            )
+            self.view.set(self.game_container, visible=False)
+            self.view.set(self.menu_container, visible=True)
+
+    async def _show_highscore_dialog(self, limit: int = 5) -> None:
+        # The query first waits for pending leaderboard writes, so it runs off the event loop.
+        rows = await asyncio.get_running_loop().run_in_executor(None, self.engine.top_scores, limit)
+        if rows:
+            entries: list[ft.Control] = [
+                ft.Text(
+                    f"{rank}. {player} · Runde {score}",
+                    size=18,
+                    weight=ft.FontWeight.W_600 if rank == 1 else None,
+                )
+                for rank, (player, score) in enumerate(rows, start=1)
+            ]
         else:
-            info = ft.Text(
-                "Noch kein Highscore erspielt.",
-                size=18,
-                color=TEXT_MUTED,
-            )
+            entries = [
+                ft.Text(
+                    "Noch kein Highscore erspielt.",
+                    size=18,
+                    color=TEXT_MUTED,
+                )
+            ]
 
         dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text("Highscore"),
             content=ft.Column(
-                [info],
+                entries,
                 tight=True,
                 spacing=12,
             ),
             actions=[
-                ft.TextButton("OK", on_click=lambda _: self._close_dialog()),
+                ft.TextButton("OK", on_click=self._on_event(self._close_dialog)),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
         self.page.dialog = dialog
         dialog.open = True
-        self.page.update()
+        self.ui.request()
 
     async def _show_summary(self, score: int, new_highscore: bool, solution: str) -> None:
         elapsed = max(0.0, time.perf_counter() - self.session_start_time)
@@ -711,14 +878,15 @@ class ColorMemoryApp:
             title=ft.Text("Spiel vorbei"),
             content=content,
             actions=[
-                ft.TextButton("zum Menü", on_click=lambda _: self._spawn(self._summary_to_menu)),
-                ft.FilledButton("Nochmal spielen", on_click=lambda _: self._spawn(self._summary_play_again)),
+                ft.TextButton("zum Menü", on_click=self._on_event(self._summary_to_menu)),
+                ft.FilledButton("Nochmal spielen", on_click=self._on_event(self._summary_play_again)),
             ],
             actions_alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
         )
         self.page.dialog = self.summary_dialog
         self.summary_dialog.open = True
-        self.page.update()
+        self.ui.request()
+        self.ui.flush_now()
 
     async def _summary_play_again(self) -> None:
         await self._close_dialog_async()
@@ -731,155 +899,185 @@ class ColorMemoryApp:
     def _close_dialog(self) -> None:
         if self.page.dialog:
             self.page.dialog.open = False
-            self.page.update()
+            self.ui.request(self.page.dialog)
 
     async def _close_dialog_async(self) -> None:
-        if self.page.dialog:
-            self.page.dialog.open = False
-        self.page.update()
+        self._close_dialog()
 
     def _flash_tile(self, color_name: str) -> None:
-        self._cancel_task(self.flash_tasks.get(color_name))
-        self.flash_tasks[color_name] = self._spawn(lambda: self._flash_tile_async(color_name))
-
-    async def _flash_tile_async(self, color_name: str) -> None:
-        tile = self.color_tiles.get(color_name)
-        if not tile:
+        ring = self.tile_rings.get(color_name)
+        if ring is None:
             return
-        try:
-            tile.border = ft.border.all(4, ACCENT_BLUE)
-            self.page.update()
-            await asyncio.sleep(0.25)
-        except asyncio.CancelledError:
-            pass
-        finally:
-            tile.border = None
-            self.page.update()
-
-    def _update_score_label(self, current: Optional[int] = None) -> None:
-        if current is None:
-            current = self.engine.round
-        if self.round_text:
-            self.round_text.value = f"Runde: {current}"
-        if self.best_text:
-            self.best_text.value = f"Best: {self.engine.highscore} · {self.engine.best_player}"
+        self.view.set(ring, visible=True)
+        self.session.post_later(0.25, (_FLASH, color_name), self._end_flash, color_name)
+
+    def _end_flash(self, color_name: str) -> None:
+        self.view.set(self.tile_rings.get(color_name), visible=False)
 
     def _update_time_label(self, seconds: Optional[float] = None) -> None:
-        if self.timer_text is None:
-            return
         if seconds is None or not self.timer_enabled:
-            self.timer_text.value = "Zeit: ∞"
+            value = "Zeit: ∞"
         else:
-            display = max(0.0, seconds)
-            self.timer_text.value = f"Zeit: {display:0.1f}s"
+            value = f"Zeit: {max(0.0, seconds):0.1f}s"
+        self.view.set(self.timer_text, value=value)
 
     def _show_feedback(self, message: str, color: str) -> None:
-        if self.feedback_text:
-            self.feedback_text.value = message
-            self.feedback_text.color = color
-        self.page.update()
+        self.view.set(self.feedback_text, value=message, color=color)
 
     def _clear_feedback(self) -> None:
-        if self.feedback_text:
-            self.feedback_text.value = ""
-            self.feedback_text.color = FEEDBACK_BASE
+        self.view.set(self.feedback_text, value="", color=FEEDBACK_BASE)
 
     def _cancel_timer(self) -> None:
-        self._cancel_task(self.timer_task)
-        self.timer_task = None
+        self.session.cancel(_TIMEOUT)
+        self.session.cancel(_TIMER_TICK)
         self.timer_deadline = None
 
-    def _cancel_all_tasks(self) -> None:
-        self._cancel_timer()
-        self._cancel_task(self.round_delay_task)
-        self.round_delay_task = None
-        for name, task in list(self.flash_tasks.items()):
-            self._cancel_task(task)
-            self.flash_tasks.pop(name, None)
-        for task in list(self._tracked_tasks):
-            self._cancel_task(task)
-        for future in list(self._tracked_futures):
-            future.cancel()
-            self._tracked_futures.discard(future)
-
-    def _cancel_task(self, task: Optional[Any]) -> None:
-        if task is None:
+    def _cancel_scheduled(self) -> None:
+        """Drop all pending round steps, timer ticks and tile flashes."""
+        self.session.cancel_all()
+        self._key_buffer.clear()
+        self.timer_deadline = None
+        for name in self.tile_rings:
+            self._end_flash(name)
+
+    async def _on_page_close(self, _: ft.ControlEvent) -> None:
+        # A coroutine handler, so closing runs on the page's loop rather than a worker thread.
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop the session and release its engine once no handler can use it any more; runs once."""
+        if self._closed:
             return
-        if isinstance(task, asyncio.Task):
-            if not task.done():
-                task.cancel()
-            try:
-                task.result()
-            except Exception:
-                pass
-            self._tracked_tasks.discard(task)
-        elif isinstance(task, Future):
-            task.cancel()
-            self._tracked_futures.discard(task)
-
-    def _on_page_close(self, _: ft.ControlEvent) -> None:
-        self._cancel_all_tasks()
+        self._closed = True
+        await self.session.aclose()
+        self.timer_deadline = None
+        self.ui.close()
         self.music.cleanup()
+        self._close_event_log()
+        if self.profiler is not None:
+            self.profiler.write()
+        if self.release_engine is not None:
+            release, self.release_engine = self.release_engine, None
+            release(self.engine)
+        else:
+            # Flushes pending leaderboard writes, which must not block the loop.
+            await asyncio.get_running_loop().run_in_executor(None, self.engine.close)
 
-    def _spawn(self, target: Any) -> Optional[asyncio.Task]:
-        run_task = getattr(self.page, "run_task", None)
-        if callable(run_task):
-            if inspect.iscoroutinefunction(target):
-                future = run_task(target)
-            else:
-                if inspect.iscoroutine(target):
-                    coro = target
-                elif callable(target):
-                    coro = target()
-                    if not inspect.iscoroutine(coro):
-                        return None
-                else:
-                    return None
-
-                async def runner() -> None:
-                    await coro
-
-                future = run_task(runner)
-
-            if isinstance(future, Future):
-                self._tracked_futures.add(future)
-                future.add_done_callback(lambda f: self._tracked_futures.discard(f))
-            return future
+    def _open_event_log(self) -> None:
+        self._close_event_log()
+        if not EVENT_LOG_ENABLED:
+            return
         try:
-            loop = asyncio.get_event_loop_policy().get_event_loop()
-        except RuntimeError:
-            loop = None
-        if inspect.iscoroutinefunction(target):
-            coro = target()
-        elif inspect.iscoroutine(target):
-            coro = target
-        elif callable(target):
-            coro = target()
-            if not inspect.iscoroutine(coro):
-                return None
-        else:
-            return None
+            self.event_log = EventLogWriter.for_session(SESSION_LOG_DIR, self.engine)
+        except OSError:
+            self.event_log = None
 
-        if loop and loop.is_running():
-            task = loop.create_task(coro)
-            self._tracked_tasks.add(task)
-            task.add_done_callback(lambda t: self._tracked_tasks.discard(t))
-            return task
-        else:
-            asyncio.run(coro)
-            return None
+    def _close_event_log(self) -> None:
+        if self.event_log is not None:
+            self.event_log.close()
+            self.event_log = None
 
-    @staticmethod
-    def _ideal_text_color(hex_color: str) -> str:
-        r, g, b = tuple(int(hex_color.lstrip("#")[i : i + 2], 16) for i in (0, 2, 4))
-        luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
-        return "#1f1f1f" if luminance > 0.6 else "#ffffff"
+    def _play_feedback(self, sound: str) -> None:
+        if self.audio_enabled:
+            play_feedback_sound(sound)
+
+
+def desktop(
+    *, daily: bool = False, diagnostics: bool = False, profile_dir: Optional[str] = None
+) -> Callable[[ft.Page], Coroutine[Any, Any, None]]:
+    """Return a Flet target for a single local session."""
+
+    async def session(page: ft.Page) -> None:
+        if diagnostics:
+            monitor_loop(METRICS)
+        app = ColorMemoryApp(page, daily=daily, profile_dir=profile_dir)
+        await app.setup()
+
+    return session
+
+
+main = desktop()
 
 
-async def main(page: ft.Page) -> None:
-    app = ColorMemoryApp(page)
-    await app.setup()
+def serve(
+    hub: SessionHub, *, daily: bool = False, diagnostics: bool = False, profile_dir: Optional[str] = None
+) -> Callable[[ft.Page], Coroutine[Any, Any, None]]:
+    """Return a Flet target that runs every browser session on a pooled engine."""
+
+    async def session(page: ft.Page) -> None:
+        if diagnostics:
+            # One monitor per loop, shared by all sessions on it.
+            monitor_loop(METRICS)
+        engine = hub.acquire()
+        if engine is None:
+            page.add(
+                ft.Text(
+                    "Der Server ist gerade ausgelastet. Bitte versuche es später erneut.",
+                    size=20,
+                    color=TEXT_MUTED,
+                    text_align=ft.TextAlign.CENTER,
+                )
+            )
+            return
+        # Sound would play on the server machine, so web sessions stay silent.
+        app = ColorMemoryApp(
+            page,
+            engine=engine,
+            release_engine=hub.release,
+            audio=False,
+            daily=daily,
+            server=True,
+            profile_dir=profile_dir,
+        )
+        try:
+            await app.setup()
+        except BaseException:
+            # Released through the app, so the page's close handler cannot return the engine a second time.
+            await app.close()
+            raise
+
+    return session
+
+
+def run(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Color Memory")
+    parser.add_argument("--web", action="store_true", help="als Webserver für viele Browser-Sitzungen starten")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=WEB_PORT)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--daily", action="store_true", help="Tages-Challenge: gleiche Sequenz für alle Spieler")
+    parser.add_argument(
+        "--metrics",
+        metavar="PFAD",
+        default=None,
+        help="Latenz-Metriken regelmäßig schreiben (*.json als Snapshot, sonst Prometheus-Textformat)",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        action="store_true",
+        help="Event-Loop-Verzögerung messen und blockierende Aufrufe mit Stack protokollieren",
+    )
+    parser.add_argument(
+        "--profile", metavar="VERZEICHNIS", default=None, help="cProfile-Daten pro Sitzung (*.pstats) schreiben"
+    )
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        MetricsExporter(METRICS, args.metrics, interval=METRICS_INTERVAL)
+    if args.diagnostics:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    options = {"daily": args.daily, "diagnostics": args.diagnostics, "profile_dir": args.profile}
+
+    if not args.web:
+        ft.app(target=desktop(**options))
+        return
+
+    hub = SessionHub(max_sessions=args.max_sessions, allowed_words=ACTIVE_COLORS)
+    try:
+        ft.app(target=serve(hub, **options), view=ft.AppView.WEB_BROWSER, host=args.host, port=args.port)
+    finally:
+        hub.close()
 
 
 if __name__ == "__main__":
-    ft.app(target=main)
+    run()
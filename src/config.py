@@ -1,3 +1,5 @@
+import os
+
 from utils import resource_path
 
 NEUTRAL_BG = "#f6f4ff"
@@ -12,9 +14,55 @@ TEXT_PRIMARY = "#1f1f1f"
 TEXT_MUTED = "#6a7090"
 CARD_BG = "#f3efff"
 START_DELAY_MS = 800
+SOLUTION_WINDOW = 20
 LOGO_PATH = resource_path("assets", "logo.png")
 MUSIC_PATH = resource_path("assets", "music.wav")
 HIGHSCORE_PATH = resource_path("data", "highscore.txt", create_parent=True)
+LEADERBOARD_PATH = resource_path("data", "leaderboard.sqlite3", create_parent=True)
+SESSION_LOG_DIR = os.path.join(os.path.dirname(HIGHSCORE_PATH), "sessions")
+EVENT_LOG_ENABLED = True
+METRICS_INTERVAL = 10.0  # seconds between metric file writes (--metrics)
+
+# Audio mixer (used when the optional sounddevice package finds an output device)
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNELS = 2
+AUDIO_BLOCK_FRAMES = 512  # ~12 ms per block at 44.1 kHz
+MUSIC_VOLUME = 0.3
+MUSIC_FADE = 0.3  # seconds of fade-in on start and fade-out on stop
+MUSIC_CROSSFADE = 0.0  # seconds blended at the loop seam (0 = plain sample-accurate loop)
+FEEDBACK_VOLUME = 0.6
+# System feedback sounds (afplay/winsound) when no mixer is available
+FEEDBACK_WORKERS = 2
+FEEDBACK_QUEUE_LIMIT = 1  # waiting sounds while all workers play; below the 2 sound kinds, so a stale one is dropped
+
+# Adaptive difficulty (src/difficulty.py); without history a player gets the fixed values.
+# Off by default: the leaderboard ranks all games together, which is only fair at a fixed difficulty.
+ADAPTIVE_DIFFICULTY = False
+DISPLAY_TIME = 1.2  # seconds the word stays visible
+MIN_DISPLAY_TIME = 0.5
+MAX_DISPLAY_TIME = 2.0
+REFERENCE_REACTION_TIME = 1.0  # average seconds per click that keeps DISPLAY_TIME unchanged
+TIME_BUDGET_MARGIN = 2.5  # seconds per word = margin × average reaction time, at most the timer factor
+MIN_SECONDS_PER_WORD = 1.0
+MIN_PALETTE_SIZE = 3
+SPAN_PER_COLOR = 2.0  # one more color per two words of estimated memory span
+REACTION_SMOOTHING = 0.2
+SPAN_SMOOTHING = 0.3
+REACTION_TIME_CAP = 5.0  # longer pauses count as this many seconds
+SKILL_BOOK_LIMIT = 10_000
+DEFAULT_PLAYER_NAME = "Spieler"  # used when no name is entered; never shares a skill estimate
+
+# Diagnostics (--diagnostics, --profile)
+LOOP_MONITOR_INTERVAL = 0.05  # seconds between event-loop heartbeats
+SLOW_CALLBACK_THRESHOLD = 0.1  # loop stalls at least this long are logged with a stack sample
+
+# Keyboard input
+KEY_BUFFER_LIMIT = 16  # key presses kept while a word is revealed and input is still locked
+
+# Web server mode
+WEB_PORT = 8550
+MAX_SESSIONS = 250
+ENGINE_POOL_SIZE = 64
 
 COLOR_MAP = {
     "Rot": "#ff9aa0",
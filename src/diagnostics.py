@@ -0,0 +1,207 @@
+"""Opt-in diagnostics: event-loop lag monitor and per-session profiling.
+
+``LoopMonitor`` runs a heartbeat task on the event loop and a watchdog
+thread beside it. The heartbeat records how late it wakes up (the loop lag).
+While the loop is blocked longer than a threshold, the watchdog samples the
+stack of the loop thread, so the warning logged once the loop resumes names
+the code that was running.
+
+``SessionProfiler`` collects a ``cProfile`` profile for one session. It is
+enabled only while that session's own handlers run, step by step, so
+sessions sharing a loop do not end up in each other's profiles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+import weakref
+from contextlib import suppress
+from typing import Any, Callable, Coroutine, Generator, Optional
+
+from config import LOOP_MONITOR_INTERVAL, SLOW_CALLBACK_THRESHOLD
+from metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP = 40  # functions listed in the text summary next to each .pstats file
+
+_profile_numbers = itertools.count(1)
+
+
+class LoopMonitor:
+    """Measures the lag of one event loop and reports callbacks that block it."""
+
+    def __init__(
+        self,
+        *,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold: float = SLOW_CALLBACK_THRESHOLD,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.metrics = metrics
+        self.stalls = 0
+        self._loop_thread: Optional[int] = None
+        self._beat = 0.0
+        self._sample: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from a coroutine on that loop."""
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = loop.create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        lag_histogram = self.metrics.histogram(EVENT_LOOP_LAG) if self.metrics is not None else None
+        while not self._stop.is_set():
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._beat = time.monotonic()
+            if lag_histogram is not None:
+                lag_histogram.record(lag)
+            if lag >= self.threshold:
+                self._report(lag)
+
+    def _watch(self) -> None:
+        # Polls a few times per threshold and takes one stack sample per stall.
+        period = max(0.005, self.threshold / 4)
+        sampled_beat: Optional[float] = None
+        while not self._stop.wait(period):
+            beat = self._beat
+            if beat == sampled_beat or time.monotonic() - beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread or 0)
+            if frame is not None:
+                self._sample = "".join(traceback.format_stack(frame))
+                sampled_beat = beat
+
+    def _report(self, lag: float) -> None:
+        self.stalls += 1
+        if self.metrics is not None:
+            self.metrics.counter(EVENT_LOOP_STALLS).inc()
+        sample, self._sample = self._sample, None
+        if sample:
+            logger.warning("Event loop blocked for %.0f ms, stack while blocked:\n%s", lag * 1000, sample)
+        else:
+            logger.warning("Event loop blocked for %.0f ms (too short for a stack sample)", lag * 1000)
+
+
+_monitors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopMonitor]" = weakref.WeakKeyDictionary()
+
+
+def monitor_loop(metrics: Optional[MetricsRegistry] = None, **options: Any) -> LoopMonitor:
+    """Return the monitor of the running loop, starting one on first use."""
+    loop = asyncio.get_running_loop()
+    monitor = _monitors.get(loop)
+    if monitor is None:
+        monitor = _monitors[loop] = LoopMonitor(metrics=metrics, **options)
+        monitor.start()
+    return monitor
+
+
+class SessionProfiler:
+    """``cProfile`` data of one session, written as ``.pstats`` plus a text summary."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.profile = cProfile.Profile()
+        self._written = False
+        atexit.register(self.write)
+
+    @classmethod
+    def for_session(cls, directory: str) -> "SessionProfiler":
+        """Create a profiler whose files are named after the current time, process and a counter."""
+        os.makedirs(directory, exist_ok=True)
+        name = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}-{next(_profile_numbers)}"
+        return cls(os.path.join(directory, name))
+
+    def call(self, handler: Callable[..., Any], *args: Any) -> Any:
+        """Call ``handler(*args)`` under the profiler; a returned coroutine stays profiled."""
+        profile = self.profile
+        profile.enable()
+        try:
+            result = handler(*args)
+        finally:
+            profile.disable()
+        if asyncio.iscoroutine(result):
+            return self._drive(result)
+        return result
+
+    def write(self) -> None:
+        """Write ``<path>.pstats`` and ``<path>.txt`` (cumulative time, top entries); runs once."""
+        if self._written:
+            return
+        self._written = True
+        with suppress(Exception):
+            atexit.unregister(self.write)
+        with suppress(OSError):
+            self.profile.dump_stats(self.path + ".pstats")
+            summary = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP)
+            with open(self.path + ".txt", "w", encoding="utf-8") as file:
+                file.write(summary.getvalue())
+
+    async def _drive(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        return await _Profiled(coroutine, self.profile)
+
+
+class _Profiled:
+    """Awaitable that runs each step of a coroutine with the profiler enabled."""
+
+    __slots__ = ("_coroutine", "_profile")
+
+    def __init__(self, coroutine: Coroutine[Any, Any, Any], profile: cProfile.Profile) -> None:
+        self._coroutine = coroutine
+        self._profile = profile
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        coroutine = self._coroutine
+        profile = self._profile
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            profile.enable()
+            try:
+                if error is None:
+                    yielded = coroutine.send(value)
+                else:
+                    yielded = coroutine.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                profile.disable()
+            # Whatever the coroutine waits on is handed to the task; other sessions run meanwhile.
+            try:
+                value, error = (yield yielded), None
+            except BaseException as exc:  # noqa: BLE001 - forwarded into the coroutine, e.g. cancellation
+                value, error = None, exc
@@ -0,0 +1,118 @@
+"""Online estimate of a player's skill and the difficulty derived from it.
+
+Every click and every lost game folds one sample into a few exponential
+moving averages, so updating the estimate costs the same no matter how long
+a player has been playing. The engine turns the estimate into the time
+budget of a round, the time the word stays on screen and the number of
+colors in play.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Optional
+
+from config import (
+    DISPLAY_TIME,
+    MAX_DISPLAY_TIME,
+    MIN_DISPLAY_TIME,
+    MIN_PALETTE_SIZE,
+    MIN_SECONDS_PER_WORD,
+    REACTION_SMOOTHING,
+    REACTION_TIME_CAP,
+    REFERENCE_REACTION_TIME,
+    SKILL_BOOK_LIMIT,
+    SPAN_PER_COLOR,
+    SPAN_SMOOTHING,
+    TIME_BUDGET_MARGIN,
+)
+
+
+class Difficulty(NamedTuple):
+    """Game parameters for one round."""
+
+    palette_size: int
+    seconds_per_word: float
+    display_time: float
+
+    def time_budget(self, round_number: int) -> float:
+        return round_number * self.seconds_per_word
+
+
+class SkillEstimate:
+    """Moving averages of one player's reaction time and memory span."""
+
+    __slots__ = ("reaction_time", "span", "clicks", "games")
+
+    def __init__(self) -> None:
+        self.reaction_time: float = REFERENCE_REACTION_TIME
+        self.span: float = 0.0
+        self.clicks: int = 0
+        self.games: int = 0
+
+    def observe_click(self, reaction_time: float) -> None:
+        """Fold the seconds between two inputs into the average reaction time."""
+        if reaction_time < 0:
+            return
+        self.clicks += 1
+        # Plain mean for the first samples, so a new player's estimate settles quickly.
+        alpha = max(REACTION_SMOOTHING, 1.0 / self.clicks)
+        self.reaction_time += alpha * (min(reaction_time, REACTION_TIME_CAP) - self.reaction_time)
+
+    def observe_error(self, round_number: int, position: int) -> None:
+        """Fold in a lost game: the wrong word was at ``position`` of round ``round_number``."""
+        if round_number <= 0:
+            return
+        self.games += 1
+        reached = round_number - 1 + position / round_number
+        alpha = max(SPAN_SMOOTHING, 1.0 / self.games)
+        self.span += alpha * (reached - self.span)
+
+    def difficulty(self, *, timer_factor: float, max_colors: int) -> Difficulty:
+        """Return the parameters for this player.
+
+        Without any samples this is the fixed difficulty of the original game:
+        ``timer_factor`` seconds per word, :data:`DISPLAY_TIME` on screen and
+        all colors.
+        """
+        if self.clicks:
+            seconds_per_word = min(timer_factor, max(MIN_SECONDS_PER_WORD, self.reaction_time * TIME_BUDGET_MARGIN))
+            scaled = DISPLAY_TIME * self.reaction_time / REFERENCE_REACTION_TIME
+            display_time = min(MAX_DISPLAY_TIME, max(MIN_DISPLAY_TIME, scaled))
+        else:
+            seconds_per_word = timer_factor
+            display_time = DISPLAY_TIME
+        palette_size = max_colors
+        if self.games:
+            palette_size = min(max_colors, MIN_PALETTE_SIZE + int(self.span / SPAN_PER_COLOR))
+        return Difficulty(max(1, palette_size), seconds_per_word, display_time)
+
+    def __repr__(self) -> str:
+        return (
+            f"SkillEstimate(reaction_time={self.reaction_time:0.3f}, span={self.span:0.2f}, "
+            f"clicks={self.clicks}, games={self.games})"
+        )
+
+
+class SkillBook:
+    """Skill estimates by player name (case-insensitive).
+
+    A server shares one book between all pooled engines, so a player keeps
+    their estimate across sessions. The oldest entries are dropped beyond
+    ``limit`` players.
+    """
+
+    def __init__(self, limit: int = SKILL_BOOK_LIMIT) -> None:
+        self.limit = max(1, limit)
+        self._players: dict[str, SkillEstimate] = {}
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def get(self, player: Optional[str]) -> SkillEstimate:
+        key = (player or "").casefold()
+        estimate = self._players.get(key)
+        if estimate is None:
+            if len(self._players) >= self.limit:
+                self._players.pop(next(iter(self._players)), None)
+            estimate = self._players.setdefault(key, SkillEstimate())
+        return estimate
@@ -0,0 +1,221 @@
+"""Compact binary event log per game session, plus a deterministic replay engine.
+
+Example::
+
+    python src/eventlog.py data/sessions/*.cml
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import itertools
+import os
+import statistics
+import struct
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator, Optional, Sequence
+
+from config import COLOR_MAP
+from game import ColorMemoryEngine, Progress
+
+MAGIC = b"CMLG"
+VERSION = 1
+
+# magic, version, seed, timer factor, wall-clock start, palette size, active word count
+_HEADER = struct.Struct("<4sBQddBB")
+# kind, round, a, b, seconds since session start
+_RECORD = struct.Struct("<BIBBd")
+
+ROUND = 1  # a = word id, b = text color id
+CLICK = 2  # a = clicked color id, b = progress code
+TIMEOUT = 3
+GAME_OVER = 4  # round = final score
+STOP = 5
+
+NO_COLOR = 0xFF
+PROGRESS_CODES = {Progress.PENDING: 0, Progress.COMPLETE: 1, Progress.WRONG: 2}
+
+_log_numbers = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: int
+    round: int
+    a: int
+    b: int
+    at: float
+
+
+@dataclass(frozen=True)
+class SessionHeader:
+    seed: int
+    timer_factor: float
+    started_at: float
+    words: tuple[str, ...]
+    active_words: tuple[str, ...]
+
+
+class EventLogWriter:
+    """Appends fixed-size binary records for one session."""
+
+    def __init__(self, path: str, engine: ColorMemoryEngine) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        # Never truncates an existing log, e.g. one of another session.
+        self._file: Optional[BinaryIO] = open(path, "xb")
+        self._started = time.perf_counter()
+        words = engine.palette.words
+        active = engine.active_words
+        self._file.write(
+            _HEADER.pack(MAGIC, VERSION, engine.seed, engine.timer_factor, time.time(), len(words), len(active))
+        )
+        for word in (*words, *active):
+            encoded = word.encode("utf-8")
+            self._file.write(bytes((len(encoded),)) + encoded)
+
+    @classmethod
+    def for_session(cls, directory: str, engine: ColorMemoryEngine) -> "EventLogWriter":
+        """Create a log named after the current time, the engine's seed, the process and a counter.
+
+        Daily-challenge sessions share their seed, so the seed alone does not make the name unique.
+        """
+        name = time.strftime("%Y%m%d-%H%M%S") + f"-{engine.seed:016x}-{os.getpid()}-{next(_log_numbers)}.cml"
+        return cls(os.path.join(directory, name), engine)
+
+    def log_round(self, round_number: int, word_id: int, color_id: int) -> None:
+        self._write(ROUND, round_number, word_id, color_id)
+
+    def log_click(self, round_number: int, color_id: int, progress: Progress) -> None:
+        self._write(CLICK, round_number, color_id if 0 <= color_id < NO_COLOR else NO_COLOR, PROGRESS_CODES[progress])
+
+    def log_timeout(self, round_number: int) -> None:
+        self._write(TIMEOUT, round_number)
+
+    def log_game_over(self, score: int) -> None:
+        self._write(GAME_OVER, score)
+
+    def log_stop(self, round_number: int) -> None:
+        self._write(STOP, round_number)
+
+    def close(self) -> None:
+        if self._file is not None:
+            with suppress(OSError):
+                self._file.close()
+            self._file = None
+
+    def _write(self, kind: int, round_number: int, a: int = NO_COLOR, b: int = 0) -> None:
+        if self._file is None:
+            return
+        with suppress(OSError):
+            self._file.write(_RECORD.pack(kind, round_number, a, b, time.perf_counter() - self._started))
+
+
+def read_log(path: str) -> tuple[SessionHeader, list[Event]]:
+    with open(path, "rb") as file:
+        raw = file.read()
+    magic, version, seed, timer_factor, started_at, word_count, active_count = _HEADER.unpack_from(raw, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a Color Memory event log.")
+    offset = _HEADER.size
+    words = []
+    for _ in range(word_count + active_count):
+        length = raw[offset]
+        words.append(raw[offset + 1 : offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+    # A truncated trailing record (e.g. after a crash) is ignored.
+    usable = offset + (len(raw) - offset) // _RECORD.size * _RECORD.size
+    events = [Event(*fields) for fields in _RECORD.iter_unpack(raw[offset:usable])]
+    header = SessionHeader(seed, timer_factor, started_at, tuple(words[:word_count]), tuple(words[word_count:]))
+    return header, events
+
+
+@dataclass
+class ReplayResult:
+    rounds: int = 0
+    clicks: int = 0
+    score: Optional[int] = None
+    mismatches: list[str] = field(default_factory=list)
+    reaction_times: list[float] = field(default_factory=list)
+
+    @property
+    def deterministic(self) -> bool:
+        return not self.mismatches
+
+
+def replay(path: str) -> ReplayResult:
+    """Re-run a logged session against a fresh engine without any delays."""
+    header, events = read_log(path)
+    # Only the word order matters for ids and RNG draws; unknown colors get a placeholder.
+    engine = ColorMemoryEngine(
+        color_map={word: COLOR_MAP.get(word, "#808080") for word in header.words},
+        leaderboard_path=None,
+        allowed_words=header.active_words,
+        timer_factor=header.timer_factor,
+        seed=header.seed,
+    )
+    words = engine.palette.words
+    result = ReplayResult()
+    last_at: Optional[float] = None
+
+    for event in events:
+        if event.kind == ROUND:
+            round_data = engine.prepare_next_round()
+            result.rounds += 1
+            if (round_data["word_id"], round_data["color_id"]) != (event.a, event.b):
+                result.mismatches.append(f"Runde {event.round}: Anzeige weicht ab")
+            last_at = event.at
+        elif event.kind == CLICK:
+            word = words[event.a] if event.a < len(words) else ""
+            progress = engine.submit(word)
+            result.clicks += 1
+            if PROGRESS_CODES[progress] != event.b:
+                result.mismatches.append(f"Runde {event.round}: Klick {word or '?'} bewertet als {progress.value}")
+            if last_at is not None:
+                result.reaction_times.append(event.at - last_at)
+            last_at = event.at
+        elif event.kind == GAME_OVER:
+            score, _, _ = engine.register_failure()
+            result.score = score
+            if score != event.round:
+                result.mismatches.append(f"Score {score} statt {event.round}")
+    return result
+
+
+def iter_log_paths(patterns: Sequence[str]) -> Iterator[str]:
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.cml")
+        yield from sorted(glob.glob(pattern))
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Spielt aufgezeichnete Sitzungen erneut ab.")
+    parser.add_argument("paths", nargs="+", help="Logdateien, Verzeichnisse oder Glob-Muster")
+    args = parser.parse_args(argv)
+
+    sessions = 0
+    reaction_times: list[float] = []
+    started = time.perf_counter()
+    for path in iter_log_paths(args.paths):
+        result = replay(path)
+        sessions += 1
+        reaction_times.extend(result.reaction_times)
+        status = "ok" if result.deterministic else "ABWEICHUNG: " + "; ".join(result.mismatches[:3])
+        print(f"{os.path.basename(path)}: {result.rounds} Runden, {result.clicks} Klicks, Score {result.score} – {status}")
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{sessions} Sitzung(en) in {elapsed:0.3f} s abgespielt.")
+    if reaction_times:
+        quantiles = statistics.quantiles(reaction_times, n=10) if len(reaction_times) > 1 else reaction_times * 9
+        print(
+            f"Reaktionszeit: Ø {statistics.fmean(reaction_times):0.3f} s, "
+            f"Median {statistics.median(reaction_times):0.3f} s, p90 {quantiles[8]:0.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Game flow as a table-driven state machine, independent of any UI toolkit.
+
+The machine owns the phase of a game and drives a :class:`ColorMemoryEngine`.
+Every transition produces a new immutable :class:`FlowSnapshot`; front ends
+(Flet UI, simulator, server) render by comparing consecutive snapshots and
+schedule the timed triggers (reveal, hide, next round) themselves.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, NamedTuple, Optional
+
+from game import ColorMemoryEngine, Progress
+
+
+class Phase(Enum):
+    IDLE = "idle"  # no game running
+    READY = "ready"  # game started, first round pending
+    SHOWING = "showing"  # word on screen, input still locked
+    INPUT = "input"  # player clicks tiles
+    SUCCESS = "success"  # round solved, next round pending
+    FAIL = "fail"  # wrong click or timeout, game over
+
+
+class Trigger(Enum):
+    START = "start"
+    NEXT = "next"
+    REVEAL = "reveal"
+    HIDE = "hide"
+    CORRECT = "correct"
+    COMPLETE = "complete"
+    WRONG = "wrong"
+    TIMEOUT = "timeout"
+    STOP = "stop"
+
+
+TRANSITIONS: dict[tuple[Phase, Trigger], Phase] = {
+    (Phase.IDLE, Trigger.START): Phase.READY,
+    (Phase.FAIL, Trigger.START): Phase.READY,
+    (Phase.READY, Trigger.NEXT): Phase.SHOWING,
+    (Phase.SUCCESS, Trigger.NEXT): Phase.SHOWING,
+    (Phase.SHOWING, Trigger.REVEAL): Phase.INPUT,
+    (Phase.INPUT, Trigger.HIDE): Phase.INPUT,
+    (Phase.INPUT, Trigger.CORRECT): Phase.INPUT,
+    (Phase.INPUT, Trigger.COMPLETE): Phase.SUCCESS,
+    (Phase.INPUT, Trigger.WRONG): Phase.FAIL,
+    (Phase.SHOWING, Trigger.TIMEOUT): Phase.FAIL,
+    (Phase.INPUT, Trigger.TIMEOUT): Phase.FAIL,
+    (Phase.READY, Trigger.STOP): Phase.IDLE,
+    (Phase.SHOWING, Trigger.STOP): Phase.IDLE,
+    (Phase.INPUT, Trigger.STOP): Phase.IDLE,
+    (Phase.SUCCESS, Trigger.STOP): Phase.IDLE,
+    (Phase.FAIL, Trigger.STOP): Phase.IDLE,
+}
+
+CLICK_TRIGGERS = {
+    Progress.PENDING: Trigger.CORRECT,
+    Progress.COMPLETE: Trigger.COMPLETE,
+    Progress.WRONG: Trigger.WRONG,
+}
+
+ACTIVE_PHASES = frozenset((Phase.READY, Phase.SHOWING, Phase.INPUT, Phase.SUCCESS))
+
+
+class FlowSnapshot(NamedTuple):
+    """Everything a front end needs to render the current state of a game."""
+
+    phase: Phase = Phase.IDLE
+    trigger: Optional[Trigger] = None  # how this phase was entered
+    round: int = 0
+    word_id: int = -1
+    color_id: int = -1
+    word: str = ""
+    text_color: str = ""
+    background_color: str = ""
+    word_visible: bool = False
+    selection: tuple[str, ...] = ()
+    time_budget: float = 0.0
+    display_time: float = 0.0  # seconds the word stays visible after the reveal
+    colors: tuple[str, ...] = ()  # words with a tile in this game
+    highscore: int = 0
+    best_player: str = ""
+    score: int = 0
+    new_highscore: bool = False
+    solution: str = ""
+
+    @property
+    def active(self) -> bool:
+        return self.phase in ACTIVE_PHASES
+
+    @property
+    def accepts_input(self) -> bool:
+        return self.phase is Phase.INPUT
+
+
+class GameFlow:
+    """Drives an engine through the phases in :data:`TRANSITIONS`.
+
+    Triggers that are not valid in the current phase are ignored and return
+    ``False`` (or ``None`` for clicks), which replaces the flag checks that
+    were previously spread over the UI handlers. Transitions only update
+    plain fields; the immutable snapshot is built when it is read, so
+    headless drivers do not pay for snapshots they never look at.
+    """
+
+    def __init__(self, engine: ColorMemoryEngine, *, player_name: Optional[str] = None) -> None:
+        self.engine = engine
+        self.player_name = player_name
+        self._fields: dict[str, Any] = {}
+        self._selection: list[str] = []
+        self._snapshot: Optional[FlowSnapshot] = None
+        self._reset_fields(Phase.IDLE, None)
+
+    @property
+    def snapshot(self) -> FlowSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = FlowSnapshot(**self._fields, selection=tuple(self._selection))
+        return snapshot
+
+    @property
+    def phase(self) -> Phase:
+        return self._fields["phase"]
+
+    def can(self, trigger: Trigger) -> bool:
+        return (self._fields["phase"], trigger) in TRANSITIONS
+
+    def start(self, seed: Optional[int] = None, *, reseed: bool = True, adapt_palette: bool = True) -> bool:
+        """Begin a new game.
+
+        ``seed`` fixes the round sequence (random if omitted); with
+        ``reseed=False`` the engine keeps drawing from its current stream.
+        ``adapt_palette=False`` plays with all colors regardless of skill.
+        """
+        if not self.can(Trigger.START):
+            return False
+        self.engine.reset()
+        self.engine.adapt(self.player_name, palette=adapt_palette)
+        if reseed:
+            self.engine.reseed(seed)
+        self._reset_fields(Phase.READY, Trigger.START)
+        return True
+
+    def next_round(self) -> bool:
+        if not self.can(Trigger.NEXT):
+            return False
+        round_data = self.engine.prepare_next_round()
+        self._selection.clear()
+        return self._fire(
+            Trigger.NEXT,
+            round=self.engine.round,
+            word_id=round_data["word_id"],
+            color_id=round_data["color_id"],
+            word=round_data["word"],
+            text_color=round_data["text_color"],
+            background_color=round_data["background_color"],
+            word_visible=True,
+            time_budget=round_data["time_budget"],
+            display_time=round_data["display_time"],
+        )
+
+    def reveal(self) -> bool:
+        """Unlock input once the word has been on screen briefly."""
+        return self._fire(Trigger.REVEAL)
+
+    def hide(self) -> bool:
+        """Replace the word with a placeholder; input stays open."""
+        if self._fields["phase"] is not Phase.INPUT or not self._fields["word_visible"]:
+            return False
+        return self._fire(Trigger.HIDE, word_visible=False)
+
+    def click(self, word: str, reaction_time: Optional[float] = None) -> Optional[Progress]:
+        """Submit one tile; returns ``None`` if input is currently locked."""
+        if self._fields["phase"] is not Phase.INPUT:
+            return None
+        progress = self.engine.submit(word, reaction_time)
+        trigger = CLICK_TRIGGERS[progress]
+        self._selection.append(word)
+        if trigger is Trigger.COMPLETE:
+            self.engine.register_success(self.player_name)
+            self._fire(trigger, **self._best())
+        elif trigger is Trigger.WRONG:
+            self._fail(trigger)
+        else:
+            self._fire(trigger)
+        return progress
+
+    def timeout(self) -> bool:
+        if not self.can(Trigger.TIMEOUT):
+            return False
+        self._fail(Trigger.TIMEOUT)
+        return True
+
+    def stop(self) -> bool:
+        """End the game (or leave the game-over screen) and reset progress."""
+        if not self.can(Trigger.STOP):
+            return False
+        self.engine.reset()
+        self._reset_fields(Phase.IDLE, Trigger.STOP)
+        return True
+
+    def reset_highscore(self) -> None:
+        self.engine.reset_highscore()
+        self._fields.update(self._best())
+        self._snapshot = None
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _fire(self, trigger: Trigger, **changes: Any) -> bool:
+        fields = self._fields
+        target = TRANSITIONS.get((fields["phase"], trigger))
+        if target is None:
+            return False
+        fields["phase"] = target
+        fields["trigger"] = trigger
+        if changes:
+            fields.update(changes)
+        self._snapshot = None
+        return True
+
+    def _fail(self, trigger: Trigger) -> None:
+        score, new_highscore, solution = self.engine.register_failure(self.player_name)
+        self._fire(trigger, score=score, new_highscore=new_highscore, solution=solution, **self._best())
+
+    def _reset_fields(self, phase: Phase, trigger: Optional[Trigger]) -> None:
+        self._selection.clear()
+        colors = tuple(self.engine.active_words)
+        fields = FlowSnapshot(phase=phase, trigger=trigger, colors=colors, **self._best())._asdict()
+        del fields["selection"]
+        self._fields = fields
+        self._snapshot = None
+
+    def _best(self) -> dict[str, Any]:
+        return {"highscore": self.engine.highscore, "best_player": self.engine.best_player}
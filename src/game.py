@@ -1,134 +1,284 @@
 from __future__ import annotations
 
-import json
-import os
 import random
-from contextlib import suppress
-from typing import Sequence
+import uuid
+from array import array
+from enum import Enum
+from typing import Iterator, Sequence, overload
 
-from config import COLOR_MAP, HIGHSCORE_PATH
-from utils import darker_color
+from config import (
+    ADAPTIVE_DIFFICULTY,
+    COLOR_MAP,
+    DEFAULT_PLAYER_NAME,
+    HIGHSCORE_PATH,
+    LEADERBOARD_PATH,
+    SOLUTION_WINDOW,
+)
+from difficulty import Difficulty, SkillBook, SkillEstimate
+from leaderboard import Leaderboard
+from palette import Palette
+from sequence import DEFAULT_LOOKAHEAD, RoundStream
+
+
+class Progress(Enum):
+    """Result of submitting a single word via ``ColorMemoryEngine.submit``."""
+
+    PENDING = "pending"
+    COMPLETE = "complete"
+    WRONG = "wrong"
+
+
+class SequenceView(Sequence[str]):
+    """Read-only view that decodes stored color ids into words on access."""
+
+    __slots__ = ("_ids", "_words")
+
+    def __init__(self, ids: array, words: tuple[str, ...]) -> None:
+        self._ids = ids
+        self._words = words
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self._words[color_id] for color_id in self._ids[index]]
+        return self._words[self._ids[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        words = self._words
+        return (words[color_id] for color_id in self._ids)
+
+    def __repr__(self) -> str:
+        return f"SequenceView(len={len(self)})"
+
+
+# Stands in for the player's estimate when adaptive difficulty is off.
+_NO_SKILL = SkillEstimate()
 
 
 class ColorMemoryEngine:
-    """Encapsulates sequence handling and highscore persistence."""
+    """Encapsulates sequence handling and leaderboard persistence."""
 
     def __init__(
         self,
         *,
         color_map: dict[str, str] | None = None,
-        highscore_path: str = HIGHSCORE_PATH,
+        highscore_path: str | None = HIGHSCORE_PATH,
+        leaderboard_path: str | None = LEADERBOARD_PATH,
+        leaderboard: Leaderboard | None = None,
         timer_factor: float = 3.0,
         allowed_words: Sequence[str] | None = None,
+        seed: int | None = None,
+        rng_backend: str = "random",
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        adaptive: bool = ADAPTIVE_DIFFICULTY,
+        skills: SkillBook | None = None,
     ) -> None:
         self.color_map = color_map or COLOR_MAP
         self.highscore_path = highscore_path
         self.timer_factor = timer_factor
         if allowed_words is None:
             allowed_words = list(self.color_map.keys())
-        self.active_words = [word for word in allowed_words if word in self.color_map]
-        self.sequence: list[str] = []
+        self.allowed_words = [word for word in allowed_words if word in self.color_map]
+        # Words of the current game: a prefix of ``allowed_words`` sized by the difficulty.
+        self.active_words = list(self.allowed_words)
         self.round: int = 0
+        self.cursor: int = 0
+
+        # Words are validated and stored as palette indices.
+        self.palette = Palette(self.color_map, self.active_words)
+        if len(self.palette) > 256:
+            raise ValueError("ColorMemoryEngine supports at most 256 colors.")
+        self._palettes: dict[int, Palette] = {len(self.active_words): self.palette}
+        self._word_ids = self.palette.ids
+        # One byte per round keeps very long runs compact.
+        self._sequence_ids = array("B")
+        self.sequence = SequenceView(self._sequence_ids, self.palette.words)
+
+        # Rounds come from a per-engine seeded stream that pre-generates them in bulk.
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed: int = seed
+        self.stream = RoundStream(self.palette, seed=seed, lookahead=lookahead, backend=rng_backend)
+
+        # Skill estimates are per player; the book may be shared by several engines.
+        # Unnamed players keep theirs on the engine, i.e. for one session only.
+        self.adaptive = adaptive
+        self.skills = skills if skills is not None else SkillBook()
+        self.guest_skill = SkillEstimate()
+        self.skill: SkillEstimate = self.guest_skill
 
-        self._ensure_highscore_file()
-        highscore, player = self._load_highscore()
-        self.highscore: int = highscore
-        self.best_player: str = player or "Unbekannt"
+        # A shared leaderboard is owned by the caller; otherwise the engine opens its own.
+        # ``highscore_path`` is only read once to migrate the legacy single-score file.
+        self._owns_leaderboard = leaderboard is None
+        if leaderboard is None:
+            leaderboard = Leaderboard.open(leaderboard_path, legacy_path=highscore_path)
+        self.leaderboard = leaderboard
+        self._run_id: str | None = None
+
+    @property
+    def highscore(self) -> int:
+        return self.leaderboard.highscore
+
+    @property
+    def best_player(self) -> str:
+        return self.leaderboard.best_player
 
     # ------------------------------------------------------------------#
     # Game lifecycle
     # ------------------------------------------------------------------#
 
+    def reseed(self, seed: int | None = None) -> int:
+        """Restart the round RNG from ``seed`` (a fresh random seed if omitted)."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.stream.reset(seed)
+        return seed
+
+    def adapt(self, player_name: str | None = None, *, palette: bool = True) -> Difficulty:
+        """Select ``player_name``'s skill estimate and size the palette for the next game.
+
+        The palette stays fixed for a whole game, so every word of the
+        sequence keeps a tile; ``palette=False`` keeps all allowed colors
+        (e.g. for the daily challenge, where everyone plays the same sequence).
+        Without a name (or with the default one) the session's own estimate is used.
+        """
+        if not player_name or player_name.casefold() == DEFAULT_PLAYER_NAME.casefold():
+            self.skill = self.guest_skill
+        else:
+            self.skill = self.skills.get(player_name)
+        difficulty = self.difficulty()
+        size = difficulty.palette_size if palette else len(self.allowed_words)
+        if size != len(self.active_words):
+            self._use_palette(size)
+        return difficulty
+
+    def difficulty(self) -> Difficulty:
+        """Return the current parameters (the fixed defaults if not adaptive)."""
+        skill = self.skill if self.adaptive else _NO_SKILL
+        return skill.difficulty(timer_factor=self.timer_factor, max_colors=len(self.allowed_words))
+
     def reset(self) -> None:
-        self.sequence.clear()
+        del self._sequence_ids[:]
         self.round = 0
+        self.cursor = 0
+        self._run_id = None
+
+    def new_session(self) -> None:
+        """Reset the game and forget the unnamed player's estimate, e.g. when a pooled engine is reused."""
+        self.reset()
+        self.guest_skill = SkillEstimate()
+        self.skill = self.guest_skill
 
-    def prepare_next_round(self) -> dict[str, str | float]:
+    def prepare_next_round(self) -> dict[str, str | int | float]:
         """Advance the internal state and return display attributes."""
         self.round += 1
-        pool = self.active_words or list(self.color_map.keys())
-        word = random.choice(pool)
-        self.sequence.append(word)
-
-        available_colors = [
-            code for name, code in self.color_map.items() if name != word and name in pool
-        ]
-        if not available_colors:
-            available_colors = list(self.color_map.values())
-        text_color = random.choice(available_colors)
-        background_color = darker_color(text_color)
-        time_budget = float(self.round * self.timer_factor)
+        spec = self.stream.next()
+        self._sequence_ids.append(spec.word_id)
+        self.cursor = 0
+        difficulty = self.difficulty()
 
         return {
-            "word": word,
-            "text_color": text_color,
-            "background_color": background_color,
-            "time_budget": time_budget,
+            "word_id": spec.word_id,
+            "color_id": spec.color_id,
+            "word": spec.word,
+            "text_color": spec.text_color,
+            "background_color": spec.background_color,
+            "time_budget": difficulty.time_budget(self.round),
+            "display_time": difficulty.display_time,
         }
 
+    def submit(self, word: str, reaction_time: float | None = None) -> Progress:
+        """Check the next word of the player's input against the sequence.
+
+        ``reaction_time`` (seconds since the previous input) feeds the skill estimate.
+        """
+        if reaction_time is not None:
+            self.skill.observe_click(reaction_time)
+        cursor = self.cursor
+        if cursor >= len(self._sequence_ids) or self.color_id(word) != self._sequence_ids[cursor]:
+            return Progress.WRONG
+        self.cursor = cursor + 1
+        return Progress.COMPLETE if self.cursor == len(self._sequence_ids) else Progress.PENDING
+
     def evaluate_guess(self, guessed_words: Sequence[str]) -> bool:
-        expected = [word.casefold() for word in self.sequence]
-        guess_norm = [word.casefold() for word in guessed_words]
-        return guess_norm == expected
+        if len(guessed_words) != len(self._sequence_ids):
+            return False
+        color_id = self.color_id
+        return all(color_id(word) == expected for word, expected in zip(guessed_words, self._sequence_ids))
+
+    def color_id(self, word: str) -> int:
+        """Return the interned id of ``word`` (case-insensitive), or -1 if unknown."""
+        color_id = self._word_ids.get(word)
+        if color_id is None:
+            color_id = self._word_ids.get(word.casefold(), -1)
+        return color_id
 
     def register_failure(self, player_name: str | None = None) -> tuple[int, bool, str]:
         score = max(0, self.round - 1)
-        new_highscore = score > self.highscore
-        if new_highscore:
-            self.highscore = score
-            if player_name:
-                self.best_player = player_name
-            self._save_highscore(score)
-        solution = " → ".join(self.sequence)
-        return score, new_highscore, solution
+        self.skill.observe_error(self.round, self.cursor)
+        new_highscore = self.leaderboard.offer(score, player_name)
+        self._record_run(score, player_name)
+        return score, new_highscore, self.render_solution()
+
+    def render_solution(self, limit: int | None = SOLUTION_WINDOW) -> str:
+        """Return the sequence as text, keeping only the last ``limit`` words."""
+        total = len(self._sequence_ids)
+        if limit is None or total <= limit:
+            return " → ".join(self.sequence)
+        start = total - max(0, limit)
+        shown = " → ".join(self.sequence[start:])
+        return f"… (+{start}) → {shown}" if shown else f"… (+{start})"
 
     def register_success(self, player_name: str | None = None) -> None:
-        if self.round > self.highscore:
-            self.highscore = self.round
-            if player_name:
-                self.best_player = player_name
-            self._save_highscore(self.highscore)
+        if self.leaderboard.offer(self.round, player_name):
+            self._record_run(self.round, player_name)
 
     # ------------------------------------------------------------------#
-    # Highscore persistence
+    # Leaderboard persistence
     # ------------------------------------------------------------------#
 
+    def flush(self) -> None:
+        """Block until pending leaderboard writes reached the database."""
+        self.leaderboard.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and close the leaderboard if this engine opened it."""
+        if self._owns_leaderboard:
+            self.leaderboard.close()
+        else:
+            self.leaderboard.flush()
+
+    def top_scores(self, limit: int = 10) -> list[tuple[str, int]]:
+        """Return up to ``limit`` ``(player, score)`` rows, best first."""
+        return self.leaderboard.top(limit)
+
+    def player_history(self, player: str, limit: int = 20) -> list[tuple[int, float]]:
+        """Return up to ``limit`` ``(score, timestamp)`` rows of ``player``."""
+        return self.leaderboard.history(player, limit)
+
     def reset_highscore(self) -> None:
-        self.highscore = 0
-        self.best_player = "Unbekannt"
-        self._save_highscore(self.highscore)
-
-    def _ensure_highscore_file(self) -> None:
-        if not os.path.exists(self.highscore_path):
-            with suppress(OSError):
-                with open(self.highscore_path, "w", encoding="utf-8") as file:
-                    file.write("0")
-
-    def _load_highscore(self) -> tuple[int, str]:
-        try:
-            with open(self.highscore_path, "r", encoding="utf-8") as file:
-                raw = file.read().strip()
-                if not raw:
-                    return 0, "Unbekannt"
-                try:
-                    return max(0, int(raw)), "Unbekannt"
-                except ValueError:
-                    with suppress(Exception):
-                        data = json.loads(raw)
-                        if isinstance(data, dict):
-                            score = max(0, int(data.get("score", 0)))
-                            player = str(data.get("player", "Unbekannt"))
-                            return score, player
-                        if isinstance(data, int):
-                            return max(0, data), "Unbekannt"
-                    return 0, "Unbekannt"
-        except OSError:
-            return 0, "Unbekannt"
-
-    def _save_highscore(self, score: int) -> None:
-        payload = {"score": int(score), "player": self.best_player}
-        try:
-            with open(self.highscore_path, "w", encoding="utf-8") as file:
-                file.write(json.dumps(payload))
-        except OSError:
-            pass
+        self.leaderboard.reset()
+
+    def _use_palette(self, size: int) -> None:
+        palette = self._palettes.get(size)
+        if palette is None:
+            palette = self._palettes[size] = Palette(self.color_map, self.allowed_words[:size])
+        self.palette = palette
+        self.active_words = self.allowed_words[:size]
+        self.stream.use_palette(palette)
+
+    def _record_run(self, score: int, player_name: str | None) -> None:
+        if score <= 0:
+            return
+        if self._run_id is None:
+            self._run_id = uuid.uuid4().hex
+        self.leaderboard.record(self._run_id, player_name or "Unbekannt", score)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import suppress
+
+from persistence import WriteBehindWriter
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    run_id    TEXT PRIMARY KEY,
+    player    TEXT NOT NULL,
+    score     INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC, played_at);
+CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (player, score DESC);
+"""
+
+# Constant statements are compiled once and reused from sqlite3's statement cache.
+_UPSERT_RUN = """
+INSERT INTO scores (run_id, player, score, played_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (run_id) DO UPDATE SET
+    player = excluded.player,
+    score = MAX(scores.score, excluded.score),
+    played_at = excluded.played_at
+"""
+_SELECT_TOP = "SELECT player, score FROM scores ORDER BY score DESC, played_at LIMIT ?"
+_SELECT_PLAYER = (
+    "SELECT score, played_at FROM scores WHERE player = ? ORDER BY score DESC, played_at LIMIT ?"
+)
+_DELETE_ALL = "DELETE FROM scores"
+
+
+def read_legacy_highscore(path: str) -> tuple[int, str]:
+    """Parse the legacy ``highscore.txt`` (plain int or ``{"score", "player"}`` JSON)."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            raw = file.read().strip()
+    except OSError:
+        return 0, "Unbekannt"
+    if not raw:
+        return 0, "Unbekannt"
+    try:
+        return max(0, int(raw)), "Unbekannt"
+    except ValueError:
+        pass
+    with suppress(Exception):
+        data = json.loads(raw)
+        if isinstance(data, dict):
+            score = max(0, int(data.get("score", 0)))
+            player = str(data.get("player", "Unbekannt"))
+            return score, player
+        if isinstance(data, int):
+            return max(0, data), "Unbekannt"
+    return 0, "Unbekannt"
+
+
+class LeaderboardStore:
+    """SQLite-backed score history with indexed top-N queries."""
+
+    def __init__(self, path: str, *, legacy_path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+        if legacy_path is not None:
+            self._migrate_legacy(legacy_path)
+
+    # ------------------------------------------------------------------#
+    # Queries
+    # ------------------------------------------------------------------#
+
+    def top(self, limit: int = 10) -> list[tuple[str, int]]:
+        with self._lock:
+            return [(str(player), int(score)) for player, score in self._connection.execute(_SELECT_TOP, (limit,))]
+
+    def best(self) -> tuple[int, str] | None:
+        rows = self.top(1)
+        if not rows:
+            return None
+        player, score = rows[0]
+        return score, player
+
+    def history(self, player: str, limit: int = 20) -> list[tuple[int, float]]:
+        with self._lock:
+            return [
+                (int(score), float(played_at))
+                for score, played_at in self._connection.execute(_SELECT_PLAYER, (player, limit))
+            ]
+
+    # ------------------------------------------------------------------#
+    # Updates
+    # ------------------------------------------------------------------#
+
+    def record(self, run_id: str, player: str, score: int) -> None:
+        """Insert a run or raise its score if the run already exists."""
+        with self._lock:
+            self._connection.execute(_UPSERT_RUN, (run_id, player, int(score), time.time()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute(_DELETE_ALL)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _migrate_legacy(self, legacy_path: str) -> None:
+        with self._lock:
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version >= SCHEMA_VERSION:
+                return
+            score, player = read_legacy_highscore(legacy_path)
+            self._connection.execute("BEGIN")
+            try:
+                if score > 0:
+                    self._connection.execute(_UPSERT_RUN, ("legacy", player, score, time.time()))
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self._connection.execute("COMMIT")
+            except sqlite3.Error:
+                self._connection.execute("ROLLBACK")
+                raise
+
+
+class Leaderboard:
+    """Cached best score plus write-behind access to a ``LeaderboardStore``.
+
+    A single instance can be shared by all engines of a process so that every
+    session sees the same record without re-reading the database.
+    """
+
+    def __init__(self, store: LeaderboardStore | None = None) -> None:
+        self._store = store
+        self._lock = threading.Lock()
+        self._writer: WriteBehindWriter | None = None
+        best: tuple[int, str] | None = None
+        if store is not None:
+            self._writer = WriteBehindWriter(name="leaderboard-writer", errors=(OSError, sqlite3.Error))
+            with suppress(sqlite3.Error):
+                best = store.best()
+        self.highscore, self.best_player = best or (0, "Unbekannt")
+
+    @classmethod
+    def open(cls, path: str | None, *, legacy_path: str | None = None) -> "Leaderboard":
+        """Open the store at ``path``; falls back to an in-memory board on errors or ``None``."""
+        if path is None:
+            return cls()
+        try:
+            store = LeaderboardStore(path, legacy_path=legacy_path)
+        except sqlite3.Error:
+            return cls()
+        return cls(store)
+
+    def offer(self, score: int, player_name: str | None) -> bool:
+        """Raise the cached record to ``score``; returns True if it was beaten."""
+        with self._lock:
+            if score <= self.highscore:
+                return False
+            self.highscore = score
+            if player_name:
+                self.best_player = player_name
+            return True
+
+    def record(self, run_id: str, player: str, score: int) -> None:
+        """Queue ``score`` of run ``run_id`` for the write-behind thread."""
+        store = self._store
+        if store is None or self._writer is None:
+            return
+        self._writer.submit(run_id, lambda: store.record(run_id, player, score))
+
+    def top(self, limit: int = 10) -> list[tuple[str, int]]:
+        """Best runs after pending writes were stored; this blocks, so call it off the event loop."""
+        if self._store is None:
+            return [(self.best_player, self.highscore)] if self.highscore > 0 else []
+        self.flush()
+        try:
+            return self._store.top(limit)
+        except sqlite3.Error:
+            return []
+
+    def history(self, player: str, limit: int = 20) -> list[tuple[int, float]]:
+        """Runs of ``player`` after pending writes were stored; blocks like ``top``."""
+        if self._store is None:
+            return []
+        self.flush()
+        try:
+            return self._store.history(player, limit)
+        except sqlite3.Error:
+            return []
+
+    def reset(self) -> None:
+        with self._lock:
+            self.highscore = 0
+            self.best_player = "Unbekannt"
+        if self._store is not None and self._writer is not None:
+            self._writer.submit("reset", self._store.clear)
+
+    def flush(self) -> None:
+        """Block until pending writes reached the database."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and release the database connection."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import Iterator, Optional
+
+from persistence import atomic_write_text
+
+# Each power-of-two range is split into 2**SUB_BUCKET_BITS buckets (~3 % relative error).
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+SNAPSHOT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+REACTION_TIME = "reaction_time_seconds"
+CLICK_FEEDBACK = "click_feedback_seconds"
+PAGE_UPDATE = "page_update_seconds"
+ROUND_PREPARE = "round_prepare_seconds"
+STARTUP = "startup_seconds"
+FEEDBACK_SOUND_DELAY = "feedback_sound_delay_seconds"
+FEEDBACK_QUEUE_DEPTH = "feedback_sound_queue_depth"
+FEEDBACK_DROPPED = "feedback_sounds_dropped_total"
+FEEDBACK_COALESCED = "feedback_sounds_coalesced_total"
+EVENT_LOOP_LAG = "event_loop_lag_seconds"
+EVENT_LOOP_STALLS = "event_loop_stalls_total"
+
+DESCRIPTIONS = {
+    REACTION_TIME: "Time the player needed for a click, since tiles were enabled or the previous click.",
+    CLICK_FEEDBACK: "Time from receiving a tile click until its feedback was pushed to the page.",
+    PAGE_UPDATE: "Duration of a single page.update() call.",
+    ROUND_PREPARE: "Time spent preparing the next round in the engine.",
+    STARTUP: "Time to build the start menu and hand it to the page.",
+    FEEDBACK_SOUND_DELAY: "Time a feedback sound waited in the queue before a worker started it.",
+    FEEDBACK_QUEUE_DEPTH: "Feedback sounds waiting for a worker.",
+    FEEDBACK_DROPPED: "Feedback sounds dropped because the queue was full (oldest first).",
+    FEEDBACK_COALESCED: "Feedback sounds skipped because the same sound was already pending.",
+    EVENT_LOOP_LAG: "How late the diagnostics heartbeat woke up, i.e. how long the event loop was busy.",
+    EVENT_LOOP_STALLS: "Heartbeats delayed beyond the slow-callback threshold.",
+}
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations with O(1) recording.
+
+    Values are stored in microseconds; buckets have a bounded relative width,
+    so percentiles stay accurate from microseconds up to minutes.
+    """
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._counts: dict[int, int] = {}
+
+    def record(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        index = _bucket_index(int(seconds * 1_000_000))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, quantile: float) -> float:
+        """Return the value (seconds) below which ``quantile`` of all samples fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(quantile * self.count))
+        seen = 0
+        counts = dict(self._counts)
+        for index in sorted(counts):
+            seen += counts[index]
+            if seen >= rank:
+                value = _bucket_midpoint(index) / 1_000_000
+                return min(max(value, self.min or 0.0), self.max or value)
+        return self.max or 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        data = {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min or 0.0,
+            "max": self.max or 0.0,
+        }
+        for quantile in SNAPSHOT_QUANTILES:
+            data[f"p{quantile * 100:g}"] = self.percentile(quantile)
+        return data
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._counts = {}
+
+
+class Counter:
+    """Monotonically increasing event count."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def reset(self) -> None:
+        self.value = 0
+
+
+class Gauge:
+    """Current level of something (e.g. a queue) plus the highest level seen."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self.value = 0.0
+        self.max = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+    def reset(self) -> None:
+        self.value = 0.0
+        self.max = 0.0
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return value
+    magnitude = value.bit_length() - 1
+    shift = magnitude - SUB_BUCKET_BITS
+    return _SUB_BUCKETS + shift * _SUB_BUCKETS + ((value >> shift) - _SUB_BUCKETS)
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index < _SUB_BUCKETS:
+        return float(index)
+    shift, sub_bucket = divmod(index - _SUB_BUCKETS, _SUB_BUCKETS)
+    lower = (_SUB_BUCKETS + sub_bucket) << shift
+    return lower + ((1 << shift) - 1) / 2
+
+
+class MetricsRegistry:
+    """Named latency histograms, counters and gauges with JSON and Prometheus text export."""
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.counters: dict[str, Counter] = {}
+        self.gauges: dict[str, Gauge] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, description: str = "") -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(
+                    name, LatencyHistogram(name, description or DESCRIPTIONS.get(name, ""))
+                )
+        return histogram
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, Counter(name, description or DESCRIPTIONS.get(name, "")))
+        return counter
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        gauge = self.gauges.get(name)
+        if gauge is None:
+            with self._lock:
+                gauge = self.gauges.setdefault(name, Gauge(name, description or DESCRIPTIONS.get(name, "")))
+        return gauge
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.histogram(name).record(seconds)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        return {name: histogram.snapshot() for name, histogram in list(self.histograms.items())}
+
+    def to_json(self) -> str:
+        payload = {
+            "generated_at": time.time(),
+            "histograms": self.snapshot(),
+            "counters": {name: counter.value for name, counter in list(self.counters.items())},
+            "gauges": {name: {"value": gauge.value, "max": gauge.max} for name, gauge in list(self.gauges.items())},
+        }
+        return json.dumps(payload, indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "colormemory_") -> str:
+        lines: list[str] = []
+        for name, histogram in sorted(list(self.histograms.items())):
+            metric = prefix + name
+            if histogram.description:
+                lines.append(f"# HELP {metric} {histogram.description}")
+            lines.append(f"# TYPE {metric} summary")
+            for quantile in SNAPSHOT_QUANTILES:
+                lines.append(f'{metric}{{quantile="{quantile:g}"}} {histogram.percentile(quantile):.6f}')
+            lines.append(f"{metric}_sum {histogram.total:.6f}")
+            lines.append(f"{metric}_count {histogram.count}")
+        for name, counter in sorted(list(self.counters.items())):
+            metric = prefix + name
+            if counter.description:
+                lines.append(f"# HELP {metric} {counter.description}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {counter.value}")
+        for name, gauge in sorted(list(self.gauges.items())):
+            metric = prefix + name
+            if gauge.description:
+                lines.append(f"# HELP {metric} {gauge.description}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {gauge.value:g}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            lines.append(f"{metric}_max {gauge.max:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write a JSON snapshot (``*.json``) or a Prometheus text file (anything else)."""
+        text = self.to_json() + "\n" if path.endswith(".json") else self.to_prometheus()
+        atomic_write_text(path, text)
+
+
+class MetricsExporter:
+    """Periodically writes a registry to a local file on a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, *, interval: float = 10.0) -> None:
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._write()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self) -> None:
+        with suppress(OSError):
+            self.registry.write(self.path)
+
+
+# Process-wide registry shared by all sessions.
+METRICS = MetricsRegistry()
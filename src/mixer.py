@@ -0,0 +1,666 @@
+from __future__ import annotations
+
+import array
+import importlib
+import math
+import mmap
+import struct
+import sys
+import threading
+import time
+import wave
+from contextlib import suppress
+from typing import Any, Hashable, Optional, Protocol
+
+np: Any = None
+with suppress(Exception):  # pragma: no cover - optional dependency
+    np = importlib.import_module("numpy")
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+BLOCK_FRAMES = 512
+_INT16_MIN = -32768
+_INT16_MAX = 32767
+
+
+class Sound:
+    """Decoded PCM audio: interleaved signed 16-bit samples in native byte order."""
+
+    __slots__ = ("samples", "sample_rate", "channels", "_array")
+
+    def __init__(self, samples: array.array, sample_rate: int, channels: int) -> None:
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._array: Any = None
+
+    @property
+    def frames(self) -> int:
+        return len(self.samples) // self.channels
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+    def as_numpy(self) -> Any:
+        """Return the samples as a read-only int16 array (shared, not copied)."""
+        if self._array is None:
+            self._array = np.frombuffer(self.samples, dtype=np.int16)
+        return self._array
+
+    def read(self, start: int, end: int) -> Any:
+        """Return the interleaved samples of frames ``start:end``."""
+        channels = self.channels
+        if np is not None:
+            return self.as_numpy()[start * channels : end * channels]
+        return self.samples[start * channels : end * channels]
+
+
+class Source(Protocol):
+    """Anything the mixer can play: a decoded :class:`Sound` or a :class:`WavStream`."""
+
+    sample_rate: int
+    channels: int
+
+    @property
+    def frames(self) -> int: ...
+
+    def read(self, start: int, end: int) -> Any: ...
+
+
+# ----------------------------------------------------------------------#
+# Decoding and synthesis
+# ----------------------------------------------------------------------#
+
+
+def load_wav(path: str, *, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> Sound:
+    """Decode a PCM WAV file once into the mixer's format.
+
+    Any sample width is converted to 16 bit, mono/stereo to ``channels`` and
+    the sample rate to ``sample_rate``. Raises ``wave.Error`` for compressed
+    or otherwise unsupported files.
+    """
+    with wave.open(path, "rb") as reader:
+        params = reader.getparams()
+        raw = reader.readframes(params.nframes)
+    samples = pcm_to_int16(raw, params.sampwidth)
+    samples = _convert_channels(samples, params.nchannels, channels)
+    if params.framerate != sample_rate:
+        samples = _resample(samples, channels, params.framerate, sample_rate)
+    return Sound(samples, sample_rate, channels)
+
+
+def pcm_to_int16(raw: bytes, sample_width: int) -> array.array:
+    """Convert little-endian PCM of any WAV sample width to native int16 samples."""
+    if sample_width == 1:  # unsigned 8 bit
+        return array.array("h", ((value - 128) << 8 for value in raw))
+    if sample_width == 2:
+        samples = array.array("h")
+        samples.frombytes(raw[: len(raw) - len(raw) % 2])
+    elif sample_width in (3, 4):
+        # Keep the two most significant bytes of each sample.
+        count = len(raw) // sample_width
+        high = bytearray(count * 2)
+        high[0::2] = raw[sample_width - 2 :: sample_width][:count]
+        high[1::2] = raw[sample_width - 1 :: sample_width][:count]
+        samples = array.array("h")
+        samples.frombytes(bytes(high))
+    else:
+        raise wave.Error(f"Unsupported sample width: {sample_width}")
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def tone(
+    frequency: float,
+    duration: float,
+    *,
+    volume: float = 0.5,
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = CHANNELS,
+    fade: float = 0.01,
+) -> Sound:
+    """Synthesize a sine tone with short fades so it starts and ends without clicks."""
+    frames = max(1, int(duration * sample_rate))
+    fade_frames = max(1, min(frames // 2, int(fade * sample_rate)))
+    step = 2 * math.pi * frequency / sample_rate
+    amplitude = volume * _INT16_MAX
+    mono = array.array("h", bytes(frames * 2))
+    for index in range(frames):
+        envelope = min(1.0, index / fade_frames, (frames - 1 - index) / fade_frames)
+        mono[index] = int(amplitude * envelope * math.sin(step * index))
+    return Sound(_convert_channels(mono, 1, channels), sample_rate, channels)
+
+
+def concatenate(*sounds: Sound) -> Sound:
+    samples = array.array("h")
+    for sound in sounds:
+        samples.extend(sound.samples)
+    return Sound(samples, sounds[0].sample_rate, sounds[0].channels)
+
+
+def _convert_channels(samples: array.array, source: int, target: int) -> array.array:
+    if source == target:
+        return samples
+    frames = len(samples) // source
+    if source == 1:
+        out = array.array("h", bytes(frames * target * 2))
+        for channel in range(target):
+            out[channel::target] = samples
+        return out
+    if target == 1:
+        return array.array(
+            "h", (sum(samples[index : index + source]) // source for index in range(0, frames * source, source))
+        )
+    # More channels than the mixer uses: keep the first ``target`` ones.
+    out = array.array("h", bytes(frames * target * 2))
+    for channel in range(target):
+        out[channel::target] = samples[channel::source][:frames]
+    return out
+
+
+def _resample(samples: array.array, channels: int, source_rate: int, target_rate: int) -> array.array:
+    frames = len(samples) // channels
+    target_frames = max(1, round(frames * target_rate / source_rate))
+    if np is not None:
+        data = np.frombuffer(samples, dtype=np.int16).reshape(-1, channels).astype(np.float32)
+        positions = np.linspace(0, frames - 1, target_frames)
+        columns = [np.interp(positions, np.arange(frames), data[:, channel]) for channel in range(channels)]
+        out = array.array("h")
+        out.frombytes(np.stack(columns, axis=1).round().astype(np.int16).tobytes())
+        return out
+    # Without NumPy: nearest sample, good enough for one-time conversion of short sounds.
+    ratio = source_rate / target_rate
+    out = array.array("h", bytes(target_frames * channels * 2))
+    for frame in range(target_frames):
+        source = min(frames - 1, int(frame * ratio)) * channels
+        out[frame * channels : frame * channels + channels] = samples[source : source + channels]
+    return out
+
+
+# ----------------------------------------------------------------------#
+# Streaming
+# ----------------------------------------------------------------------#
+
+
+class WavStream:
+    """16-bit PCM WAV file read in place from a memory map.
+
+    Only the header is parsed up front; ``read`` returns frames straight
+    from the mapped data chunk (a zero-copy view with NumPy), so long music
+    files are neither decoded nor held in memory, and looping never
+    re-opens the file. Mono files are widened to ``channels`` per chunk.
+    Other sample widths or rates raise ``wave.Error``; use
+    :func:`load_wav` for those.
+    """
+
+    def __init__(self, path: str, *, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> None:
+        self.path = path
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            file_channels, file_rate, bits, self._offset, size = _parse_wav_header(self._map)
+        except (ValueError, OSError, struct.error) as exc:
+            self._file.close()
+            raise wave.Error(f"Unreadable WAV file: {path}") from exc
+        except wave.Error:
+            self._file.close()
+            raise
+        if bits != 16 or file_rate != sample_rate or file_channels not in (1, channels):
+            self.close()
+            raise wave.Error(f"Cannot stream {bits}-bit/{file_rate} Hz/{file_channels} ch audio: {path}")
+        self.file_channels = file_channels
+        self._frames = min(size, len(self._map) - self._offset) // (2 * file_channels)
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def duration(self) -> float:
+        return self._frames / self.sample_rate
+
+    def read(self, start: int, end: int) -> Any:
+        file_channels = self.file_channels
+        count = (end - start) * file_channels
+        offset = self._offset + start * file_channels * 2
+        if np is not None:
+            samples = np.frombuffer(self._map, dtype="<i2", count=count, offset=offset)
+            return np.repeat(samples, self.channels) if file_channels != self.channels else samples
+        samples = array.array("h")
+        samples.frombytes(self._map[offset : offset + count * 2])
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return _convert_channels(samples, file_channels, self.channels)
+
+    def close(self) -> None:
+        # Views handed out by read() may still reference the map; it is then released with them.
+        with suppress(BufferError, ValueError):
+            self._map.close()
+        self._file.close()
+
+
+def _parse_wav_header(data: Any) -> tuple[int, int, int, int, int]:
+    """Return channels, sample rate, bits per sample, data offset and data size of a PCM WAV."""
+    if data[0:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise wave.Error("Not a RIFF/WAVE file")
+    position = 12
+    fmt: Optional[tuple[int, int, int, int]] = None
+    while position + 8 <= len(data):
+        chunk_id = data[position : position + 4]
+        (chunk_size,) = struct.unpack_from("<I", data, position + 4)
+        body = position + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, rate = struct.unpack_from("<HHI", data, body)
+            (bits,) = struct.unpack_from("<H", data, body + 14)
+            fmt = (audio_format, channels, rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise wave.Error("WAV data chunk before fmt chunk")
+            audio_format, channels, rate, bits = fmt
+            if audio_format not in (1, 0xFFFE):  # PCM or WAVE_FORMAT_EXTENSIBLE
+                raise wave.Error(f"Unsupported WAV format: {audio_format}")
+            return channels, rate, bits, body, chunk_size
+        position = body + chunk_size + (chunk_size & 1)
+    raise wave.Error("WAV file has no data chunk")
+
+
+# ----------------------------------------------------------------------#
+# Output sinks
+# ----------------------------------------------------------------------#
+
+
+class Sink(Protocol):
+    # True if write() blocks until the device has room (the mixer then needs no pacing).
+    blocking: bool
+
+    def write(self, data: bytes) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NullSink:
+    """Discards audio but counts it; for headless runs and tests."""
+
+    blocking = False
+
+    def __init__(self) -> None:
+        self.bytes_written = 0
+        self.blocks = 0
+
+    def write(self, data: bytes) -> None:
+        self.bytes_written += len(data)
+        self.blocks += 1
+
+    def close(self) -> None:
+        pass
+
+
+class WaveFileSink:
+    """Writes the mixed output to a WAV file."""
+
+    blocking = False
+
+    def __init__(self, path: str, *, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> None:
+        self._writer = wave.open(path, "wb")
+        self._writer.setnchannels(channels)
+        self._writer.setsampwidth(2)
+        self._writer.setframerate(sample_rate)
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes) -> None:
+        if sys.byteorder == "big":
+            samples = array.array("h")
+            samples.frombytes(data)
+            samples.byteswap()
+            data = samples.tobytes()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.writeframes(data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+class SoundDeviceSink:
+    """Plays through the default output device via the optional ``sounddevice`` package."""
+
+    blocking = True
+
+    def __init__(self, module: Any, *, sample_rate: int, channels: int, block_frames: int) -> None:
+        self._stream = module.RawOutputStream(
+            samplerate=sample_rate,
+            channels=channels,
+            dtype="int16",
+            blocksize=block_frames,
+            latency="low",
+        )
+        self._stream.start()
+
+    def write(self, data: bytes) -> None:
+        self._stream.write(data)
+
+    def close(self) -> None:
+        with suppress(Exception):
+            self._stream.stop()
+            self._stream.close()
+
+
+def open_output_sink(
+    *, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS, block_frames: int = BLOCK_FRAMES
+) -> Optional[Sink]:
+    """Open the default audio device, or return ``None`` if ``sounddevice`` or a device is missing."""
+    with suppress(Exception):  # pragma: no cover - optional dependency
+        module = importlib.import_module("sounddevice")
+        return SoundDeviceSink(module, sample_rate=sample_rate, channels=channels, block_frames=block_frames)
+    return None
+
+
+# ----------------------------------------------------------------------#
+# Mixer
+# ----------------------------------------------------------------------#
+
+
+class Voice:
+    """One playing instance of a source.
+
+    Looped voices wrap around sample-accurately. With ``crossfade_frames``
+    the last frames of each pass are blended with the first frames of the
+    next, which hides a seam in material that does not loop cleanly.
+    Volume changes are linear ramps so they never click.
+    """
+
+    __slots__ = (
+        "source",
+        "volume",
+        "loop",
+        "key",
+        "position",
+        "finished",
+        "crossfade_frames",
+        "_target",
+        "_ramp_left",
+        "_stopping",
+    )
+
+    def __init__(
+        self,
+        source: Source,
+        volume: float,
+        loop: bool,
+        key: Optional[Hashable],
+        *,
+        crossfade_frames: int = 0,
+        fade_in_frames: int = 0,
+    ) -> None:
+        self.source = source
+        self.loop = loop
+        self.key = key
+        self.position = 0  # next frame
+        self.finished = False
+        # The seam blend needs a full pass before it, so at most half the source.
+        self.crossfade_frames = max(0, min(crossfade_frames, source.frames // 2)) if loop else 0
+        self.volume = 0.0 if fade_in_frames > 0 else volume
+        self._target = volume
+        self._ramp_left = fade_in_frames
+        self._stopping = False
+
+    def ramp_to(self, volume: float, frames: int, *, stop: bool = False) -> None:
+        """Move the volume to ``volume`` over ``frames`` frames (immediately if 0)."""
+        self._target = volume
+        self._stopping = stop
+        self._ramp_left = frames
+        if frames <= 0:
+            self.volume = volume
+            if stop:
+                self.finished = True
+
+    def gain(self, frames: int) -> tuple[float, float]:
+        """Return the volume at the start and end of the next ``frames`` frames."""
+        start = self.volume
+        if self._ramp_left <= 0:
+            return start, start
+        step = min(frames, self._ramp_left)
+        end = start + (self._target - start) * step / self._ramp_left
+        self._ramp_left -= step
+        self.volume = end
+        if self._ramp_left == 0:
+            self.volume = end = self._target
+            if self._stopping:
+                self.finished = True
+        return start, end
+
+    def render(self, frames: int) -> list[Any]:
+        """Return the next chunks of interleaved samples, up to ``frames`` frames in total."""
+        source = self.source
+        total = source.frames
+        fade = self.crossfade_frames
+        loop_end = total - fade if self.loop else total
+        chunks: list[Any] = []
+        while frames > 0 and not self.finished and total:
+            position = self.position
+            if position < loop_end:
+                end = min(loop_end, position + frames)
+                chunks.append(source.read(position, end))
+            elif self.loop:
+                # Seam: blend the tail of this pass into the head of the next one.
+                index = position - loop_end
+                end = position + min(frames, fade - index)
+                tail, head = source.read(position, end), source.read(index, end - loop_end)
+                chunks.append(_blend(tail, head, index, fade, source.channels))
+            else:
+                self.finished = True
+                break
+            frames -= end - position
+            self.position = end
+            if end >= total:
+                if self.loop:
+                    # The head was already heard inside the blend.
+                    self.position = fade
+                else:
+                    self.finished = True
+        return chunks
+
+
+def _blend(tail: Any, head: Any, index: int, length: int, channels: int) -> Any:
+    """Crossfade ``tail`` into ``head``; both start at frame ``index`` of a ``length``-frame seam."""
+    frames = len(tail) // channels
+    if np is not None:
+        weights = np.repeat((index + np.arange(frames, dtype=np.float32)) / length, channels)
+        return tail * (1.0 - weights) + head * weights
+    return [
+        tail[sample] + (head[sample] - tail[sample]) * (index + sample // channels) / length
+        for sample in range(frames * channels)
+    ]
+
+
+class AudioMixer:
+    """Mixes preloaded sounds and streams on one persistent output thread.
+
+    ``play()`` only appends a voice, so starting a sound costs no thread or
+    process and reaches the sink within one block. The thread sleeps while
+    nothing plays and paces itself for non-blocking sinks.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        *,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        block_frames: int = BLOCK_FRAMES,
+        start: bool = True,
+    ) -> None:
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_frames = block_frames
+        self.blocks_mixed = 0
+        self._voices: list[Voice] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name="audio-mixer", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------#
+    # Public API
+    # ------------------------------------------------------------------#
+
+    def play(
+        self,
+        source: Source,
+        *,
+        volume: float = 1.0,
+        loop: bool = False,
+        key: Optional[Hashable] = None,
+        fade_in: float = 0.0,
+        crossfade: float = 0.0,
+    ) -> Voice:
+        """Start ``source``; a voice with the same ``key`` is replaced.
+
+        ``fade_in`` ramps the volume up from silence, ``crossfade`` (looped
+        voices only) blends each loop seam over that many seconds.
+        """
+        if source.sample_rate != self.sample_rate or source.channels != self.channels:
+            raise ValueError("Source format does not match the mixer")
+        voice = Voice(
+            source,
+            volume,
+            loop,
+            key,
+            crossfade_frames=self._frames(crossfade),
+            fade_in_frames=self._frames(fade_in),
+        )
+        with self._wakeup:
+            if key is not None:
+                self._voices = [other for other in self._voices if other.key != key]
+            if not self._closed:
+                self._voices.append(voice)
+                self._wakeup.notify()
+        return voice
+
+    def stop(self, key: Hashable, *, fade: float = 0.0) -> None:
+        """Stop the voice under ``key``, optionally fading it out over ``fade`` seconds."""
+        with self._lock:
+            if fade <= 0:
+                self._voices = [voice for voice in self._voices if voice.key != key]
+                return
+            for voice in self._voices:
+                if voice.key == key:
+                    voice.ramp_to(0.0, self._frames(fade), stop=True)
+
+    def stop_all(self) -> None:
+        with self._lock:
+            self._voices = []
+
+    def is_playing(self, key: Hashable) -> bool:
+        with self._lock:
+            return any(voice.key == key and not voice._stopping for voice in self._voices)
+
+    def set_volume(self, key: Hashable, volume: float, *, fade: float = 0.05) -> None:
+        """Change the volume of ``key``; the short default ramp avoids audible steps."""
+        with self._lock:
+            for voice in self._voices:
+                if voice.key == key:
+                    voice.ramp_to(volume, self._frames(fade))
+
+    @property
+    def active_voices(self) -> int:
+        return len(self._voices)
+
+    def mix(self, frames: Optional[int] = None) -> bytes:
+        """Mix the next ``frames`` frames of all voices into int16 PCM and advance them."""
+        frames = frames or self.block_frames
+        with self._lock:
+            voices = self._voices
+        if np is not None:
+            data = self._mix_numpy(voices, frames)
+        else:
+            data = self._mix_python(voices, frames)
+        if any(voice.finished for voice in voices):
+            with self._lock:
+                self._voices = [voice for voice in self._voices if not voice.finished]
+        self.blocks_mixed += 1
+        return data
+
+    def close(self) -> None:
+        with self._wakeup:
+            if self._closed:
+                return
+            self._closed = True
+            self._voices = []
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.sink.close()
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _frames(self, seconds: float) -> int:
+        return max(0, int(seconds * self.sample_rate))
+
+    def _mix_numpy(self, voices: list[Voice], frames: int) -> bytes:
+        channels = self.channels
+        mixed = np.zeros(frames * channels, dtype=np.float32)
+        for voice in voices:
+            chunks = voice.render(frames)
+            if not chunks:
+                continue
+            samples = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+            count = len(samples)
+            start, end = voice.gain(count // channels)
+            if start == end:
+                mixed[:count] += samples * start
+            else:
+                ramp = np.repeat(np.linspace(start, end, count // channels, dtype=np.float32), channels)
+                mixed[:count] += samples * ramp
+        np.clip(mixed, _INT16_MIN, _INT16_MAX, out=mixed)
+        return mixed.astype(np.int16).tobytes()
+
+    def _mix_python(self, voices: list[Voice], frames: int) -> bytes:
+        channels = self.channels
+        mixed = [0.0] * (frames * channels)
+        for voice in voices:
+            samples = [value for chunk in voice.render(frames) for value in chunk]
+            count = len(samples) // channels
+            start, end = voice.gain(count)
+            step = (end - start) / count if count else 0.0
+            for index, value in enumerate(samples):
+                mixed[index] += value * (start + step * (index // channels))
+        out = array.array("h", (int(max(_INT16_MIN, min(_INT16_MAX, value))) for value in mixed))
+        return out.tobytes()
+
+    def _run(self) -> None:
+        period = self.block_frames / self.sample_rate
+        deadline: Optional[float] = None
+        while True:
+            with self._wakeup:
+                while not self._voices and not self._closed:
+                    deadline = None
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+            block = self.mix()
+            try:
+                self.sink.write(block)
+            except Exception:
+                # A vanished device must not take the game down; sound just stops.
+                with self._lock:
+                    self._voices = []
+                continue
+            if not self.sink.blocking:
+                deadline = (deadline or time.monotonic()) + period
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+from utils import darker_colors, hex_to_rgb, ideal_text_colors
+
+
+class Palette:
+    """Color tables derived once from a color map.
+
+    Colors are addressed by their index in the map, so preparing a round only
+    needs index lookups instead of parsing or filtering hex strings.
+    """
+
+    def __init__(self, color_map: Mapping[str, str], active_words: Sequence[str] | None = None) -> None:
+        if not color_map:
+            raise ValueError("Palette needs at least one color.")
+        self.words: tuple[str, ...] = tuple(color_map)
+        self.hex_colors: tuple[str, ...] = tuple(color_map.values())
+        self.rgb: tuple[tuple[int, int, int], ...] = tuple(hex_to_rgb(code) for code in self.hex_colors)
+        self.darker: tuple[str, ...] = tuple(darker_colors(self.hex_colors))
+        self.text_colors: tuple[str, ...] = tuple(ideal_text_colors(self.hex_colors))
+
+        # Exact and casefolded spellings both resolve to the same index.
+        self.ids: dict[str, int] = {}
+        for index, word in enumerate(self.words):
+            self.ids[word] = index
+            self.ids.setdefault(word.casefold(), index)
+
+        active = tuple(self.ids[word] for word in active_words or () if word in color_map)
+        self.active: tuple[int, ...] = active or tuple(range(len(self.words)))
+
+        # For every word: indices of the other active colors that may be used to display it.
+        active_set = set(self.active)
+        everything = tuple(range(len(self.words)))
+        self.others: tuple[tuple[int, ...], ...] = tuple(
+            tuple(index for index in everything if index != word_id and index in active_set) or everything
+            for word_id in everything
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def text_color(self, word: str) -> str:
+        """Return a readable text color for a tile showing ``word``."""
+        return self.text_colors[self.ids[word]]
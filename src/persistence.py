@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+import weakref
+from contextlib import suppress
+from typing import Callable, Optional, Type
+
+_live_writers: "weakref.WeakSet[WriteBehindWriter]" = weakref.WeakSet()
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    """Replace ``path`` with ``text`` via a synced temporary file and ``os.replace``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+class WriteBehindWriter:
+    """Coalesces keyed write jobs and runs them on a background thread."""
+
+    def __init__(
+        self,
+        *,
+        delay: float = 0.5,
+        name: str = "write-behind",
+        errors: tuple[Type[BaseException], ...] = (OSError,),
+    ) -> None:
+        self.delay = delay
+        self.name = name
+        self.errors = errors
+        self._pending: dict[str, Callable[[], None]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+        self._flush_requested = False
+        self._closed = False
+        _live_writers.add(self)
+
+    def submit(self, key: str, job: Callable[[], None]) -> None:
+        """Queue ``job``; a pending job with the same key is replaced."""
+        with self._condition:
+            if self._closed:
+                run_now = True
+            else:
+                run_now = False
+                self._pending.pop(key, None)
+                self._pending[key] = job
+                self._ensure_thread()
+                self._condition.notify_all()
+        if run_now:
+            self._run_job(job)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write all pending jobs now; returns False if ``timeout`` expired."""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            done = self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+            self._flush_requested = False
+            return done
+
+    def close(self, timeout: Optional[float] = 2.0) -> None:
+        """Flush pending jobs and stop the worker thread."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                # Debounce: give further updates a chance to replace this one.
+                if not self._flush_requested and not self._closed:
+                    self._condition.wait_for(lambda: self._flush_requested or self._closed, self.delay)
+                jobs = list(self._pending.values())
+                self._pending.clear()
+                self._busy = True
+            try:
+                for job in jobs:
+                    self._run_job(job)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _run_job(self, job: Callable[[], None]) -> None:
+        with suppress(*self.errors):
+            job()
+
+
+@atexit.register
+def _flush_live_writers() -> None:
+    for writer in list(_live_writers):
+        writer.close(timeout=1.0)
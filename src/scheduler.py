@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Optional
+
+if TYPE_CHECKING:
+    from diagnostics import SessionProfiler
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Any]
+
+
+class SessionScheduler:
+    """Runs all handlers of one session on a single long-lived coroutine.
+
+    Clicks, timer ticks and timeouts are posted as messages and processed
+    strictly in order, so handlers never interleave. Delayed messages are
+    plain loop timers (``call_later``/``call_at``) keyed by name; scheduling
+    a key again or cancelling it is a single ``TimerHandle.cancel()``.
+    """
+
+    def __init__(self) -> None:
+        self.processed: int = 0
+        self._queue: deque[tuple[Handler, tuple[Any, ...]]] = deque()
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._busy = False
+        self._closed = False
+        # Set by diagnostics mode; handlers then run under the session's profiler.
+        self.profiler: Optional[SessionProfiler] = None
+
+    # ------------------------------------------------------------------#
+    # Public API
+    # ------------------------------------------------------------------#
+
+    def start(self) -> None:
+        """Start the session coroutine on the running loop."""
+        if self._task is not None or self._closed:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+        if self._queue:
+            self._wakeup.set()
+
+    def post(self, handler: Handler, *args: Any) -> None:
+        """Queue ``handler(*args)``; safe to call from any thread."""
+        if self._closed:
+            return
+        loop = self._loop
+        if loop is not None and self._loop_thread != threading.get_ident():
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._enqueue, handler, args)
+            return
+        self._enqueue(handler, args)
+
+    def dispatch(self, handler: Handler, *args: Any) -> None:
+        """Run the synchronous ``handler(*args)`` right away if the session is idle.
+
+        Skips the queue and the wake-up of the session coroutine for input
+        that must be answered quickly. If a message is queued or a handler is
+        running (or the caller is on another thread), it is posted instead,
+        so ordering is the same as with :meth:`post`.
+        """
+        if self._closed:
+            return
+        if self._busy or self._queue or self._loop is None or self._loop_thread != threading.get_ident():
+            self.post(handler, *args)
+            return
+        self._busy = True
+        try:
+            if self.profiler is None:
+                handler(*args)
+            else:
+                self.profiler.call(handler, *args)
+        except Exception:
+            logger.exception("Session handler %r failed", handler)
+        finally:
+            self._busy = False
+        self.processed += 1
+
+    def post_later(self, delay: float, key: Hashable, handler: Handler, *args: Any) -> None:
+        """Post ``handler(*args)`` after ``delay`` seconds, replacing any timer under ``key``."""
+        self.post_at(self.time() + max(0.0, delay), key, handler, *args)
+
+    def post_at(self, when: float, key: Hashable, handler: Handler, *args: Any) -> None:
+        """Post ``handler(*args)`` at loop time ``when``, replacing any timer under ``key``."""
+        if self._closed or self._loop is None:
+            return
+        self.cancel(key)
+        self._timers[key] = self._loop.call_at(when, self._fire, key, handler, args)
+
+    def cancel(self, key: Hashable) -> None:
+        handle = self._timers.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def cancel_all(self) -> None:
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+    def pending(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def time(self) -> float:
+        """Current loop time, the clock used by ``post_at``."""
+        return self._loop.time() if self._loop is not None else 0.0
+
+    def close(self) -> None:
+        """Drop queued messages and timers and stop the session coroutine."""
+        self._closed = True
+        loop = self._loop
+        if loop is not None and self._loop_thread != threading.get_ident():
+            # Timer handles and the task belong to the loop; nothing new runs once closed is set.
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._shutdown)
+            return
+        self._shutdown()
+
+    async def aclose(self) -> None:
+        """Close the session and wait until its coroutine has finished; call on the loop."""
+        self.close()
+        task = self._task
+        if task is not None and task is not asyncio.current_task():
+            with suppress(asyncio.CancelledError):
+                await task
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _shutdown(self) -> None:
+        self.cancel_all()
+        self._queue.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def _enqueue(self, handler: Handler, args: tuple[Any, ...]) -> None:
+        if self._closed:
+            return
+        self._queue.append((handler, args))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _fire(self, key: Hashable, handler: Handler, args: tuple[Any, ...]) -> None:
+        self._timers.pop(key, None)
+        self._enqueue(handler, args)
+
+    async def _run(self) -> None:
+        wakeup = self._wakeup
+        assert wakeup is not None
+        queue = self._queue
+        try:
+            while not self._closed:
+                while queue and not self._closed:
+                    handler, args = queue.popleft()
+                    self._busy = True
+                    try:
+                        profiler = self.profiler
+                        result = handler(*args) if profiler is None else profiler.call(handler, *args)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    except Exception:
+                        logger.exception("Session handler %r failed", handler)
+                    finally:
+                        self._busy = False
+                    self.processed += 1
+                wakeup.clear()
+                await wakeup.wait()
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import importlib
+import random
+from collections import deque
+from contextlib import suppress
+from typing import Any, NamedTuple, Optional
+
+from palette import Palette
+
+np: Any = None
+with suppress(Exception):  # pragma: no cover - optional dependency
+    np = importlib.import_module("numpy")
+
+DEFAULT_LOOKAHEAD = 32
+
+
+class RoundSpec(NamedTuple):
+    """Everything needed to display one round, resolved ahead of time."""
+
+    word_id: int
+    color_id: int
+    word: str
+    text_color: str
+    background_color: str
+
+
+class RoundStream:
+    """Seeded source of rounds that pre-generates them in bulk into a ring buffer.
+
+    The buffer is refilled with a full ``lookahead`` batch only once it is
+    empty, so one batch is drawn every ``lookahead`` rounds. Fixed batches
+    keep the ``"numpy"`` backend seed-stable, because its draws depend on the
+    batch size. The ``"random"`` backend draws exactly like
+    ``random.Random(seed)`` would for one round at a time, so event logs
+    replay identically. The ``"numpy"`` backend uses
+    ``numpy.random.Generator`` for faster bulk generation but yields a
+    different (still seed-stable) sequence.
+
+    A round's word and both colors are resolved here. Its time budget and
+    display time are not: the engine derives them from the player's skill
+    estimate, which changes with every click of the previous round.
+    """
+
+    def __init__(
+        self,
+        palette: Palette,
+        *,
+        seed: int,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        backend: str = "random",
+    ) -> None:
+        if backend not in ("random", "numpy"):
+            raise ValueError(f"Unknown RNG backend: {backend}")
+        if backend == "numpy" and np is None:
+            raise RuntimeError("The numpy backend requires NumPy to be installed.")
+        self.palette = palette
+        self.lookahead = max(1, lookahead)
+        self.backend = backend
+        self.seed = seed
+        self._buffer: deque[RoundSpec] = deque(maxlen=self.lookahead)
+        self._rng = random.Random(seed)
+        self._generator: Any = np.random.default_rng(seed) if backend == "numpy" else None
+
+    def reset(self, seed: int) -> None:
+        """Restart the stream from ``seed`` and drop buffered rounds."""
+        self.seed = seed
+        self._buffer.clear()
+        self._rng.seed(seed)
+        if self.backend == "numpy":
+            self._generator = np.random.default_rng(seed)
+
+    def use_palette(self, palette: Palette) -> None:
+        """Draw further rounds from ``palette``; buffered rounds of the old one are dropped."""
+        if palette is self.palette:
+            return
+        self.palette = palette
+        self._buffer.clear()
+
+    def next(self) -> RoundSpec:
+        if not self._buffer:
+            self.prefetch()
+        return self._buffer.popleft()
+
+    def prefetch(self, count: Optional[int] = None) -> None:
+        """Top up the buffer to ``count`` rounds (the full lookahead by default)."""
+        target = self.lookahead if count is None else min(count, self.lookahead)
+        missing = target - len(self._buffer)
+        if missing <= 0:
+            return
+        if self.backend == "numpy":
+            self._buffer.extend(self._generate_numpy(missing))
+        else:
+            self._buffer.extend(self._generate_random(missing))
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _spec(self, word_id: int, color_id: int) -> RoundSpec:
+        palette = self.palette
+        return RoundSpec(
+            word_id,
+            color_id,
+            palette.words[word_id],
+            palette.hex_colors[color_id],
+            palette.darker[color_id],
+        )
+
+    def _generate_random(self, count: int) -> list[RoundSpec]:
+        choice = self._rng.choice
+        active = self.palette.active
+        others = self.palette.others
+        specs = []
+        for _ in range(count):
+            word_id = choice(active)
+            specs.append(self._spec(word_id, choice(others[word_id])))
+        return specs
+
+    def _generate_numpy(self, count: int) -> list[RoundSpec]:
+        active = np.asarray(self.palette.active)
+        others = self.palette.others
+        word_ids = active[self._generator.integers(0, len(active), size=count)]
+        spans = np.array([len(others[word_id]) for word_id in word_ids])
+        picks = (self._generator.random(count) * spans).astype(np.int64)
+        return [
+            self._spec(int(word_id), others[word_id][pick])
+            for word_id, pick in zip(word_ids.tolist(), picks.tolist())
+        ]
+
+
+def daily_seed(day: Optional[datetime.date] = None, *, salt: str = "colormemory") -> int:
+    """Return the seed shared by every player on ``day`` (today by default)."""
+    day = day or datetime.date.today()
+    digest = hashlib.blake2b(f"{salt}:{day.isoformat()}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+from config import ENGINE_POOL_SIZE, HIGHSCORE_PATH, LEADERBOARD_PATH, MAX_SESSIONS
+from difficulty import SkillBook
+from game import ColorMemoryEngine
+from leaderboard import Leaderboard
+
+
+class SessionHub:
+    """Process-wide state shared by all sessions of a multi-user server.
+
+    Every session borrows a pooled engine that is bound to one shared
+    ``Leaderboard``, so the highscore is read from disk once per process and
+    all sessions update the same cached record. Skill estimates are shared
+    the same way, so a returning player keeps their difficulty.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = MAX_SESSIONS,
+        pool_size: int = ENGINE_POOL_SIZE,
+        leaderboard: Optional[Leaderboard] = None,
+        **engine_options: Any,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.pool_size = pool_size
+        self.leaderboard = leaderboard or Leaderboard.open(LEADERBOARD_PATH, legacy_path=HIGHSCORE_PATH)
+        self.skills = SkillBook()
+        self.engine_options = engine_options
+        self._idle: list[ColorMemoryEngine] = []
+        self._active: set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._active)
+
+    def acquire(self) -> Optional[ColorMemoryEngine]:
+        """Return a fresh engine for a new session, or None if the server is full."""
+        with self._lock:
+            if len(self._active) >= self.max_sessions:
+                return None
+            engine = self._idle.pop() if self._idle else None
+            if engine is None:
+                engine = ColorMemoryEngine(leaderboard=self.leaderboard, skills=self.skills, **self.engine_options)
+            self._active.add(id(engine))
+        engine.new_session()
+        return engine
+
+    def release(self, engine: ColorMemoryEngine) -> None:
+        """Return ``engine`` to the pool; releasing twice is a no-op."""
+        with self._lock:
+            if id(engine) not in self._active:
+                return
+            # Reset only the first time: after that the engine may already serve another session.
+            engine.reset()
+            self._active.discard(id(engine))
+            if len(self._idle) < self.pool_size:
+                self._idle.append(engine)
+
+    def close(self) -> None:
+        """Flush and close the shared leaderboard."""
+        with self._lock:
+            self._idle.clear()
+        self.leaderboard.close()
@@ -0,0 +1,265 @@
+"""Headless simulation driver for ColorMemoryEngine, using the same game flow as the UI.
+
+Example::
+
+    python src/simulate.py --games 1000000 --model error --error-rate 0.03
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence
+
+from config import ACTIVE_COLORS
+from flow import GameFlow, Phase
+from game import ColorMemoryEngine, Progress
+
+
+class PlayerModel(ABC):
+    """Base class for simulated players."""
+
+    name = "base"
+
+    def __init__(self, *, reaction_time: float = 0.6) -> None:
+        self.reaction_time = reaction_time
+
+    @abstractmethod
+    def recall(self, sequence: Sequence[str], pool: Sequence[str], rng: random.Random) -> list[str]:
+        """Return the words the player clicks for ``sequence``, drawing guesses from ``pool``."""
+
+
+class PerfectPlayer(PlayerModel):
+    """Always reproduces the full sequence."""
+
+    name = "perfect"
+
+    def recall(self, sequence: Sequence[str], pool: Sequence[str], rng: random.Random) -> list[str]:
+        return list(sequence)
+
+
+class ErrorRatePlayer(PlayerModel):
+    """Confuses every single word with a fixed probability."""
+
+    name = "error"
+
+    def __init__(self, *, error_rate: float = 0.03, reaction_time: float = 0.6) -> None:
+        super().__init__(reaction_time=reaction_time)
+        self.error_rate = error_rate
+
+    def recall(self, sequence: Sequence[str], pool: Sequence[str], rng: random.Random) -> list[str]:
+        guess = []
+        for word in sequence:
+            if rng.random() < self.error_rate:
+                word = rng.choice([other for other in pool if other != word] or list(pool))
+            guess.append(word)
+        return guess
+
+
+class SpanLimitedPlayer(PlayerModel):
+    """Remembers the first ``span`` words and guesses the rest."""
+
+    name = "span"
+
+    def __init__(self, *, span: int = 7, reaction_time: float = 0.6) -> None:
+        super().__init__(reaction_time=reaction_time)
+        self.span = span
+
+    def recall(self, sequence: Sequence[str], pool: Sequence[str], rng: random.Random) -> list[str]:
+        remembered = list(sequence[: self.span])
+        guessed = [rng.choice(pool) for _ in range(len(sequence) - len(remembered))]
+        return remembered + guessed
+
+
+PLAYER_MODELS: dict[str, type[PlayerModel]] = {
+    model.name: model for model in (PerfectPlayer, ErrorRatePlayer, SpanLimitedPlayer)
+}
+
+
+def play_game(
+    flow: GameFlow,
+    player: PlayerModel,
+    rng: random.Random,
+    *,
+    max_rounds: int,
+    use_timer: bool,
+) -> tuple[int, int]:
+    """Play one game and return ``(score, rounds_played)``."""
+    engine = flow.engine
+    flow.stop()
+    # The engine keeps its batch-seeded stream, so results depend only on --seed.
+    flow.start(reseed=False)
+    while True:
+        flow.next_round()
+        flow.reveal()
+        guess = player.recall(engine.sequence, engine.active_words, rng)
+        if use_timer and len(guess) * player.reaction_time > flow.snapshot.time_budget:
+            flow.timeout()
+        else:
+            for word in guess:
+                if flow.click(word, player.reaction_time) is not Progress.PENDING:
+                    break
+            # A guess that ends early runs into the timer.
+            flow.timeout()
+        if flow.phase is Phase.FAIL:
+            return flow.snapshot.score, engine.round
+        if engine.round >= max_rounds:
+            return engine.round, engine.round
+
+
+def _run_batch(
+    games: int,
+    seed: int,
+    model_name: str,
+    model_options: dict[str, float],
+    timer_factor: float,
+    max_rounds: int,
+    use_timer: bool,
+    rng_backend: str,
+    adaptive: bool,
+) -> tuple[Counter[int], int]:
+    rng = random.Random(seed ^ 0x5EED)
+    player = PLAYER_MODELS[model_name](**model_options)
+    engine = ColorMemoryEngine(
+        leaderboard_path=None,
+        timer_factor=timer_factor,
+        allowed_words=ACTIVE_COLORS,
+        seed=seed,
+        rng_backend=rng_backend,
+        adaptive=adaptive,
+    )
+    flow = GameFlow(engine)
+    scores: Counter[int] = Counter()
+    rounds = 0
+    for _ in range(games):
+        score, played = play_game(flow, player, rng, max_rounds=max_rounds, use_timer=use_timer)
+        scores[score] += 1
+        rounds += played
+    return scores, rounds
+
+
+def simulate(
+    *,
+    games: int,
+    model_name: str = "perfect",
+    model_options: dict[str, float] | None = None,
+    timer_factor: float = 3.0,
+    max_rounds: int = 50,
+    use_timer: bool = False,
+    workers: int | None = None,
+    seed: int = 0,
+    rng_backend: str = "random",
+    adaptive: bool = False,
+) -> tuple[Counter[int], int, float]:
+    """Run ``games`` simulated games on a process pool.
+
+    Returns the score histogram, the total number of rounds and the wall time.
+    """
+    if model_name not in PLAYER_MODELS:
+        raise ValueError(f"Unknown player model: {model_name}")
+    workers = max(1, workers or os.cpu_count() or 1)
+    batch_count = min(games, workers * 4) or 1
+    base, extra = divmod(games, batch_count)
+    batches = [base + (1 if index < extra else 0) for index in range(batch_count)]
+
+    scores: Counter[int] = Counter()
+    rounds = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _run_batch,
+                size,
+                seed + index,
+                model_name,
+                dict(model_options or {}),
+                timer_factor,
+                max_rounds,
+                use_timer,
+                rng_backend,
+                adaptive,
+            )
+            for index, size in enumerate(batches)
+            if size
+        ]
+        for future in futures:
+            batch_scores, batch_rounds = future.result()
+            scores.update(batch_scores)
+            rounds += batch_rounds
+    return scores, rounds, time.perf_counter() - started
+
+
+def format_report(scores: Counter[int], rounds: int, elapsed: float) -> str:
+    games = sum(scores.values())
+    if not games:
+        return "Keine Spiele simuliert."
+    ordered = sorted(scores.elements())
+    quantiles = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else [ordered[0]] * 99
+    lines = [
+        f"Spiele:        {games}",
+        f"Runden:        {rounds}",
+        f"Laufzeit:      {elapsed:0.2f} s",
+        f"Runden/s:      {rounds / elapsed if elapsed else float('inf'):,.0f}",
+        f"Spiele/s:      {games / elapsed if elapsed else float('inf'):,.0f}",
+        f"Score Ø:       {statistics.fmean(ordered):0.2f}",
+        f"Score Median:  {statistics.median(ordered):g}",
+        f"Score p90/p99: {quantiles[89]:g} / {quantiles[98]:g}",
+        f"Score max:     {ordered[-1]}",
+        "",
+        "Verteilung:",
+    ]
+    peak = max(scores.values())
+    for score in range(ordered[0], ordered[-1] + 1):
+        count = scores.get(score, 0)
+        bar = "█" * round(40 * count / peak)
+        lines.append(f"{score:>4} {count / games:7.2%} {bar}")
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Simuliert Color-Memory-Spiele ohne Oberfläche.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--model", choices=sorted(PLAYER_MODELS), default="error")
+    parser.add_argument("--error-rate", type=float, default=0.03)
+    parser.add_argument("--span", type=int, default=7)
+    parser.add_argument("--reaction-time", type=float, default=0.6, help="Sekunden pro Klick")
+    parser.add_argument("--timer", action="store_true", help="Zeitlimit pro Runde berücksichtigen")
+    parser.add_argument("--timer-factor", type=float, default=3.0)
+    parser.add_argument("--max-rounds", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--adaptive", action="store_true", help="Zeitlimit und Farbanzahl an die Spielstärke anpassen"
+    )
+    parser.add_argument("--rng", choices=("random", "numpy"), default="random", help="Zufallsquelle der Runden")
+    args = parser.parse_args(argv)
+
+    model_options: dict[str, float] = {"reaction_time": args.reaction_time}
+    if args.model == "error":
+        model_options["error_rate"] = args.error_rate
+    elif args.model == "span":
+        model_options["span"] = args.span
+
+    scores, rounds, elapsed = simulate(
+        games=args.games,
+        model_name=args.model,
+        model_options=model_options,
+        timer_factor=args.timer_factor,
+        max_rounds=args.max_rounds,
+        use_timer=args.timer,
+        workers=args.workers,
+        seed=args.seed,
+        rng_backend=args.rng,
+        adaptive=args.adaptive,
+    )
+    print(format_report(scores, rounds, elapsed))
+
+
+if __name__ == "__main__":
+    main()
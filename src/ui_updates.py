@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from metrics import PAGE_UPDATE, MetricsRegistry
+
+if TYPE_CHECKING:
+    from diagnostics import SessionProfiler
+
+
+class UpdateScheduler:
+    """Coalesces page updates and flushes them at most once per frame."""
+
+    def __init__(self, page: Any, *, frame_rate: float = 60.0, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.page = page
+        self.metrics = metrics
+        self.frame_interval = 1.0 / frame_rate if frame_rate > 0 else 0.0
+        self.flush_count: int = 0
+        self._dirty: dict[int, Any] = {}
+        self._full_update = False
+        self._last_flush = float("-inf")
+        self._handle: Optional[asyncio.Handle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._closed = False
+        # Frame flushes run outside the session's handlers; diagnostics mode profiles them too.
+        self.profiler: Optional[SessionProfiler] = None
+
+    # ------------------------------------------------------------------#
+    # Public API
+    # ------------------------------------------------------------------#
+
+    def request(self, *controls: Any) -> None:
+        """Mark controls (or the whole page when none are given) as dirty."""
+        if self._closed:
+            return
+        if controls:
+            for control in controls:
+                if control is not None:
+                    self._dirty[id(control)] = control
+        else:
+            self._full_update = True
+        self._schedule()
+
+    def flush_now(self) -> None:
+        """Push all pending changes immediately, bypassing the frame budget."""
+        self._cancel_handle()
+        if self._closed or not (self._full_update or self._dirty):
+            return
+        controls = list(self._dirty.values())
+        full_update = self._full_update
+        self._dirty.clear()
+        self._full_update = False
+        self._last_flush = time.monotonic()
+        self.flush_count += 1
+        started = time.perf_counter()
+        if full_update:
+            self.page.update()
+        else:
+            self.page.update(*controls)
+        if self.metrics is not None:
+            self.metrics.observe(PAGE_UPDATE, time.perf_counter() - started)
+
+    def close(self) -> None:
+        """Drop pending updates and stop scheduling new flushes."""
+        self._closed = True
+        self._cancel_handle()
+        self._dirty.clear()
+        self._full_update = False
+
+    # ------------------------------------------------------------------#
+    # Internal helpers
+    # ------------------------------------------------------------------#
+
+    def _schedule(self) -> None:
+        if self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            owner = self._loop
+            if owner is not None and owner.is_running() and self._loop_thread != threading.get_ident():
+                owner.call_soon_threadsafe(self._schedule)
+            else:
+                self.flush_now()
+            return
+
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        delay = self._last_flush + self.frame_interval - time.monotonic()
+        if delay > 0:
+            self._handle = loop.call_later(delay, self._on_frame)
+        else:
+            self._handle = loop.call_soon(self._on_frame)
+
+    def _on_frame(self) -> None:
+        self._handle = None
+        if self.profiler is None:
+            self.flush_now()
+        else:
+            self.profiler.call(self.flush_now)
+
+    def _cancel_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+_UNSET = object()
+
+
+class ViewModel:
+    """Keeps the last rendered properties per control and writes only differences.
+
+    ``set(control, value=..., color=...)`` assigns just the properties whose
+    value differs from what was last written and marks only that control
+    for the next update, so unchanged controls are neither re-serialized
+    nor walked by ``page.update()``.
+
+    Properties the client edits (a text field's value, a switch) change on
+    the control without passing through ``set``; controls registered with
+    :meth:`client_edited` are therefore compared against their current value.
+    """
+
+    def __init__(self, ui: UpdateScheduler) -> None:
+        self.ui = ui
+        self.writes: int = 0
+        self.skipped: int = 0
+        # id(control) -> (control, last written properties); the control is kept so ids are not reused.
+        self._rendered: dict[int, tuple[Any, dict[str, Any]]] = {}
+        self._client_edited: dict[int, Any] = {}
+
+    def client_edited(self, *controls: Any) -> None:
+        """Compare ``controls`` against their live properties instead of the last written ones."""
+        for control in controls:
+            if control is not None:
+                self._client_edited[id(control)] = control
+
+    def set(self, control: Any, **properties: Any) -> bool:
+        """Write changed ``properties`` to ``control``; return whether anything changed."""
+        if control is None:
+            return False
+        entry = self._rendered.get(id(control))
+        if entry is None:
+            entry = self._rendered[id(control)] = (control, {})
+        rendered = entry[1]
+        live = id(control) in self._client_edited
+        changed = False
+        for name, value in properties.items():
+            # Controls not written yet are compared against the value they were built with.
+            current = rendered[name] if name in rendered and not live else getattr(control, name, _UNSET)
+            if current is not _UNSET and current == value:
+                rendered[name] = value
+                self.skipped += 1
+                continue
+            rendered[name] = value
+            setattr(control, name, value)
+            self.writes += 1
+            changed = True
+        if changed:
+            self.ui.request(control)
+        return changed
+
+    def forget(self, *controls: Any) -> None:
+        """Drop remembered state, e.g. after controls were rebuilt or changed directly."""
+        if not controls:
+            self._rendered.clear()
+            return
+        for control in controls:
+            self._rendered.pop(id(control), None)
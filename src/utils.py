@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import importlib
 import os
 import sys
-from typing import Iterable
+from contextlib import suppress
+from typing import Any, Iterable, Sequence
+
+np: Any = None
+with suppress(Exception):  # pragma: no cover - optional dependency
+    np = importlib.import_module("numpy")
 
 
 def resource_path(*relative_parts: str, create_parent: bool = False) -> str:
@@ -65,3 +71,92 @@ def darker_color(hex_color: str, factor: float = 0.6) -> str:
     g = max(0, min(255, int(g * factor)))
     b = max(0, min(255, int(b * factor)))
     return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def ideal_text_color(hex_color: str) -> str:
+    """Return dark or light text depending on the perceived luminance of ``hex_color``."""
+    r, g, b = hex_to_rgb(hex_color)
+    luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
+    return "#1f1f1f" if luminance > 0.6 else "#ffffff"
+
+
+# ----------------------------------------------------------------------#
+# Batch variants (NumPy fast path with pure-Python fallback)
+# ----------------------------------------------------------------------#
+
+
+def _rgb_array(colors: Sequence[str]) -> Any:
+    """Parse ``colors`` into an ``(n, 3)`` uint8 array, or return None if any entry is malformed."""
+    digits = [color.lstrip("#")[:6] for color in colors]
+    if any(len(part) != 6 for part in digits):
+        return None
+    try:
+        raw = bytes.fromhex("".join(digits))
+    except ValueError:
+        return None
+    if len(raw) != 3 * len(digits):
+        return None
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+
+
+def _hex_strings(rgb: Any) -> list[str]:
+    raw = np.ascontiguousarray(np.clip(rgb, 0, 255), dtype=np.uint8).tobytes().hex()
+    return ["#" + raw[i : i + 6] for i in range(0, len(raw), 6)]
+
+
+def hex_to_rgb_batch(colors: Sequence[str]) -> Any:
+    """Convert many hex colors at once.
+
+    Returns an ``(n, 3)`` integer array with NumPy, otherwise a list of RGB tuples.
+    """
+    if np is not None:
+        rgb = _rgb_array(colors)
+        if rgb is not None:
+            return rgb.astype(np.int64)
+        return np.array([hex_to_rgb(color) for color in colors], dtype=np.int64).reshape(-1, 3)
+    return [hex_to_rgb(color) for color in colors]
+
+
+def rgb_to_hex_batch(rgb: Any) -> list[str]:
+    """Convert an ``(n, 3)`` array or a sequence of RGB triples into hex strings."""
+    if np is not None:
+        return _hex_strings(np.asarray(rgb).reshape(-1, 3))
+    return [rgb_to_hex(triple) for triple in rgb]
+
+
+def blend_hex_colors_batch(starts: Sequence[str], ends: Sequence[str], t: float | Sequence[float]) -> list[str]:
+    """Blend ``starts[i]`` towards ``ends[i]``; ``t`` is a scalar or one value per pair."""
+    if len(starts) != len(ends):
+        raise ValueError("blend_hex_colors_batch expects the same number of start and end colors.")
+    if np is not None:
+        start_rgb = np.asarray(hex_to_rgb_batch(starts), dtype=np.float64)
+        end_rgb = np.asarray(hex_to_rgb_batch(ends), dtype=np.float64)
+        factors = np.asarray(t, dtype=np.float64).reshape(-1, 1)
+        blended = start_rgb + (end_rgb - start_rgb) * factors
+        return _hex_strings(np.trunc(blended).astype(np.int64))
+    factors = [t] * len(starts) if isinstance(t, (int, float)) else list(t)
+    if len(factors) != len(starts):
+        raise ValueError("blend_hex_colors_batch expects one t value per color pair.")
+    return [blend_hex_colors(start, end, factor) for start, end, factor in zip(starts, ends, factors)]
+
+
+def darker_colors(colors: Sequence[str], factor: float = 0.6) -> list[str]:
+    """Batch version of :func:`darker_color`."""
+    if np is not None:
+        rgb = _rgb_array(colors)
+        if rgb is not None:
+            return _hex_strings(np.trunc(rgb * float(factor)).astype(np.int64))
+    return [darker_color(color, factor) for color in colors]
+
+
+def luminance_batch(colors: Sequence[str]) -> list[float]:
+    """Perceived luminance (0..1) of many colors, as used by :func:`ideal_text_color`."""
+    if np is not None:
+        rgb = np.asarray(hex_to_rgb_batch(colors), dtype=np.float64)
+        return ((rgb @ np.array([0.299, 0.587, 0.114])) / 255).tolist()
+    return [(0.299 * r + 0.587 * g + 0.114 * b) / 255 for r, g, b in hex_to_rgb_batch(colors)]
+
+
+def ideal_text_colors(colors: Sequence[str]) -> list[str]:
+    """Batch version of :func:`ideal_text_color`."""
+    return ["#1f1f1f" if luminance > 0.6 else "#ffffff" for luminance in luminance_batch(colors)]
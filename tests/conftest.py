@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import os
+import sys
+
+# The game modules import each other as top-level modules from src/, like the app does.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
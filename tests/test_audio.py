@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import threading
+
+from audio import FeedbackSoundPool
+from metrics import FEEDBACK_COALESCED, FEEDBACK_DROPPED, MetricsRegistry
+
+
+def test_feedback_pool_drops_stale_sound_while_workers_are_busy() -> None:
+    started = threading.Event()
+    release = threading.Event()
+    played: list[str] = []
+
+    def play(sound: str) -> None:
+        played.append(sound)
+        started.set()
+        release.wait(5)
+
+    metrics = MetricsRegistry()
+    pool = FeedbackSoundPool(play, workers=1, max_pending=1, metrics=metrics)
+    try:
+        assert pool.submit("success")
+        assert started.wait(5)  # the only worker is now busy
+        assert pool.submit("failure")
+        assert not pool.submit("failure")  # coalesced with the waiting one
+        assert pool.submit("success")  # queue full: the waiting "failure" is dropped
+        assert metrics.counter(FEEDBACK_COALESCED).value == 1
+        assert metrics.counter(FEEDBACK_DROPPED).value == 1
+
+        started.clear()
+        release.set()
+        assert started.wait(5)
+    finally:
+        pool.close()
+    assert played == ["success", "success"]
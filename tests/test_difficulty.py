@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import pytest
+
+from config import (
+    ACTIVE_COLORS,
+    DISPLAY_TIME,
+    MAX_DISPLAY_TIME,
+    MIN_DISPLAY_TIME,
+    MIN_PALETTE_SIZE,
+    MIN_SECONDS_PER_WORD,
+    REACTION_SMOOTHING,
+    REACTION_TIME_CAP,
+    REFERENCE_REACTION_TIME,
+    SPAN_PER_COLOR,
+    SPAN_SMOOTHING,
+    TIME_BUDGET_MARGIN,
+)
+from difficulty import Difficulty, SkillBook, SkillEstimate
+from game import ColorMemoryEngine
+from leaderboard import Leaderboard
+from server import SessionHub
+
+
+def test_no_history_gives_the_fixed_game_values() -> None:
+    difficulty = SkillEstimate().difficulty(timer_factor=3.0, max_colors=6)
+    assert difficulty == Difficulty(6, 3.0, DISPLAY_TIME)
+    assert difficulty.time_budget(4) == 12.0
+
+
+def test_reaction_time_is_a_plain_mean_first_then_an_ema() -> None:
+    skill = SkillEstimate()
+    skill.observe_click(0.4)
+    assert skill.reaction_time == pytest.approx(0.4)
+    skill.observe_click(0.8)
+    assert skill.reaction_time == pytest.approx(0.6)
+    clicks = int(1 / REACTION_SMOOTHING) + 1
+    for _ in range(clicks):
+        skill.observe_click(0.6)
+    before = skill.reaction_time
+    skill.observe_click(1.6)
+    assert skill.reaction_time == pytest.approx(before + REACTION_SMOOTHING * (1.6 - before))
+
+
+def test_reaction_time_ignores_negative_and_caps_long_pauses() -> None:
+    skill = SkillEstimate()
+    skill.observe_click(-1.0)
+    assert skill.clicks == 0
+    skill.observe_click(60.0)
+    assert skill.reaction_time == pytest.approx(REACTION_TIME_CAP)
+
+
+def test_span_follows_lost_games() -> None:
+    skill = SkillEstimate()
+    skill.observe_error(0, 0)
+    assert skill.games == 0
+    skill.observe_error(5, 2)  # reached 4 + 2/5 words
+    assert skill.span == pytest.approx(4.4)
+    skill.observe_error(3, 0)
+    assert skill.span == pytest.approx(4.4 + max(SPAN_SMOOTHING, 0.5) * (2.0 - 4.4))
+
+
+def test_time_budget_and_display_time_are_bounded() -> None:
+    fast, slow = SkillEstimate(), SkillEstimate()
+    fast.observe_click(0.01)
+    slow.observe_click(REACTION_TIME_CAP)
+    assert fast.difficulty(timer_factor=3.0, max_colors=6).seconds_per_word == MIN_SECONDS_PER_WORD
+    assert fast.difficulty(timer_factor=3.0, max_colors=6).display_time == MIN_DISPLAY_TIME
+    assert slow.difficulty(timer_factor=3.0, max_colors=6).seconds_per_word == 3.0
+    assert slow.difficulty(timer_factor=3.0, max_colors=6).display_time == MAX_DISPLAY_TIME
+
+    typical = SkillEstimate()
+    typical.observe_click(REFERENCE_REACTION_TIME)
+    difficulty = typical.difficulty(timer_factor=10.0, max_colors=6)
+    assert difficulty.seconds_per_word == pytest.approx(REFERENCE_REACTION_TIME * TIME_BUDGET_MARGIN)
+    assert difficulty.display_time == pytest.approx(DISPLAY_TIME)
+
+
+@pytest.mark.parametrize(
+    ("reached_round", "max_colors", "expected"),
+    [
+        (1, 6, MIN_PALETTE_SIZE),
+        (1 + int(SPAN_PER_COLOR), 6, MIN_PALETTE_SIZE + 1),
+        (50, 6, 6),
+        (1, 2, 2),
+    ],
+)
+def test_palette_size_grows_with_span_within_bounds(reached_round: int, max_colors: int, expected: int) -> None:
+    skill = SkillEstimate()
+    skill.observe_error(reached_round, 0)
+    assert skill.difficulty(timer_factor=3.0, max_colors=max_colors).palette_size == expected
+
+
+def test_skill_book_is_case_insensitive_and_evicts_the_oldest() -> None:
+    book = SkillBook(limit=2)
+    anna = book.get("Anna")
+    assert book.get("ANNA") is anna
+    book.get("Ben")
+    book.get("Cem")
+    assert len(book) == 2
+    assert book.get("anna") is not anna
+
+
+def _engine(skills: SkillBook) -> ColorMemoryEngine:
+    return ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS, adaptive=True, skills=skills)
+
+
+def test_adapt_shares_named_estimates_but_not_guest_ones() -> None:
+    skills = SkillBook()
+    first, second = _engine(skills), _engine(skills)
+    first.adapt("Anna")
+    second.adapt("anna")
+    assert first.skill is second.skill is skills.get("Anna")
+
+    for name in (None, "", "Spieler", "spieler"):
+        first.adapt(name)
+        second.adapt(name)
+        assert first.skill is first.guest_skill
+        assert first.skill is not second.skill
+    assert len(skills) == 1
+
+
+def test_adapt_sizes_the_palette_only_when_asked() -> None:
+    engine = _engine(SkillBook())
+    assert engine.adapt("Anna").palette_size == len(ACTIVE_COLORS)
+    engine.skill.observe_error(1, 0)
+    engine.adapt("Anna")
+    assert len(engine.active_words) == MIN_PALETTE_SIZE
+    engine.adapt("Anna", palette=False)
+    assert len(engine.active_words) == len(ACTIVE_COLORS)
+
+
+def test_pooled_engine_starts_with_a_fresh_guest_estimate() -> None:
+    hub = SessionHub(leaderboard=Leaderboard.open(None), allowed_words=ACTIVE_COLORS, pool_size=1)
+    engine = hub.acquire()
+    engine.adapt(None)
+    engine.skill.observe_click(0.3)
+    guest = engine.skill
+    hub.release(engine)
+    reused = hub.acquire()
+    assert reused is engine
+    assert reused.skill is not guest and reused.skill.clicks == 0
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from config import ACTIVE_COLORS
+from eventlog import CLICK, GAME_OVER, PROGRESS_CODES, ROUND, EventLogWriter, read_log, replay
+from flow import GameFlow, Phase
+from game import ColorMemoryEngine
+
+
+def _engine(**options) -> ColorMemoryEngine:
+    return ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS, **options)
+
+
+def _play_logged_game(flow: GameFlow, directory, *, seed: int, solved_rounds: int):
+    """Play like the UI does: solve ``solved_rounds`` rounds, then click a wrong tile."""
+    flow.start(seed)
+    writer = EventLogWriter.for_session(str(directory), flow.engine)
+    shown, results = [], []
+    try:
+        while True:
+            flow.next_round()
+            state = flow.snapshot
+            writer.log_round(state.round, state.word_id, state.color_id)
+            shown.append((state.word_id, state.color_id))
+            flow.reveal()
+            sequence = list(flow.engine.sequence)
+            if state.round > solved_rounds:
+                wrong = next(word for word in state.colors if word != sequence[0])
+                sequence = [wrong]
+            for word in sequence:
+                progress = flow.click(word)
+                writer.log_click(state.round, flow.engine.color_id(word), progress)
+                results.append(PROGRESS_CODES[progress])
+            if flow.phase is Phase.FAIL:
+                writer.log_game_over(flow.snapshot.score)
+                return writer.path, shown, results, flow.snapshot.score
+    finally:
+        writer.close()
+
+
+def test_replay_reproduces_a_logged_game(tmp_path) -> None:
+    flow = GameFlow(_engine(adaptive=False))
+    path, shown, results, score = _play_logged_game(flow, tmp_path, seed=1234, solved_rounds=5)
+
+    header, events = read_log(path)
+    assert header.seed == 1234
+    assert header.active_words == tuple(ACTIVE_COLORS)
+    assert [(event.a, event.b) for event in events if event.kind == ROUND] == shown
+    assert [event.b for event in events if event.kind == CLICK] == results
+    assert [event.round for event in events if event.kind == GAME_OVER] == [score]
+
+    result = replay(path)
+    assert result.deterministic, result.mismatches
+    assert result.rounds == len(shown)
+    assert result.clicks == len(results)
+    assert result.score == score == 5
+
+
+def test_replay_follows_a_palette_adapted_between_games(tmp_path) -> None:
+    flow = GameFlow(_engine(adaptive=True), player_name="Anna")
+    first, _, _, _ = _play_logged_game(flow, tmp_path, seed=7, solved_rounds=1)
+    # Losing at the start of round 2 sets a short memory span, so the next game has fewer colors.
+    second, shown, _, score = _play_logged_game(flow, tmp_path, seed=8, solved_rounds=3)
+
+    first_header, _ = read_log(first)
+    second_header, _ = read_log(second)
+    assert first_header.active_words == tuple(ACTIVE_COLORS)
+    assert len(second_header.active_words) < len(ACTIVE_COLORS)
+    assert second_header.active_words == tuple(flow.engine.active_words)
+
+    for path in (first, second):
+        result = replay(path)
+        assert result.deterministic, result.mismatches
+    assert replay(second).score == score
+    assert replay(second).rounds == len(shown)
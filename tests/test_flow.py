@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable
+
+import pytest
+
+from config import ACTIVE_COLORS
+from flow import TRANSITIONS, GameFlow, Phase, Trigger
+from game import ColorMemoryEngine
+
+
+def _flow() -> GameFlow:
+    engine = ColorMemoryEngine(leaderboard_path=None, allowed_words=ACTIVE_COLORS, adaptive=False)
+    return GameFlow(engine)
+
+
+def _solve_round(flow: GameFlow) -> None:
+    flow.next_round()
+    flow.reveal()
+    for word in list(flow.engine.sequence):
+        flow.click(word)
+
+
+def _enter(phase: Phase) -> GameFlow:
+    """Return a flow in ``phase``; INPUT is entered in round 2 so a correct click can stay in it."""
+    flow = _flow()
+    if phase is Phase.IDLE:
+        return flow
+    flow.start(1)
+    if phase is Phase.READY:
+        return flow
+    if phase is Phase.SUCCESS:
+        _solve_round(flow)
+        return flow
+    if phase in (Phase.INPUT, Phase.FAIL):
+        _solve_round(flow)
+    flow.next_round()
+    if phase is Phase.SHOWING:
+        return flow
+    flow.reveal()
+    if phase is Phase.FAIL:
+        flow.click(_wrong_word(flow))
+    return flow
+
+
+def _expected_word(flow: GameFlow) -> str:
+    engine = flow.engine
+    return engine.sequence[engine.cursor] if engine.cursor < len(engine.sequence) else ACTIVE_COLORS[0]
+
+
+def _wrong_word(flow: GameFlow) -> str:
+    expected = _expected_word(flow)
+    return next(word for word in flow.engine.active_words if word != expected)
+
+
+def _complete(flow: GameFlow) -> Any:
+    if flow.phase is Phase.INPUT:
+        for word in list(flow.engine.sequence)[flow.engine.cursor : -1]:
+            flow.click(word)
+    return flow.click(_expected_word(flow))
+
+
+ACTIONS: dict[Trigger, Callable[[GameFlow], Any]] = {
+    Trigger.START: lambda flow: flow.start(2),
+    Trigger.NEXT: lambda flow: flow.next_round(),
+    Trigger.REVEAL: lambda flow: flow.reveal(),
+    Trigger.HIDE: lambda flow: flow.hide(),
+    Trigger.CORRECT: lambda flow: flow.click(_expected_word(flow)),
+    Trigger.COMPLETE: _complete,
+    Trigger.WRONG: lambda flow: flow.click(_wrong_word(flow)),
+    Trigger.TIMEOUT: lambda flow: flow.timeout(),
+    Trigger.STOP: lambda flow: flow.stop(),
+}
+
+
+@pytest.mark.parametrize(("phase", "trigger"), list(itertools.product(Phase, Trigger)))
+def test_transition_table(phase: Phase, trigger: Trigger) -> None:
+    flow = _enter(phase)
+    assert flow.phase is phase
+    result = ACTIONS[trigger](flow)
+    target = TRANSITIONS.get((phase, trigger))
+    if target is None:
+        assert result in (False, None)
+        assert flow.phase is phase
+    else:
+        assert result not in (False, None)
+        assert flow.phase is target
+        assert flow.snapshot.trigger is trigger
+
+
+def test_every_phase_is_reachable_and_left() -> None:
+    targets = set(TRANSITIONS.values())
+    sources = {phase for phase, _ in TRANSITIONS}
+    assert targets == sources == set(Phase)
+
+
+def test_game_over_snapshot_reports_score() -> None:
+    flow = _enter(Phase.FAIL)
+    snapshot = flow.snapshot
+    assert snapshot.score == 1
+    assert snapshot.solution
+    assert not snapshot.accepts_input and not snapshot.active
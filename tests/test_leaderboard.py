@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from leaderboard import Leaderboard, LeaderboardStore, read_legacy_highscore
+from persistence import WriteBehindWriter
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("17", (17, "Unbekannt")),
+        (json.dumps({"score": 12, "player": "Anna"}), (12, "Anna")),
+        ("-3", (0, "Unbekannt")),
+        ("", (0, "Unbekannt")),
+        ("kaputt", (0, "Unbekannt")),
+    ],
+)
+def test_read_legacy_highscore(tmp_path, content, expected) -> None:
+    path = tmp_path / "highscore.txt"
+    path.write_text(content, encoding="utf-8")
+    assert read_legacy_highscore(str(path)) == expected
+
+
+def test_read_legacy_highscore_missing_file(tmp_path) -> None:
+    assert read_legacy_highscore(str(tmp_path / "fehlt.txt")) == (0, "Unbekannt")
+
+
+def test_legacy_score_is_migrated_once(tmp_path) -> None:
+    database = str(tmp_path / "leaderboard.sqlite3")
+    legacy = tmp_path / "highscore.txt"
+    legacy.write_text(json.dumps({"score": 9, "player": "Anna"}), encoding="utf-8")
+
+    store = LeaderboardStore(database, legacy_path=str(legacy))
+    assert store.top() == [("Anna", 9)]
+    store.close()
+
+    # Re-opening an already migrated file must not import the (changed) legacy file again.
+    legacy.write_text("40", encoding="utf-8")
+    store = LeaderboardStore(database, legacy_path=str(legacy))
+    assert store.top() == [("Anna", 9)]
+    (version,) = store._connection.execute("PRAGMA user_version").fetchone()
+    assert version >= 1
+    store.close()
+
+
+def test_leaderboard_top_history_and_best(tmp_path) -> None:
+    database = str(tmp_path / "leaderboard.sqlite3")
+    board = Leaderboard.open(database)
+    board.record("a", "Anna", 5)
+    board.record("b", "Ben", 8)
+    board.record("c", "Anna", 7)
+    board.flush()
+    board.record("a", "Anna", 3)  # a stored run never loses score
+    assert board.top(2) == [("Ben", 8), ("Anna", 7)]
+    assert [score for score, _ in board.history("Anna")] == [7, 5]
+    assert board.history("Niemand") == []
+    board.close()
+
+    reopened = Leaderboard.open(database)
+    assert (reopened.highscore, reopened.best_player) == (8, "Ben")
+    reopened.close()
+
+
+def test_leaderboard_reset_clears_store_and_cache(tmp_path) -> None:
+    board = Leaderboard.open(str(tmp_path / "leaderboard.sqlite3"))
+    board.record("a", "Anna", 5)
+    assert board.offer(5, "Anna")
+    board.reset()
+    assert (board.highscore, board.best_player) == (0, "Unbekannt")
+    assert board.top() == []
+    board.close()
+
+
+def test_in_memory_leaderboard_reports_cached_best() -> None:
+    board = Leaderboard.open(None)
+    assert board.top() == []
+    assert board.offer(4, "Anna")
+    assert not board.offer(3, "Ben")
+    assert board.top() == [("Anna", 4)]
+
+
+def test_write_behind_coalesces_jobs_by_key() -> None:
+    writer = WriteBehindWriter(delay=60.0)
+    ran: list[str] = []
+    writer.submit("run", lambda: ran.append("first"))
+    writer.submit("run", lambda: ran.append("second"))
+    writer.submit("other", lambda: ran.append("other"))
+    assert writer.flush(timeout=5)
+    assert ran == ["second", "other"]
+    writer.close()
+
+
+def test_write_behind_swallows_configured_errors() -> None:
+    writer = WriteBehindWriter(delay=60.0, errors=(sqlite3.Error,))
+    ran: list[str] = []
+
+    def failing() -> None:
+        raise sqlite3.OperationalError("locked")
+
+    writer.submit("bad", failing)
+    writer.submit("good", lambda: ran.append("good"))
+    assert writer.flush(timeout=5)
+    assert ran == ["good"]
+    writer.close()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+
+from scheduler import SessionScheduler
+
+
+async def _drain(session: SessionScheduler) -> None:
+    done = asyncio.Event()
+    session.post(done.set)
+    await asyncio.wait_for(done.wait(), 1)
+
+
+def test_posts_and_dispatches_run_in_order() -> None:
+    async def scenario() -> list[str]:
+        session = SessionScheduler()
+        calls: list[str] = []
+        session.start()
+        session.post(calls.append, "post-1")
+        session.dispatch(calls.append, "dispatch-1")  # queue not empty: goes behind post-1
+        session.post(calls.append, "post-2")
+        await _drain(session)
+        session.dispatch(calls.append, "dispatch-2")  # idle: runs inline
+        calls.append("after-dispatch")
+        await session.aclose()
+        return calls
+
+    assert asyncio.run(scenario()) == ["post-1", "dispatch-1", "post-2", "dispatch-2", "after-dispatch"]
+
+
+def test_dispatch_is_queued_while_a_handler_runs() -> None:
+    async def scenario() -> list[str]:
+        session = SessionScheduler()
+        calls: list[str] = []
+        session.start()
+
+        async def slow() -> None:
+            calls.append("slow-start")
+            session.dispatch(calls.append, "dispatched")
+            await asyncio.sleep(0.01)
+            calls.append("slow-end")
+
+        session.post(slow)
+        await _drain(session)
+        await session.aclose()
+        return calls
+
+    assert asyncio.run(scenario()) == ["slow-start", "slow-end", "dispatched"]
+
+
+def test_keyed_timers_replace_and_cancel() -> None:
+    async def scenario() -> list[str]:
+        session = SessionScheduler()
+        calls: list[str] = []
+        session.start()
+        session.post_later(0.01, "round", calls.append, "old")
+        session.post_later(0.02, "round", calls.append, "new")
+        session.post_later(0.01, "flash", calls.append, "cancelled")
+        session.cancel("flash")
+        assert session.pending("round") and not session.pending("flash")
+        await asyncio.sleep(0.05)
+        await _drain(session)
+        assert not session.pending("round")
+        await session.aclose()
+        return calls
+
+    assert asyncio.run(scenario()) == ["new"]
+
+
+def test_close_drops_queued_messages_and_timers() -> None:
+    async def scenario() -> tuple[list[str], bool]:
+        session = SessionScheduler()
+        calls: list[str] = []
+        session.start()
+        session.post(calls.append, "queued")
+        session.post_later(0.01, "round", calls.append, "timer")
+        await session.aclose()
+        session.post(calls.append, "after-close")
+        session.dispatch(calls.append, "after-close")
+        await asyncio.sleep(0.03)
+        return calls, session._task is not None and session._task.done()
+
+    assert asyncio.run(scenario()) == ([], True)
+
+
+def test_failing_handler_does_not_stop_the_session() -> None:
+    async def scenario() -> list[str]:
+        session = SessionScheduler()
+        calls: list[str] = []
+        session.start()
+
+        def fail() -> None:
+            raise RuntimeError("kaputt")
+
+        session.post(fail)
+        session.post(calls.append, "next")
+        await _drain(session)
+        await session.aclose()
+        return calls
+
+    assert asyncio.run(scenario()) == ["next"]
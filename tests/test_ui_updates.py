@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from ui_updates import ViewModel
+
+ft = pytest.importorskip("flet")
+
+
+class RecordingUpdates:
+    """Stands in for ``UpdateScheduler`` and records requested controls."""
+
+    def __init__(self) -> None:
+        self.requested: list[Any] = []
+
+    def request(self, *controls: Any) -> None:
+        self.requested.extend(controls)
+
+
+class FakePage:
+    """Just enough of ``ft.Page`` for ``ColorMemoryApp`` without a client."""
+
+    def __init__(self) -> None:
+        self.controls: list[Any] = []
+        self.dialog = None
+        self.on_close = None
+        self.on_keyboard_event = None
+
+    def update(self, *controls: Any) -> None:
+        pass
+
+    def add(self, *controls: Any) -> None:
+        self.controls.extend(controls)
+
+    def run_task(self, handler: Any, *args: Any) -> Any:
+        return asyncio.get_running_loop().create_task(handler(*args))
+
+    def window_close(self) -> None:
+        pass
+
+
+def _type_on_client(control: Any, value: Any) -> None:
+    # Flet applies client edits without marking the property dirty.
+    control._set_attr("value", value, dirty=False)
+
+
+def test_view_model_skips_unchanged_writes() -> None:
+    updates = RecordingUpdates()
+    view = ViewModel(updates)
+    text = ft.Text("a")
+    assert not view.set(text, value="a")
+    assert view.set(text, value="b")
+    assert not view.set(text, value="b")
+    assert updates.requested == [text]
+    assert (view.writes, view.skipped) == (1, 2)
+
+
+def test_view_model_compares_client_edited_controls_with_their_live_value() -> None:
+    view = ViewModel(RecordingUpdates())
+    cached, live = ft.TextField(value="Spieler"), ft.TextField(value="Spieler")
+    view.client_edited(live)
+    for field in (cached, live):
+        view.set(field, value="Spieler")
+        _type_on_client(field, "")
+        view.set(field, value="Spieler")
+    assert cached.value == ""  # a plain control trusts the last written value
+    assert live.value == "Spieler"
+
+
+def test_cleared_name_is_reset_on_every_start() -> None:
+    import color_memory
+    from game import ColorMemoryEngine
+
+    async def scenario() -> list[str]:
+        page = FakePage()
+        engine = ColorMemoryEngine(leaderboard_path=None, allowed_words=color_memory.ACTIVE_COLORS)
+        app = color_memory.ColorMemoryApp(page, engine=engine, audio=False)
+        await app.setup()
+        shown = []
+        try:
+            for _ in range(2):
+                _type_on_client(app.player_field, "")
+                await app._handle_menu_start()
+                shown.append(app.player_field.value)
+                await app._stop_game()
+        finally:
+            await app.close()
+        return shown
+
+    assert asyncio.run(scenario()) == ["Spieler", "Spieler"]